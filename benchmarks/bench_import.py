@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tempo de arranque (imports) dos pontos de entrada headless, com orçamento
+
+Cada caso corre num processo novo com ``python -X importtime``; conta-se o
+tempo acumulado dos imports além dos do arranque do interpretador (os de
+``-c pass``), no melhor de ``--repeat`` execuções, e falha se algum caso passar o
+orçamento ou importar tkinter/matplotlib.
+
+Uso:
+    python benchmarks/bench_import.py [--repeat N] [--scale 1.5]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+# (nome, argumentos do python, orçamento em ms)
+CASES = [
+    ("pacote", ["-c", "import pricing_assistant"], 10),
+    ("core", ["-c", "import pricing_assistant.core.pricing_engine"], 60),
+    ("serviço", ["-c", "import pricing_assistant.services.analysis"], 200),
+    ("cli", ["-c", "import pricing_assistant.ui.cli"], 400),
+    ("servidor", ["-c", "import pricing_assistant.ui.server"], 400),
+    ("batch --help", ["-m", "pricing_assistant", "batch", "--help"], 400),
+]
+
+# Nunca devem ser importados fora da GUI
+FORBIDDEN = ("tkinter", "_tkinter", "matplotlib")
+
+
+def import_profile(args, skip=frozenset()):
+    """(tempo dos imports de topo fora de ``skip`` em ms, módulos importados)"""
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        modules.add(name.strip())
+        # Só imports de topo: os aninhados já contam no acumulado do pai
+        if not name.startswith("  ") and name.strip() not in skip:
+            total_us += int(cumulative)
+    return total_us / 1000, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="multiplica os orçamentos"
+    )
+    args = parser.parse_args()
+
+    startup = frozenset(import_profile(["-c", "pass"])[1])
+
+    failures = 0
+    print(f"{'caso':<14} {'imports (ms)':>12} {'orçamento':>10}  estado")
+    for name, case_args, budget in CASES:
+        runs = [import_profile(case_args, startup) for _ in range(args.repeat)]
+        best = min(total for total, _ in runs)
+        modules = runs[0][1]
+        forbidden = sorted(
+            module for module in modules if module.split(".")[0] in FORBIDDEN
+        )
+        budget *= args.scale
+
+        problems = []
+        if best > budget:
+            problems.append("acima do orçamento")
+        if forbidden:
+            problems.append("importa " + ", ".join(forbidden[:3]))
+        failures += bool(problems)
+        status = "; ".join(problems) or "ok"
+        print(f"{name:<14} {best:>12.1f} {budget:>10.0f}  {status}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Custo do logging por página de catálogo (debug síncrono vs fila vs desligado)
+
+Mede só a parte com logging por card: a verificação de relevância
+(``_match_relevance``) sobre os títulos de uma página do fixture. O parsing
+(~180 ms/página) fica de fora porque esconderia a diferença. Cada modo
+reporta o melhor de ``--repeat`` séries de ``--number`` páginas.
+
+Os modos DEBUG correm duas vezes: com escrita instantânea (/dev/null) e com
+um destino lento (``--latency`` por escrita, como um terminal ou disco de
+rede). Valores locais (ms/página, 269 títulos):
+
+    /dev/null:      síncrono 3.5-5.0, fila 4.2-5.8, INFO 0.9-1.2
+    lento (50 µs):  síncrono ~35.6, fila 3.5-5.0
+
+A poupança do nível INFO (2-4 ms/página, não os ~15 ms indicados no commit
+original) vem dos guardas ``isEnabledFor``. Com escrita instantânea a fila
+custa um pouco mais do que escrever logo (a thread do listener compete pelo
+GIL); só compensa quando a escrita bloqueia.
+
+Uso:
+    python benchmarks/bench_logging.py [--repeat N] [--number N] [--latency MS]
+"""
+
+import argparse
+import logging
+import math
+import os
+import sys
+import time
+from pathlib import Path
+
+# Adiciona o src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from pricing_assistant.sources.vinted import VintedSource
+from pricing_assistant.utils.log import (
+    PACKAGE_LOGGER,
+    setup_logging,
+    stop_logging,
+)
+
+FIXTURE = Path(__file__).parent / "fixtures" / "vinted_catalog_teclado.html"
+QUERY = "teclado apex pro"
+
+
+class SlowStream:
+    """Destino de log em que cada escrita bloqueia ``latency`` segundos"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def write(self, text: str):
+        time.sleep(self.latency)
+
+    def flush(self):
+        pass
+
+
+def time_page(source: VintedSource, titles, repeat: int, number: int) -> float:
+    """Melhor tempo (ms) por página da verificação de relevância dos títulos"""
+    match = source._match_relevance
+    for title in titles:  # aquecimento (query compilada em cache)
+        match(title, QUERY)
+
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            for title in titles:
+                match(title, QUERY)
+        best = min(best, (time.perf_counter() - start) / number)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=15, help="séries (melhor)")
+    parser.add_argument("--number", type=int, default=50, help="páginas por série")
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="ms por escrita no destino lento"
+    )
+    args = parser.parse_args()
+
+    source = VintedSource()
+    html = FIXTURE.read_text(encoding="utf-8")
+    titles = [listing.title for listing in source._parse_html(html, QUERY)]
+    package_logger = logging.getLogger(PACKAGE_LOGGER)
+
+    def run(stream, repeat: int, number: int):
+        # Equivalente aos antigos prints: formatar e escrever em cada card
+        package_logger.handlers = [logging.StreamHandler(stream)]
+        package_logger.propagate = False
+        package_logger.setLevel(logging.DEBUG)
+        sync_ms = time_page(source, titles, repeat, number)
+
+        # DEBUG ligado, mas formatação e escrita feitas pela thread do listener
+        setup_logging("DEBUG", stream=stream)
+        queue_ms = time_page(source, titles, repeat, number)
+        stop_logging()
+        return sync_ms, queue_ms
+
+    with open(os.devnull, "w") as devnull:
+        sync_ms, queue_ms = run(devnull, args.repeat, args.number)
+        # Poucas páginas: o listener ainda tem de escrever a fila toda no fim
+        slow_sync_ms, slow_queue_ms = run(SlowStream(args.latency / 1000), 3, 5)
+
+        # Configuração por omissão: DEBUG desligado, mensagens nunca formatadas
+        setup_logging("INFO", stream=devnull)
+        info_ms = time_page(source, titles, args.repeat, args.number)
+        stop_logging()
+
+    print(f"{len(titles)} títulos por página")
+    print(f"{'modo':<32} {'ms/página':>10}")
+    print(f"{'DEBUG síncrono (como print)':<32} {sync_ms:>10.2f}")
+    print(f"{'DEBUG via fila':<32} {queue_ms:>10.2f}")
+    print(f"{'DEBUG síncrono, destino lento':<32} {slow_sync_ms:>10.2f}")
+    print(f"{'DEBUG via fila, destino lento':<32} {slow_queue_ms:>10.2f}")
+    print(f"{'INFO (debug desligado)':<32} {info_ms:>10.2f}")
+    print(f"poupança por página (DEBUG desligado): {sync_ms - info_ms:.2f} ms")
+    print(f"poupança da fila (destino lento): {slow_sync_ms - slow_queue_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark do parsing de páginas do catálogo Vinted sobre fixtures guardadas
+
+Uso:
+    python benchmarks/bench_parse.py [--repeat N] [--parser lxml] [--processes N]
+                                     [--no-legacy]
+
+Compara também o extrator de cards do DOM antigo (``legacy_parse``:
+``html.parser``, lambda no ``find_all`` e um ``find``/``get_text`` por campo)
+com o de passagem única, nas mesmas fixtures: ms/página de cada um e o
+ganho (antigo/novo). ``--no-legacy`` salta esta comparação.
+
+Com ``--processes`` mede também o débito (páginas/s) do ParsePool face ao
+parsing na thread, com todas as fixtures repetidas ``--repeat`` vezes.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+# Adiciona o src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from legacy_parse import LegacyVintedSource
+
+from pricing_assistant.sources.parse_pool import ParsePool
+from pricing_assistant.sources.vinted import VintedSource, _parse_records
+from pricing_assistant.utils.config import Config
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+FIXTURES = {
+    "vinted_catalog_teclado.html": "teclado apex pro",
+    "vinted_catalog_tshirt.html": "t-shirt nike",
+    "vinted_catalog_tshirt_store.html": "t-shirt nike",
+}
+
+
+def available_parsers():
+    """Backends do BeautifulSoup instalados neste ambiente"""
+    parsers = ["html.parser"]
+    try:
+        import lxml  # noqa: F401
+
+        parsers.append("lxml")
+    except ImportError:
+        pass
+    return parsers
+
+
+def bench_page(source: VintedSource, html: str, query: str, repeat: int, parse=None):
+    """Tempo médio (ms) de _parse_html (ou ``parse``) numa página e nº de listagens"""
+    parse = parse or source._parse_html
+    listings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        parse(html, query)  # aquecimento
+        start = time.perf_counter()
+        for _ in range(repeat):
+            listings = parse(html, query)
+        elapsed = time.perf_counter() - start
+    return elapsed / repeat * 1000, len(listings)
+
+
+def bench_legacy(parsers, repeat: int):
+    """Extrator de cards antigo vs passagem única (_parse_dom) por fixture"""
+    legacy = LegacyVintedSource()
+    sources = {}
+    for parser_name in parsers:
+        config = Config()
+        config.html_parser = parser_name
+        sources[parser_name] = VintedSource(config)
+
+    print()
+    print(
+        f"{'extrator DOM':<36} {'parser':<12} {'antigo ms':>10} "
+        f"{'novo ms':>10} {'ganho':>7}"
+    )
+    for fixture, query in FIXTURES.items():
+        html = (FIXTURES_DIR / fixture).read_text(encoding="utf-8")
+        old_ms, old_count = bench_page(legacy, html, query, repeat, legacy._parse_dom)
+        for parser_name, source in sources.items():
+            new_ms, new_count = bench_page(
+                source, html, query, repeat, source._parse_dom
+            )
+            assert new_count == old_count, (fixture, parser_name)
+            print(
+                f"{fixture:<36} {parser_name:<12} {old_ms:>10.2f} "
+                f"{new_ms:>10.2f} {old_ms / new_ms:>6.1f}x"
+            )
+
+
+def bench_pool(source: VintedSource, pages, processes: int):
+    """Páginas/s com parsing na thread e no ParsePool (já quente)"""
+    start = time.perf_counter()
+    for html, query in pages:
+        source._parse_html(html, query)
+    inline = len(pages) / (time.perf_counter() - start)
+
+    pool = ParsePool(processes)
+    try:
+        html, query = pages[0]
+        pool.parse(_parse_records, html, query, source.base_url, source.html_parser)
+        start = time.perf_counter()
+        futures = [
+            pool.submit(
+                _parse_records, html, query, source.base_url, source.html_parser
+            )
+            for html, query in pages
+        ]
+        for future in futures:
+            future.result()
+        pooled = len(pages) / (time.perf_counter() - start)
+    finally:
+        pool.close()
+    return inline, pooled
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--parser", action="append", dest="parsers")
+    parser.add_argument("--processes", type=int, default=0)
+    parser.add_argument("--no-legacy", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{'fixture':<36} {'parser':<12} {'ms/página':>10} {'listagens':>10}")
+    for parser_name in args.parsers or available_parsers():
+        config = Config()
+        config.html_parser = parser_name
+        source = VintedSource(config)
+
+        for fixture, query in FIXTURES.items():
+            html = (FIXTURES_DIR / fixture).read_text(encoding="utf-8")
+            ms, count = bench_page(source, html, query, args.repeat)
+            print(f"{fixture:<36} {parser_name:<12} {ms:>10.2f} {count:>10}")
+
+        if args.processes:
+            pages = [
+                ((FIXTURES_DIR / fixture).read_text(encoding="utf-8"), query)
+                for fixture, query in FIXTURES.items()
+            ] * args.repeat
+            inline, pooled = bench_pool(source, pages, args.processes)
+            print(
+                f"{'débito (páginas/s)':<36} {parser_name:<12} "
+                f"thread {inline:.1f} · {args.processes} processos {pooled:.1f}"
+            )
+
+    if not args.no_legacy:
+        bench_legacy(args.parsers or available_parsers(), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
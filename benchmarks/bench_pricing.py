@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark e verificação do PricingEngine em lote contra o caminho escalar
+
+Uso:
+    python benchmarks/bench_pricing.py [--products N] [--seed S]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Adiciona o src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from pricing_assistant.core import pricing_engine
+from pricing_assistant.core.pricing_engine import PricingEngine
+
+CONDITIONS = ["novo", "muito bom", "bom", "razoável"]
+
+
+def synthetic_products(n_products: int, seed: int):
+    """Produtos com vetores de preços de tamanho variável e alguns outliers"""
+    rng = random.Random(seed)
+    products, prices = [], []
+    for _ in range(n_products):
+        size = rng.choice([0, 1, 3, 4, 10, 30, 100])
+        vector = [round(rng.lognormvariate(3, 0.6), 2) for _ in range(size)]
+        if vector and rng.random() < 0.2:
+            vector.append(rng.choice([1.5, 2500.0]))
+        products.append({"condition": rng.choice(CONDITIONS)})
+        prices.append(vector)
+    return products, prices
+
+
+def scalar_reference(engine: PricingEngine, products, prices):
+    """Recomendações produto a produto pelo caminho em Python puro"""
+    numpy_module = pricing_engine._load_numpy()
+    pricing_engine.np = None
+    try:
+        return [
+            engine.calculate_price(product, {"prices": vector})
+            for product, vector in zip(products, prices)
+        ]
+    finally:
+        pricing_engine.np = numpy_module
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    engine = PricingEngine()
+    products, prices = synthetic_products(args.products, args.seed)
+
+    start = time.perf_counter()
+    expected = scalar_reference(engine, products, prices)
+    scalar_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = engine.calculate_prices(products, prices)
+    batch_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for vector in prices:
+        engine._price_stats(vector)
+    scalar_stats_s = time.perf_counter() - start
+
+    stats_s = None
+    if pricing_engine.np is not None:
+        start = time.perf_counter()
+        engine._batch_stats_numpy(prices, None)
+        stats_s = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(expected, batch) if a != b)
+    backend = "numpy" if pricing_engine.np is not None else "python"
+
+    print(f"produtos: {args.products}  backend do lote: {backend}")
+    print(f"escalar:             {scalar_s * 1000:9.1f} ms")
+    print(f"lote:                {batch_s * 1000:9.1f} ms  ({scalar_s / batch_s:.1f}x)")
+    if stats_s is not None:
+        print(
+            f"estatísticas escalar {scalar_stats_s * 1000:9.1f} ms, "
+            f"vetorizadas {stats_s * 1000:.1f} ms ({scalar_stats_s / stats_s:.1f}x)"
+        )
+    print(f"diferenças face ao escalar: {mismatches}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
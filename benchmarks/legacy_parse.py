@@ -0,0 +1,124 @@
+"""
+Extrator de cards anterior ao single-pass (referência para bench_parse e testes)
+
+Reproduz o parsing do DOM antes da passagem única: ``html.parser``, seleção
+dos cards com uma lambda e um ``find``/``get_text`` por campo. A relevância
+usa o matcher atual, para que só a extração seja comparada.
+"""
+
+import re
+
+from bs4 import BeautifulSoup
+
+from pricing_assistant.core.listing import Listing
+from pricing_assistant.sources.vinted import VintedSource
+
+
+class LegacyVintedSource(VintedSource):
+    """VintedSource com o extrator de cards antigo"""
+
+    def _parse_dom(self, html: str, original_query: str):
+        soup = BeautifulSoup(html, "html.parser")
+        product_cards = soup.find_all(
+            ["div", "article"],
+            class_=lambda x: x
+            and any(
+                cls in str(x)
+                for cls in ["item", "card", "product", "new-item", "feed-grid"]
+            ),
+        )
+
+        listings = []
+        for card in product_cards:
+            listing = self._legacy_product_info(card, original_query)
+            if listing and listing.price > 1:
+                listings.append(listing)
+        return listings
+
+    def _legacy_product_info(self, card, original_query: str):
+        try:
+            title = self._legacy_title(card)
+            if not title or len(title) < 3:
+                return None
+
+            price = self._legacy_price(card)
+            if price <= 1:
+                return None
+
+            relevant, score = self._match_relevance(title, original_query)
+            if not relevant:
+                return None
+
+            return Listing(
+                title=title[:100],
+                price=price,
+                condition=self._condition_from_text(title + " " + card.get_text()),
+                location="Portugal",
+                url=self._legacy_url(card),
+                relevance_score=score,
+            )
+        except Exception:
+            return None
+
+    def _legacy_title(self, card) -> str:
+        selectors = [
+            card.find("h3"),
+            card.find("h4"),
+            card.find("h5"),
+            card.find(attrs={"data-testid": lambda x: x and "title" in str(x)}),
+            card.find(
+                attrs={
+                    "class": lambda x: x
+                    and any(cls in str(x) for cls in ["title", "name", "description"])
+                }
+            ),
+        ]
+        for selector in selectors:
+            if selector:
+                text = selector.get_text(strip=True)
+                if text and len(text) > 2:
+                    return text
+
+        card_text = card.get_text(strip=True)
+        if card_text:
+            lines = [line.strip() for line in card_text.split("\n") if line.strip()]
+            return lines[0] if lines else "Produto sem nome"
+        return "Produto sem nome"
+
+    def _legacy_price(self, card) -> float:
+        price_selectors = [
+            card.find(attrs={"data-testid": lambda x: x and "price" in str(x)}),
+            card.find(
+                attrs={
+                    "class": lambda x: x
+                    and any(cls in str(x) for cls in ["price", "amount", "value"])
+                }
+            ),
+            card.find("span", class_=lambda x: x and "€" in str(x)),
+        ]
+        for selector in price_selectors:
+            if selector:
+                price = self._clean_price(selector.get_text(strip=True))
+                if price > 0:
+                    return price
+
+        card_text = card.get_text()
+        for pattern in [
+            r"€\s*(\d+[.,]\d{2})",
+            r"(\d+[.,]\d{2})\s*€",
+            r"price:\s*€?\s*(\d+[.,]\d{2})",
+        ]:
+            matches = re.findall(pattern, card_text, re.IGNORECASE)
+            if matches:
+                price = self._clean_price(matches[0])
+                if price > 0:
+                    return price
+        return 0.0
+
+    def _legacy_url(self, card) -> str:
+        link = card.find("a", href=True)
+        if link and link["href"]:
+            if link["href"].startswith("/"):
+                return self.base_url + link["href"]
+            return link["href"]
+        return self.base_url + "/"
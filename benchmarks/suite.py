@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks offline dos caminhos críticos (parse, relevância, preços)
+
+Mede throughput e pico de memória por etapa, usando as fixtures HTML
+guardadas e distribuições de preços sintéticas (10 a 1M preços).
+
+Uso:
+    python benchmarks/suite.py --output baseline.json
+    python benchmarks/suite.py --compare baseline.json [--threshold 1.2]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Adiciona o src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from pricing_assistant import __version__
+from pricing_assistant.core import pricing_engine
+from pricing_assistant.core.listing import Listing
+from pricing_assistant.core.pricing_engine import PricingEngine
+from pricing_assistant.core.streaming import StreamingPriceEstimator
+from pricing_assistant.sources.vinted import VintedSource
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+FIXTURES = {
+    "vinted_catalog_teclado.html": "teclado apex pro",
+    "vinted_catalog_tshirt.html": "t-shirt nike",
+    "vinted_catalog_tshirt_store.html": "t-shirt nike",
+}
+PRICE_SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+LISTING_SIZES = [10, 100, 1_000, 10_000, 100_000]
+RELEVANCE_QUERIES = ["teclado apex pro v3", "t-shirt nike", "nike", "clavier gaming"]
+
+
+def synthetic_prices(n: int, seed: int = 0) -> list:
+    """Preços log-normais com ~5% de outliers nos dois extremos"""
+    rng = random.Random(seed)
+    prices = [round(rng.lognormvariate(3, 0.5), 2) for _ in range(n)]
+    for i in range(0, n, 20):
+        prices[i] = rng.choice([1.5, 2.0, 900.0, 2500.0])
+    return prices
+
+
+def synthetic_listings(n: int, seed: int = 0) -> list:
+    """Listagens no formato devolvido pelas fontes, com scores variados"""
+    rng = random.Random(seed)
+    return [
+        Listing(
+            title=f"Produto {i}",
+            price=round(rng.lognormvariate(3, 0.5), 2),
+            relevance_score=rng.choice([0.0, 0.25, 0.5, 0.75, 1.0]),
+        )
+        for i in range(n)
+    ]
+
+
+@contextlib.contextmanager
+def quiet():
+    """Descarta o output das fontes (prints de debug) durante as medições"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def measure(func, min_time: float = 0.2, max_runs: int = 50):
+    """Melhor tempo de várias execuções e pico de memória (execução à parte)"""
+    best = float("inf")
+    total = 0.0
+    runs = 0
+    with quiet():
+        while runs < max_runs and (runs == 0 or total < min_time):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best = min(best, elapsed)
+            total += elapsed
+            runs += 1
+
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return best, runs, peak
+
+
+def record(results, stage, case, n, unit, func):
+    seconds, runs, peak = measure(func)
+    results.append(
+        {
+            "stage": stage,
+            "case": case,
+            "n": n,
+            "unit": unit,
+            "seconds": seconds,
+            "throughput": n / seconds if seconds else None,
+            "peak_kib": round(peak / 1024, 1),
+            "runs": runs,
+        }
+    )
+    print(
+        f"{stage:<16} {case:<34} {n / seconds:>14,.0f} {unit}/s "
+        f"{peak / 1024:>10,.0f} KiB"
+    )
+
+
+def bench_parse(results, source):
+    for fixture, query in FIXTURES.items():
+        html = (FIXTURES_DIR / fixture).read_text(encoding="utf-8")
+        record(
+            results,
+            "parse",
+            fixture,
+            1,
+            "páginas",
+            lambda html=html, query=query: source._parse_html(html, query),
+        )
+
+
+def bench_relevance(results, source):
+    titles = []
+    with quiet():
+        for fixture, query in FIXTURES.items():
+            html = (FIXTURES_DIR / fixture).read_text(encoding="utf-8")
+            titles.extend(item.title for item in source._parse_html(html, query))
+
+    for query in RELEVANCE_QUERIES:
+
+        def run(query=query):
+            for title in titles:
+                source._match_relevance(title, query)
+
+        record(results, "relevance", query, len(titles), "títulos", run)
+
+
+def bench_filter(results, source, sizes):
+    for n in sizes:
+        listings = synthetic_listings(n)
+        record(
+            results,
+            "filter_relevant",
+            f"n={n}",
+            n,
+            "listagens",
+            lambda listings=listings: source._filter_relevant(listings, "produto"),
+        )
+
+
+def bench_pricing(results, sizes):
+    engine = PricingEngine()
+    for n in sizes:
+        prices = synthetic_prices(n)
+
+        def calculate(prices=prices):
+            engine.calculate_price({"condition": "bom"}, {"prices": prices})
+
+        record(
+            results,
+            "remove_outliers",
+            f"n={n}",
+            n,
+            "preços",
+            lambda prices=prices: engine._remove_outliers(prices),
+        )
+        record(results, "calculate_price", f"n={n}", n, "preços", calculate)
+        record(
+            results,
+            "streaming",
+            f"n={n}",
+            n,
+            "preços",
+            lambda prices=prices: StreamingPriceEstimator().extend(prices),
+        )
+
+
+def run_suite(quick: bool = False) -> dict:
+    source = VintedSource()
+    price_sizes = PRICE_SIZES[:-1] if quick else PRICE_SIZES
+    listing_sizes = LISTING_SIZES[:-1] if quick else LISTING_SIZES
+    results = []
+
+    print(f"{'etapa':<16} {'caso':<34} {'throughput':>22} {'pico':>14}")
+    bench_parse(results, source)
+    bench_relevance(results, source)
+    bench_filter(results, source, listing_sizes)
+    bench_pricing(results, price_sizes)
+
+    return {
+        "meta": {
+            "version": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "html_parser": source.html_parser,
+            "numpy": pricing_engine._load_numpy() is not None,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> int:
+    """Compara tempos com um baseline; devolve o nº de regressões"""
+    previous = {(r["stage"], r["case"]): r for r in baseline["results"]}
+    regressions = 0
+
+    print(f"\n{'etapa':<16} {'caso':<34} {'baseline':>10} {'atual':>10} {'rácio':>7}")
+    for result in current["results"]:
+        old = previous.get((result["stage"], result["case"]))
+        if not old:
+            continue
+        ratio = result["seconds"] / old["seconds"]
+        flag = ""
+        if ratio > threshold:
+            regressions += 1
+            flag = "  ⚠️ regressão"
+        print(
+            f"{result['stage']:<16} {result['case']:<34} "
+            f"{old['seconds'] * 1000:>8.2f}ms {result['seconds'] * 1000:>8.2f}ms "
+            f"{ratio:>6.2f}x{flag}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="grava os resultados em JSON (baseline)")
+    parser.add_argument("--compare", help="baseline JSON para comparação")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    parser.add_argument("--quick", action="store_true", help="omite os maiores casos")
+    args = parser.parse_args()
+
+    current = run_suite(quick=args.quick)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(current, indent=2), encoding="utf-8")
+        print(f"\n💾 Resultados gravados em {args.output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(current, baseline, args.threshold)
+        print(f"\n{regressions} regressão(ões) acima de {args.threshold:.2f}x")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
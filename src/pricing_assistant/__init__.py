@@ -5,5 +5,22 @@ Pricing Assistant - Ferramenta de Precificação Inteligente para Marketplaces
 __version__ = "1.0.0"
 __author__ = "Pricing Assistant Team"
 
-from .ui.gui_launcher import main as gui_main
-from .ui.cli import main as cli_main
+__all__ = ["cli_main", "gui_main", "serve_main"]
+
+# Pontos de entrada carregados só quando pedidos: importar o pacote (ou o core)
+# não importa tkinter, matplotlib nem as fontes de dados
+_ENTRY_POINTS = {
+    "cli_main": "pricing_assistant.ui.cli",
+    "gui_main": "pricing_assistant.ui.gui_launcher",
+    "serve_main": "pricing_assistant.ui.server",
+}
+
+
+def __getattr__(name):
+    module_name = _ENTRY_POINTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+
+    return importlib.import_module(module_name).main
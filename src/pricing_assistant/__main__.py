@@ -10,9 +10,19 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 src_dir = os.path.dirname(current_dir)  # sobe para src/
 sys.path.insert(0, src_dir)
 
+# Subcomandos sem interface gráfica: nunca importam tkinter nem matplotlib
+HEADLESS_COMMANDS = {"batch", "serve", "cli"}
+
 
 def main():
     """Inicia a aplicação (GUI com fallback para CLI)"""
+    argv = sys.argv[1:]
+    if argv and argv[0] in HEADLESS_COMMANDS:
+        from pricing_assistant.ui.cli import main as cli_main
+
+        cli_main(argv[1:] if argv[0] == "cli" else argv)
+        return
+
     try:
         # Tentar GUI primeiro
         from pricing_assistant.ui.gui_launcher import main as gui_main
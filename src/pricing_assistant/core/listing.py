@@ -0,0 +1,154 @@
+"""
+Listagens de mercado: registo compacto e lote colunar
+"""
+
+import sys
+from array import array
+from dataclasses import dataclass, fields
+from typing import Iterable, Iterator, List, Union
+
+
+@dataclass(frozen=True, slots=True)
+class Listing:
+    """Uma listagem encontrada numa fonte de dados"""
+
+    title: str
+    price: float
+    condition: str = "bom"
+    location: str = "Portugal"
+    url: str = ""
+    posted_date: str = "Recentemente"
+    relevance_score: float = 0.0
+
+    def __post_init__(self):
+        # Valores de um conjunto pequeno: uma única cópia de cada string
+        object.__setattr__(self, "condition", sys.intern(self.condition))
+        object.__setattr__(self, "location", sys.intern(self.location))
+        object.__setattr__(self, "posted_date", sys.intern(self.posted_date))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Listing":
+        """Converte uma listagem no antigo formato de dicionário"""
+        return cls(**{name: data[name] for name in FIELDS if name in data})
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in FIELDS}
+
+
+FIELDS = tuple(field.name for field in fields(Listing))
+# Coluna de ListingBatch correspondente a cada campo de Listing
+COLUMNS = (
+    "titles",
+    "prices",
+    "conditions",
+    "locations",
+    "urls",
+    "posted_dates",
+    "relevance_scores",
+)
+
+
+class ListingBatch:
+    """Listagens em colunas paralelas (preços e scores em ``array('d')``)
+
+    É o formato devolvido pelas fontes: ``prices`` pode ser passado ao
+    ``PricingEngine`` sem cópias e o lote ocupa uma fração de uma lista de
+    dicionários quando se guardam centenas de milhares de listagens.
+    """
+
+    __slots__ = COLUMNS
+
+    def __init__(self):
+        self.titles: List[str] = []
+        self.prices = array("d")
+        self.conditions: List[str] = []
+        self.locations: List[str] = []
+        self.urls: List[str] = []
+        self.posted_dates: List[str] = []
+        self.relevance_scores = array("d")
+
+    @classmethod
+    def from_listings(cls, listings: Iterable[Listing]) -> "ListingBatch":
+        batch = cls()
+        batch.extend(listings)
+        return batch
+
+    @classmethod
+    def from_columns(cls, columns: dict) -> "ListingBatch":
+        """Reconstrói um lote a partir de ``to_columns()`` (p. ex. lido de JSON)"""
+        batch = cls()
+        batch.titles.extend(columns.get("title", ()))
+        batch.prices.extend(map(float, columns.get("price", ())))
+        batch.conditions.extend(map(sys.intern, columns.get("condition", ())))
+        batch.locations.extend(map(sys.intern, columns.get("location", ())))
+        batch.urls.extend(columns.get("url", ()))
+        batch.posted_dates.extend(map(sys.intern, columns.get("posted_date", ())))
+        batch.relevance_scores.extend(map(float, columns.get("relevance_score", ())))
+        return batch
+
+    @classmethod
+    def coerce(
+        cls, listings: Union["ListingBatch", Iterable[Union[Listing, dict]], None]
+    ) -> "ListingBatch":
+        """Aceita o resultado de qualquer fonte (lote, Listings ou dicionários)"""
+        if isinstance(listings, cls):
+            return listings
+        batch = cls()
+        for listing in listings or ():
+            if isinstance(listing, dict):
+                if "price" not in listing:
+                    continue
+                listing = Listing.from_dict(listing)
+            batch.append(listing)
+        return batch
+
+    def append(self, listing: Listing):
+        self.titles.append(listing.title)
+        self.prices.append(listing.price)
+        self.conditions.append(listing.condition)
+        self.locations.append(listing.location)
+        self.urls.append(listing.url)
+        self.posted_dates.append(listing.posted_date)
+        self.relevance_scores.append(listing.relevance_score)
+
+    def extend(self, listings: Union["ListingBatch", Iterable[Listing]]):
+        if isinstance(listings, ListingBatch):
+            # Coluna a coluna, sem criar um Listing por linha
+            for column in COLUMNS:
+                getattr(self, column).extend(getattr(listings, column))
+            return
+        for listing in listings:
+            self.append(listing)
+
+    def to_columns(self) -> dict:
+        """Colunas serializáveis em JSON, com os nomes dos campos de Listing"""
+        return {
+            field: list(getattr(self, column))
+            for field, column in zip(FIELDS, COLUMNS)
+        }
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def __getitem__(self, index: int) -> Listing:
+        return Listing(
+            self.titles[index],
+            self.prices[index],
+            self.conditions[index],
+            self.locations[index],
+            self.urls[index],
+            self.posted_dates[index],
+            self.relevance_scores[index],
+        )
+
+    def __iter__(self) -> Iterator[Listing]:
+        return map(
+            Listing,
+            self.titles,
+            self.prices,
+            self.conditions,
+            self.locations,
+            self.urls,
+            self.posted_dates,
+            self.relevance_scores,
+        )
@@ -2,10 +2,40 @@
 Motor de precificação - Lógica central MELHORADA
 """
 
+from array import array
 from dataclasses import dataclass
-from typing import List
+from itertools import chain
+import logging
+import sqlite3
+from typing import List, Optional, Sequence, Tuple
 import statistics
 
+from ..utils.metrics import metrics
+from .listing import ListingBatch
+
+logger = logging.getLogger(__name__)
+
+# NumPy é opcional (sem ele usa-se o caminho em Python puro) e só é importado
+# no primeiro cálculo: o import custa ~100 ms no arranque da CLI
+np = None
+_numpy_loaded = False
+
+
+def _load_numpy():
+    """Módulo numpy, importado no primeiro uso (None se não estiver instalado)"""
+    global np, _numpy_loaded
+    if not _numpy_loaded:
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        _numpy_loaded = True
+    return np
+
+
+# (nº de preços limpos, mediana, mínimo, máximo) de um produto
+PriceStats = Tuple[int, float, float, float]
+
 
 @dataclass
 class PriceRecommendation:
@@ -18,37 +48,219 @@ class PriceRecommendation:
     reasoning: List[str]
 
 
+def _price_vector(prices) -> Sequence[float]:
+    """Vetor de preços de um lote de listagens (``array('d')``, sem cópia)"""
+    if isinstance(prices, ListingBatch):
+        return prices.prices
+    return prices
+
+
 class PricingEngine:
     """Motor principal de precificação - Versão Melhorada"""
 
+    def __init__(self, history=None, history_days: float = 30):
+        # Histórico local (PriceHistory) misturado com os dados atuais
+        self.history = history
+        self.history_days = history_days
+
     def calculate_price(
         self, product_info: dict, market_data: dict
     ) -> PriceRecommendation:
         """Calcula preço baseado em dados de mercado - algoritmo melhorado"""
 
-        if not market_data.get("prices"):
+        prices = _price_vector(market_data.get("prices") or ())
+        history_prices = self._history_prices(product_info, market_data)
+        return self._price_with_history(product_info, prices, history_prices)
+
+    def provisional_price(
+        self, product_info: dict, estimator, history_count: int = 0
+    ) -> PriceRecommendation:
+        """Recomendação provisória a partir de um StreamingPriceEstimator
+
+        ``history_count`` é o nº de preços do histórico já incluídos no
+        estimador (só para a explicação).
+        """
+        recommendation = self._build_recommendation(product_info, estimator.stats())
+        if estimator.count:
+            recommendation.reasoning.insert(
+                0, "Estimativa provisória: ainda a recolher preços"
+            )
+            if history_count:
+                recommendation.reasoning.append(
+                    f"Inclui {history_count} preços históricos "
+                    f"(últimos {self.history_days:g} dias)"
+                )
+        return recommendation
+
+    def _price_with_history(
+        self,
+        product_info: dict,
+        prices: Sequence[float],
+        history_prices: Sequence[float],
+    ) -> PriceRecommendation:
+        if history_prices:
+            prices = array("d", prices)
+            prices.extend(history_prices)
+
+        if not prices:
             return self._get_fallback_price(product_info)
 
-        prices = market_data["prices"]
+        # Um único produto: o vetor de preços é usado como buffer, sem cópia
+        recommendation = self.calculate_prices(
+            [product_info], prices, (0, len(prices))
+        )[0]
+        if history_prices:
+            recommendation.reasoning.append(
+                f"Inclui {len(history_prices)} preços históricos "
+                f"(últimos {self.history_days:g} dias)"
+            )
+        return recommendation
+
+    def _history_prices(self, product_info: dict, market_data: dict) -> array:
+        """Preços do histórico na janela configurada, anteriores à recolha atual"""
+        if self.history is None:
+            return array("d")
+
+        with metrics.timer("history"):
+            try:
+                return self.history.prices(
+                    product_info["name"],
+                    days=self.history_days,
+                    until=market_data.get("collected_at"),
+                )
+            except sqlite3.Error as e:
+                logger.warning("Histórico de preços indisponível: %s", e)
+                return array("d")
+
+    def calculate_prices(
+        self,
+        products: List[dict],
+        prices: Sequence,
+        offsets: Optional[Sequence[int]] = None,
+    ) -> List[PriceRecommendation]:
+        """Calcula recomendações para vários produtos de uma só vez
+
+        ``prices`` é uma lista de vetores de preços (um por produto) ou, com
+        ``offsets``, um buffer plano onde o produto ``i`` ocupa
+        ``prices[offsets[i]:offsets[i + 1]]``. Em vez de um vetor pode ser
+        passado um ``ListingBatch``, cuja coluna de preços é usada diretamente.
+        """
+        if offsets is None:
+            prices = [_price_vector(segment) for segment in prices]
+        else:
+            prices = _price_vector(prices)
+
+        with metrics.timer("pricing"):
+            # Remoção de outliers + mediana/mínimo/máximo
+            with metrics.timer("outlier_removal"):
+                if _load_numpy() is not None:
+                    stats = self._batch_stats_numpy(prices, offsets)
+                else:
+                    if offsets is not None:
+                        prices = [prices[a:b] for a, b in zip(offsets, offsets[1:])]
+                    stats = [self._price_stats(segment) for segment in prices]
 
+            return [
+                self._build_recommendation(product_info, product_stats)
+                for product_info, product_stats in zip(products, stats)
+            ]
+
+    def _price_stats(self, prices: Sequence[float]) -> Optional[PriceStats]:
+        """Estatísticas de um produto (caminho de referência em Python puro)"""
         # Remover outliers
-        clean_prices = self._remove_outliers(prices)
+        clean_prices = self._remove_outliers(list(prices))
 
         if not clean_prices:
-            return self._get_fallback_price(product_info)
+            return None
 
         # Usar mediana (mais robusta que média)
-        median_price = statistics.median(clean_prices)
+        return (
+            len(clean_prices),
+            statistics.median(clean_prices),
+            min(clean_prices),
+            max(clean_prices),
+        )
+
+    def _batch_stats_numpy(
+        self, prices: Sequence, offsets: Optional[Sequence[int]]
+    ) -> List[Optional[PriceStats]]:
+        """Estatísticas de todos os produtos com operações vetorizadas"""
+        np = _load_numpy()
+        if offsets is None:
+            counts = np.fromiter((len(p) for p in prices), dtype=np.int64)
+            flat = np.fromiter(
+                chain.from_iterable(prices), dtype=np.float64, count=int(counts.sum())
+            )
+        else:
+            offsets = np.asarray(offsets, dtype=np.int64)
+            counts = np.diff(offsets)
+            flat = np.asarray(prices, dtype=np.float64)[offsets[0] : offsets[-1]]
+
+        n_products = len(counts)
+        if not len(flat):
+            return [None] * n_products
+
+        segment = np.repeat(np.arange(n_products), counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+
+        # Ordenar cada segmento: chave inteira (produto, posição global do preço)
+        total = len(flat)
+        order = np.argsort(flat)
+        rank = np.empty(total, dtype=np.int64)
+        rank[order] = np.arange(total)
+        keys = segment * total + rank
+        keys.sort()
+        sorted_prices = flat[order[keys % total]]
+
+        # Limites IQR (quartis por índice, apenas com 4 ou mais preços)
+        has_iqr = counts >= 4
+        q1 = sorted_prices[np.where(has_iqr, starts + counts // 4, 0)]
+        q3 = sorted_prices[np.where(has_iqr, starts + 3 * counts // 4, 0)]
+        iqr = q3 - q1
+        lower = np.where(has_iqr, q1 - 1.5 * iqr, -np.inf)
+        upper = np.where(has_iqr, q3 + 1.5 * iqr, np.inf)
+
+        keep = (sorted_prices >= lower[segment]) & (sorted_prices <= upper[segment])
+        clean = sorted_prices[keep]
+        clean_counts = np.bincount(segment[keep], minlength=n_products)
+        clean_starts = np.concatenate(([0], np.cumsum(clean_counts)[:-1])).astype(
+            np.int64
+        )
+
+        # Mínimo, máximo e mediana a partir dos segmentos já ordenados
+        valid = clean_counts > 0
+        first = np.where(valid, clean_starts, 0)
+        last = np.where(valid, clean_starts + clean_counts - 1, 0)
+        upper_mid = np.where(valid, clean_starts + clean_counts // 2, 0)
+        lower_mid = np.where(valid, clean_starts + (clean_counts - 1) // 2, 0)
+
+        minimum = clean[first]
+        maximum = clean[last]
+        median = np.where(
+            clean_counts % 2 == 1,
+            clean[upper_mid],
+            (clean[lower_mid] + clean[upper_mid]) / 2,
+        )
+
+        columns = zip(
+            clean_counts.tolist(), median.tolist(), minimum.tolist(), maximum.tolist()
+        )
+        return [(c, med, lo, hi) if c else None for c, med, lo, hi in columns]
+
+    def _build_recommendation(
+        self, product_info: dict, stats: Optional[PriceStats]
+    ) -> PriceRecommendation:
+        """Constrói a recomendação a partir das estatísticas de um produto"""
+        if stats is None:
+            return self._get_fallback_price(product_info)
+
+        count, median_price, min_price, max_price = stats
 
         # Ajustar baseado no estado
         condition = product_info.get("condition", "bom")
         multiplier = self._get_condition_multiplier(condition)
         suggested = median_price * multiplier
 
-        # Calcular margens mais inteligentes
-        min_price = min(clean_prices)
-        max_price = max(clean_prices)
-
         return PriceRecommendation(
             suggested=round(suggested, 2),
             minimum=round(
@@ -57,9 +269,9 @@ class PricingEngine:
             maximum=round(
                 min(max_price, suggested * 1.4), 2
             ),  # Não acima do máximo de mercado
-            confidence=min(0.95, len(clean_prices) / 15),
+            confidence=min(0.95, count / 15),
             reasoning=[
-                f"Baseado em {len(clean_prices)} preços reais da Vinted",
+                f"Baseado em {count} preços reais da Vinted",
                 f"Mediana de mercado: {median_price:.2f}€",
                 f"Variação observada: {min_price:.2f}€ - {max_price:.2f}€",
                 f"Ajustado para estado: {condition}",
@@ -88,6 +300,7 @@ class PricingEngine:
 
         condition = product_info.get("condition", "bom")
         base = base_prices.get(condition, 15.0)
+        logger.debug("Sem dados de mercado: preço base %.2f€ (%s)", base, condition)
 
         return PriceRecommendation(
             suggested=base,
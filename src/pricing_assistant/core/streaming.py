@@ -0,0 +1,154 @@
+"""
+Estatísticas incrementais de preços (quantis P² em O(1) por preço)
+"""
+
+import math
+from bisect import insort
+from typing import Iterable, List, Optional
+
+from .pricing_engine import PriceStats
+
+
+class P2Quantile:
+    """Estimador P² (Jain & Chlamtac) de um quantil, com 5 marcadores
+
+    As primeiras ``EXACT`` observações ficam numa amostra ordenada (valor
+    exato) que depois inicializa os marcadores; a partir daí cada preço custa
+    O(1) e a memória é constante.
+    """
+
+    EXACT = 32
+
+    __slots__ = (
+        "p",
+        "count",
+        "_sample",
+        "_heights",
+        "_positions",
+        "_desired",
+        "_increments",
+    )
+
+    def __init__(self, p: float):
+        self.p = p
+        self.count = 0
+        self._sample: Optional[List[float]] = []
+        self._heights: List[float] = []
+        self._positions: List[int] = []
+        self._desired: List[float] = []
+        self._increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x: float):
+        self.count += 1
+        if self._sample is not None:
+            insort(self._sample, x)
+            if self.count == self.EXACT:
+                self._init_markers()
+            return
+
+        q = self._heights
+        n = self._positions
+        # Célula onde x cai, ajustando os extremos se necessário
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        desired = self._desired
+        for i, increment in enumerate(self._increments):
+            desired[i] += increment
+
+        # Ajustar os marcadores centrais (parabólico, ou linear se sair do intervalo)
+        for i in (1, 2, 3):
+            d = desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+
+    def _init_markers(self):
+        """Marcadores P² nas posições dos quantis p/2, p e (1+p)/2 da amostra"""
+        last = self.count - 1
+        for increment in self._increments:
+            index = round(increment * last)
+            self._heights.append(self._sample[index])
+            self._positions.append(index + 1)
+            self._desired.append(1 + increment * last)
+        self._sample = None
+
+    @property
+    def value(self) -> Optional[float]:
+        """Estimativa atual do quantil (None sem observações)"""
+        if not self.count:
+            return None
+        if self._sample is None:
+            return self._heights[2]
+
+        # Poucas observações: quantil exato com interpolação linear
+        q = self._sample
+        position = self.p * (self.count - 1)
+        lower = math.floor(position)
+        upper = min(lower + 1, self.count - 1)
+        return q[lower] + (q[upper] - q[lower]) * (position - lower)
+
+
+class StreamingPriceEstimator:
+    """Q1, mediana, Q3, mínimo, máximo e contagem atualizados preço a preço
+
+    Permite uma recomendação provisória após cada página
+    (``PricingEngine.provisional_price``), sem guardar nem reordenar os
+    preços; o formato de ``stats()`` é o do ``_build_recommendation``.
+    """
+
+    __slots__ = ("count", "minimum", "maximum", "q1", "median", "q3")
+
+    def __init__(self):
+        self.count = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.q1 = P2Quantile(0.25)
+        self.median = P2Quantile(0.5)
+        self.q3 = P2Quantile(0.75)
+
+    def add(self, price: float):
+        self.count += 1
+        if price < self.minimum:
+            self.minimum = price
+        if price > self.maximum:
+            self.maximum = price
+        self.q1.add(price)
+        self.median.add(price)
+        self.q3.add(price)
+
+    def extend(self, prices: Iterable[float]):
+        for price in prices:
+            self.add(price)
+
+    def stats(self) -> Optional[PriceStats]:
+        """Estatísticas no formato do PricingEngine (limites IQR aproximados)"""
+        if not self.count:
+            return None
+
+        minimum, maximum = self.minimum, self.maximum
+        if self.count >= 4:
+            # Os outliers não ficam guardados: cortar os extremos nos limites IQR
+            q1, q3 = self.q1.value, self.q3.value
+            iqr = q3 - q1
+            minimum = max(minimum, q1 - 1.5 * iqr)
+            maximum = min(maximum, q3 + 1.5 * iqr)
+
+        return self.count, self.median.value, minimum, maximum
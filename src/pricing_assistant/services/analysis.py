@@ -2,48 +2,679 @@
 Serviço de análise
 """
 
-from typing import List
-from ..core.pricing_engine import PricingEngine
-from ..sources.base import MarketDataSource
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass
+from functools import partial
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from ..core.listing import ListingBatch
+from ..core.pricing_engine import PriceRecommendation, PricingEngine
+from ..core.streaming import StreamingPriceEstimator
+from ..sources.base import RUNTIME_FILTERS, MarketDataSource
+from ..sources.parse_pool import open_parse_pool
+from ..utils.cancellation import Cancelled, CancellationToken
+from ..utils.config import Config
+from ..utils.metrics import metrics
+from ..utils.singleflight import SingleFlight
+from .batch import batch_key
+from .health import HealthMonitor
+from .history import open_history, product_key
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AnalysisProgress:
+    """Estado de uma análise em curso, enviado após cada página recebida"""
+
+    pages: int  # páginas processadas (todas as fontes)
+    expected_pages: int  # páginas pedidas (máx. de páginas x fontes)
+    listings: int  # listagens selecionadas até agora (as que entram no preço)
+    recommendation: PriceRecommendation  # estimativa provisória
 
 
 class AnalysisService:
     """Serviço principal de análise"""
 
-    def __init__(self, data_sources: List[MarketDataSource]):
+    def __init__(
+        self, data_sources: List[MarketDataSource], config: Optional[Config] = None
+    ):
         self.data_sources = data_sources
-        self.pricing_engine = PricingEngine()
+        self.config = config or Config()
+        self.history = open_history(self.config)
+        self.pricing_engine = PricingEngine(
+            history=self.history, history_days=self.config.history_window_days
+        )
+        self.health = HealthMonitor(
+            ttl=self.config.health_ttl,
+            failure_threshold=self.config.circuit_failure_threshold,
+            cooldown=self.config.circuit_cooldown,
+        )
+        # Análises idênticas em simultâneo partilham a mesma recolha
+        self._inflight = SingleFlight("analysis")
 
-    def analyze_product(self, product_name: str, condition: str = "bom") -> dict:
-        """Analisa um produto"""
-        print(f"🔍 Analisando: {product_name} ({condition})")
+        # Parsing de HTML em processos (opcional), partilhado pelas fontes
+        self.parse_pool = open_parse_pool(self.config)
+        if self.parse_pool is not None:
+            self.parse_pool.start()
+            for source in self.data_sources:
+                source.use_parse_pool(self.parse_pool)
 
-        # Coletar dados de mercado
-        market_data = self._collect_market_data(product_name, condition)
+    def close(self):
+        """Termina o pool de parsing e fecha o histórico"""
+        if self.parse_pool is not None:
+            for source in self.data_sources:
+                source.use_parse_pool(None)
+            self.parse_pool.close()
+            self.parse_pool = None
+        if self.history is not None:
+            self.history.close()
 
-        # Calcular preço
+    def __enter__(self) -> "AnalysisService":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def analyze_product(
+        self,
+        product_name: str,
+        condition: str = "bom",
+        max_pages: Optional[int] = None,
+        on_progress: Optional[Callable[[AnalysisProgress], None]] = None,
+        cancel: Optional[CancellationToken] = None,
+    ) -> dict:
+        """Analisa um produto
+
+        ``on_progress`` recebe um AnalysisProgress (páginas, listagens e
+        recomendação provisória) após cada página recebida de cada fonte,
+        chamado a partir das threads das fontes. Se a mesma análise já
+        estiver em curso noutra thread, espera-se pelo resultado dela em vez
+        de repetir a recolha (sem progresso).
+
+        Com ``cancel`` a recolha é própria (nunca partilhada) e termina com
+        Cancelled assim que as fontes notam o cancelamento do token.
+        """
+        logger.info("Analisando: %s (%s)", product_name, condition)
         product_info = {"name": product_name, "condition": condition}
-        recommendation = self.pricing_engine.calculate_price(product_info, market_data)
+
+        with metrics.timer("analysis"):
+            # Coletar dados de mercado
+            filters = self._filters(condition, max_pages)
+            if on_progress is not None:
+                filters["on_page"] = self._progress_callback(
+                    product_info, on_progress, self._expected_pages(max_pages)
+                )
+            if cancel is not None:
+                # Cancelar não pode interromper a recolha de outra chamada
+                filters["cancel"] = cancel
+                market_data = self._collect_market_data(product_name, filters)
+            else:
+                market_data = self._inflight.do(
+                    self._flight_key(product_name, filters),
+                    self._collect_market_data,
+                    product_name,
+                    filters,
+                )
+
+            # Calcular preço
+            recommendation = self.pricing_engine.calculate_price(
+                product_info, market_data
+            )
+
+        return self._analysis_result(product_info, recommendation, market_data)
+
+    async def aanalyze_product(
+        self,
+        product_name: str,
+        condition: str = "bom",
+        max_pages: Optional[int] = None,
+        on_progress: Optional[Callable[[AnalysisProgress], None]] = None,
+    ) -> dict:
+        """Versão assíncrona de analyze_product (fontes consultadas com asearch())
+
+        Partilha as recolhas em curso com analyze_product: chamadas idênticas,
+        de threads ou de tarefas, fazem uma só recolha.
+        """
+        logger.info("Analisando: %s (%s)", product_name, condition)
+        product_info = {"name": product_name, "condition": condition}
+
+        with metrics.timer("analysis"):
+            filters = self._filters(condition, max_pages)
+            if on_progress is not None:
+                filters["on_page"] = self._progress_callback(
+                    product_info, on_progress, self._expected_pages(max_pages)
+                )
+            market_data = await self._inflight.ado(
+                self._flight_key(product_name, filters),
+                self._acollect_market_data,
+                product_name,
+                filters,
+            )
+            recommendation = await asyncio.to_thread(
+                self.pricing_engine.calculate_price, product_info, market_data
+            )
+
+        return self._analysis_result(product_info, recommendation, market_data)
+
+    def _filters(self, condition: str, max_pages: Optional[int]) -> dict:
+        filters = {"condition": condition}
+        if max_pages:
+            filters["max_pages"] = max_pages
+        return filters
+
+    def _flight_key(self, query: str, filters: dict) -> Hashable:
+        """Chave das análises equivalentes: query normalizada e filtros"""
+        options = sorted(
+            (name, value)
+            for name, value in filters.items()
+            if name not in RUNTIME_FILTERS
+        )
+        return product_key(query), tuple(options)
+
+    def _analysis_result(
+        self,
+        product_info: dict,
+        recommendation: PriceRecommendation,
+        market_data: dict,
+    ) -> dict:
+        metrics.incr("analyses")
+        metrics.maybe_flush()
 
         return {
-            "product": product_name,
-            "condition": condition,
+            "product": product_info["name"],
+            "condition": product_info["condition"],
             "recommendation": recommendation,
             "market_data": market_data,
         }
 
-    def _collect_market_data(self, query: str, condition: str) -> dict:
-        """Coleta dados de todas as fontes disponíveis"""
-        all_prices = []
+    def _expected_pages(self, max_pages: Optional[int]) -> int:
+        sources = 0 if self.config.offline else len(self.data_sources)
+        return (max_pages or self.config.max_pages) * sources
+
+    def _progress_callback(
+        self,
+        product_info: dict,
+        on_progress: Callable[[AnalysisProgress], None],
+        expected_pages: int,
+    ) -> Callable[[str, list], None]:
+        """Callback de página que atualiza a estimativa incremental de preço
+
+        Cada fonte envia a sua seleção atual (as listagens que entram no
+        resultado final); só as listagens ainda não vistas entram no
+        StreamingPriceEstimator, em O(1) por preço. O histórico entra logo no
+        início e as listagens que o repetem (mesma fonte, url e preço) não
+        contam a dobrar, tal como no cálculo final. Listagens que saem do
+        top-K de uma fonte continuam na estimativa.
+        """
+        history = set(self._history_observations(product_info["name"]))
+        estimator = StreamingPriceEstimator()
+        estimator.extend(price for _, _, price in history)
+        counted = set(history)
+        revisited = set()
+        selected: Dict[str, int] = {}
+        lock = threading.Lock()
+        pages = 0
+
+        def on_page(source_name: str, listings: list):
+            nonlocal pages
+            with lock:
+                pages += 1
+                selected[source_name] = len(listings)
+                for listing in listings:
+                    key = (source_name, listing.url, listing.price)
+                    if key not in counted:
+                        counted.add(key)
+                        estimator.add(listing.price)
+                    elif key in history:
+                        revisited.add(key)
+
+                progress = AnalysisProgress(
+                    pages=pages,
+                    expected_pages=max(expected_pages, pages),
+                    listings=sum(selected.values()),
+                    recommendation=self.pricing_engine.provisional_price(
+                        product_info, estimator, len(history) - len(revisited)
+                    ),
+                )
+            on_progress(progress)
+
+        return on_page
+
+    def _history_observations(self, query: str) -> List[Tuple[str, str, float]]:
+        """Observações do histórico na janela do PricingEngine (vazia sem ele)"""
+        if self.history is None:
+            return []
+        try:
+            return self.history.observations(
+                query, days=self.pricing_engine.history_days, until=time.time()
+            )
+        except sqlite3.Error as e:
+            logger.warning("Histórico de preços indisponível: %s", e)
+            return []
+
+    def _source_filters(
+        self,
+        source: MarketDataSource,
+        filters: dict,
+        closed: Optional[CancellationToken] = None,
+    ) -> dict:
+        """Filtros de uma fonte (o callback de página passa a indicar a fonte)
+
+        Com ``closed`` as páginas que chegam depois de a recolha ter desistido
+        da fonte já não são enviadas ao callback.
+        """
+        on_page = filters.get("on_page")
+        if on_page is None:
+            return filters
+        if closed is None:
+            return {**filters, "on_page": partial(on_page, source.name)}
+
+        def on_source_page(listings: list):
+            if not closed.cancelled:
+                on_page(source.name, listings)
+
+        return {**filters, "on_page": on_source_page}
+
+    def analyze_batch(
+        self,
+        items: Iterable[dict],
+        max_workers: int = 4,
+        skip: Optional[Set[str]] = None,
+        on_progress: Optional[Callable[[dict, AnalysisProgress], None]] = None,
+    ) -> Iterator[dict]:
+        """Analisa vários produtos em paralelo, devolvendo cada registo ao terminar
+
+        ``items`` é consumido à medida que há workers livres (no máximo
+        ``2 * max_workers`` análises em curso). Queries repetidas e as chaves
+        presentes em ``skip`` (checkpoint) não são analisadas. ``on_progress``
+        recebe o item e o AnalysisProgress de cada página (preço provisório).
+        """
+        seen = set(skip or ())
+        pending = {}
+
+        with ThreadPoolExecutor(max_workers, thread_name_prefix="batch") as executor:
+            for item in items:
+                key = batch_key(item["name"], item.get("condition", "bom"))
+                if key in seen:
+                    continue
+                seen.add(key)
+
+                future = executor.submit(
+                    self.analyze_product,
+                    item["name"],
+                    item.get("condition", "bom"),
+                    max_pages=item.get("max_pages"),
+                    on_progress=partial(on_progress, item) if on_progress else None,
+                )
+                pending[future] = (key, item)
+
+                if len(pending) >= 2 * max_workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield self._batch_record(future, *pending.pop(future))
+
+            for future in as_completed(pending):
+                yield self._batch_record(future, *pending[future])
+
+    async def aanalyze_batch(
+        self,
+        items: Iterable[dict],
+        max_concurrent: int = 4,
+        on_progress: Optional[Callable[[dict, AnalysisProgress], None]] = None,
+    ) -> AsyncIterator[dict]:
+        """Versão assíncrona de analyze_batch (registos pela ordem de conclusão)"""
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def analyze(item: dict) -> dict:
+            async with semaphore:
+                return await self.aanalyze_product(
+                    item["name"],
+                    item.get("condition", "bom"),
+                    max_pages=item.get("max_pages"),
+                    on_progress=partial(on_progress, item) if on_progress else None,
+                )
+
+        seen = set()
+        tasks = {}
+        for item in items:
+            key = batch_key(item["name"], item.get("condition", "bom"))
+            if key not in seen:
+                seen.add(key)
+                tasks[asyncio.ensure_future(analyze(item))] = (key, item)
+
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield self._batch_record(task, *tasks[task])
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _batch_record(self, future, key: str, item: dict) -> dict:
+        """Registo plano de uma análise em lote (para JSONL/CSV)"""
+        record = {
+            "key": key,
+            "product": item["name"],
+            "condition": item.get("condition", "bom"),
+            "suggested": None,
+            "minimum": None,
+            "maximum": None,
+            "confidence": None,
+            "prices": 0,
+            "error": None,
+        }
+        try:
+            result = future.result()
+        except Exception as e:
+            record["error"] = str(e)
+            return record
+
+        error = self._sources_error(result["market_data"]["sources"])
+        if error:
+            record["error"] = error
+            return record
+
+        recommendation = result["recommendation"]
+        record.update(
+            suggested=recommendation.suggested,
+            minimum=recommendation.minimum,
+            maximum=recommendation.maximum,
+            confidence=round(recommendation.confidence, 3),
+            prices=len(result["market_data"]["prices"]),
+        )
+        return record
+
+    def _sources_error(self, sources: dict) -> Optional[str]:
+        """Erro quando nenhuma das fontes consultadas respondeu (preço de recurso)"""
+        if not sources or any(info["status"] == "ok" for info in sources.values()):
+            return None
+        failed = ", ".join(
+            f"{name} ({info['status']})" for name, info in sources.items()
+        )
+        return f"todas as fontes falharam: {failed}"
+
+    def _collect_market_data(self, query: str, filters: dict) -> dict:
+        """Coleta dados de todas as fontes disponíveis em paralelo"""
+        market_data = self._empty_market_data()
+        if not self.data_sources or self.config.offline:
+            return market_data
+
+        collected_at = market_data["collected_at"]
+        # Token por fonte: cancelado quando a recolha deixa de a esperar
+        closed = {source.name: CancellationToken() for source in self.data_sources}
+        executor = ThreadPoolExecutor(
+            max_workers=len(self.data_sources), thread_name_prefix="source"
+        )
+        futures = {
+            executor.submit(
+                self._query_source,
+                source,
+                query,
+                filters,
+                collected_at,
+                closed[source.name],
+            ): source
+            for source in self.data_sources
+        }
+
+        start = time.monotonic()
+        deadlines = {
+            future: start + self._source_timeout(source)
+            for future, source in futures.items()
+        }
+        pending = set(futures)
+        try:
+            # Resultados parciais: cada fonte é cortada no seu próprio prazo
+            while pending:
+                remaining = min(deadlines[future] for future in pending)
+                done, pending = wait(
+                    pending,
+                    timeout=max(0.0, remaining - time.monotonic()),
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    self._add_source_result(
+                        market_data, futures[future], *future.result()
+                    )
+                now = time.monotonic()
+                for future in [f for f in pending if deadlines[f] <= now]:
+                    pending.discard(future)
+                    source = futures[future]
+                    closed[source.name].cancel()
+                    self._add_source_timeout(
+                        market_data, source, deadlines[future] - start
+                    )
+        finally:
+            for token in closed.values():
+                token.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        # Fontes que não conhecem o token devolvem dados parciais: descartar
+        cancel = filters.get("cancel")
+        if cancel is not None:
+            cancel.raise_if_cancelled()
+        return market_data
+
+    async def _acollect_market_data(self, query: str, filters: dict) -> dict:
+        """Coleta dados de todas as fontes como tarefas do event loop"""
+        market_data = self._empty_market_data()
+        if not self.data_sources or self.config.offline:
+            return market_data
+
+        collected_at = market_data["collected_at"]
+        closed = {source.name: CancellationToken() for source in self.data_sources}
+        tasks = {
+            asyncio.ensure_future(
+                self._aquery_source(
+                    source, query, filters, collected_at, closed[source.name]
+                )
+            ): source
+            for source in self.data_sources
+        }
+
+        start = time.monotonic()
+        deadlines = {
+            task: start + self._source_timeout(source) for task, source in tasks.items()
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                remaining = min(deadlines[task] for task in pending)
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=max(0.0, remaining - time.monotonic()),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    self._add_source_result(market_data, tasks[task], *task.result())
+                now = time.monotonic()
+                for task in [t for t in pending if deadlines[t] <= now]:
+                    pending.discard(task)
+                    task.cancel()
+                    source = tasks[task]
+                    closed[source.name].cancel()
+                    self._add_source_timeout(
+                        market_data, source, deadlines[task] - start
+                    )
+        finally:
+            for token in closed.values():
+                token.cancel()
+            for task in pending:
+                task.cancel()
+
+        return market_data
+
+    def _source_timeout(self, source: MarketDataSource) -> float:
+        """Prazo de uma fonte (``source_timeouts`` ou o comum), dentro do global"""
+        timeout = self.config.source_timeouts.get(
+            source.name, self.config.source_timeout
+        )
+        return min(timeout, self.config.timeout)
+
+    def _empty_market_data(self) -> dict:
+        listings = ListingBatch()
+        return {
+            # Vetor de preços do lote: o PricingEngine lê-o sem cópias
+            "prices": listings.prices,
+            "listings": listings,
+            "sources": {},
+            # Observações desta recolha ficam fora da janela do histórico
+            "collected_at": time.time(),
+        }
+
+    def _add_source_result(
+        self,
+        market_data: dict,
+        source: MarketDataSource,
+        status: str,
+        listings: ListingBatch,
+        elapsed: float,
+    ):
+        market_data["listings"].extend(listings)
+        market_data["sources"][source.name] = {
+            "status": status,
+            "prices": len(listings),
+            "elapsed": round(elapsed, 3),
+            "circuit": self.health.state(source.name),
+        }
+
+    def _add_source_timeout(
+        self, market_data: dict, source: MarketDataSource, timeout: float
+    ):
+        logger.warning("%s: sem resposta em %ss", source.name, timeout)
+        self.health.record_failure(source.name)
+        market_data["sources"][source.name] = {
+            "status": "timeout",
+            "prices": 0,
+            "elapsed": round(timeout, 3),
+            "circuit": self.health.state(source.name),
+        }
+
+    def _query_source(
+        self,
+        source: MarketDataSource,
+        query: str,
+        filters: dict,
+        collected_at: Optional[float] = None,
+        closed: Optional[CancellationToken] = None,
+    ):
+        """Consulta uma fonte, devolvendo (estado, listagens, duração)
+
+        ``closed`` é cancelado quando a recolha já não espera pela fonte (prazo
+        esgotado ou análise terminada): uma resposta tardia é descartada sem
+        efeitos (saúde, histórico, callback de página).
+        """
+        start = time.perf_counter()
+        if not self.health.allow(source):
+            return self._source_unavailable(source, start)
+
+        try:
+            # Fontes antigas que devolvem dicionários continuam a funcionar
+            listings = ListingBatch.coerce(
+                source.search(query, **self._source_filters(source, filters, closed))
+            )
+        except Cancelled:
+            # Não conta como falha da fonte, mas liberta o teste half-open
+            self.health.release_trial(source.name)
+            raise
+        except Exception as e:
+            if closed is not None and closed.cancelled:
+                return self._source_late(source, start)
+            return self._source_failed(source, e, start)
+
+        if closed is not None and closed.cancelled:
+            return self._source_late(source, start)
+        return self._source_ok(source, query, listings, collected_at, start)
+
+    async def _aquery_source(
+        self,
+        source: MarketDataSource,
+        query: str,
+        filters: dict,
+        collected_at: Optional[float] = None,
+        closed: Optional[CancellationToken] = None,
+    ):
+        """Versão assíncrona de _query_source (pesquisa com asearch())"""
+        start = time.perf_counter()
+        # allow() pode fazer um pedido de verificação (is_available)
+        if not await asyncio.to_thread(self.health.allow, source):
+            return self._source_unavailable(source, start)
+
+        try:
+            listings = ListingBatch.coerce(
+                await source.asearch(
+                    query, **self._source_filters(source, filters, closed)
+                )
+            )
+        except (Cancelled, asyncio.CancelledError):
+            self.health.release_trial(source.name)
+            raise
+        except Exception as e:
+            if closed is not None and closed.cancelled:
+                return self._source_late(source, start)
+            return self._source_failed(source, e, start)
+
+        if closed is not None and closed.cancelled:
+            return self._source_late(source, start)
+        return await asyncio.to_thread(
+            self._source_ok, source, query, listings, collected_at, start
+        )
+
+    def _source_unavailable(self, source: MarketDataSource, start: float):
+        logger.warning(
+            "%s: indisponível (circuito %s)",
+            source.name,
+            self.health.state(source.name),
+        )
+        return "unavailable", ListingBatch(), time.perf_counter() - start
+
+    def _source_failed(self, source: MarketDataSource, error: Exception, start: float):
+        self.health.record_failure(source.name)
+        logger.warning("%s: %s", source.name, error)
+        return "error", ListingBatch(), time.perf_counter() - start
+
+    def _source_late(self, source: MarketDataSource, start: float):
+        # O timeout já contou como falha e a análise seguiu sem esta fonte
+        metrics.incr("source_late_results")
+        logger.info("%s: resposta tardia descartada", source.name)
+        return "timeout", ListingBatch(), time.perf_counter() - start
 
-        for source in self.data_sources:
-            if source.is_available():
-                try:
-                    listings = source.search(query, condition=condition)
-                    prices = [item["price"] for item in listings if "price" in item]
-                    all_prices.extend(prices)
-                    print(f"   ✅ {source.name}: {len(prices)} preços")
-                except Exception as e:
-                    print(f"   ❌ {source.name}: {e}")
+    def _source_ok(
+        self,
+        source: MarketDataSource,
+        query: str,
+        listings: ListingBatch,
+        collected_at: Optional[float],
+        start: float,
+    ):
+        self.health.record_success(source.name)
+        if self.history is not None:
+            try:
+                self.history.record(query, source.name, listings, ts=collected_at)
+            except sqlite3.Error as e:
+                # O histórico é acessório: a recolha continua válida sem ele
+                logger.warning("%s: histórico não gravado: %s", source.name, e)
 
-        return {"prices": all_prices}
+        logger.info("%s: %d preços", source.name, len(listings))
+        return "ok", listings, time.perf_counter() - start
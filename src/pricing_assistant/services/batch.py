@@ -0,0 +1,150 @@
+"""
+Leitura, escrita e checkpoint para análises em lote (CSV/JSONL)
+"""
+
+import csv
+import json
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Set
+
+from .history import product_key
+
+RECORD_FIELDS = [
+    "product",
+    "condition",
+    "suggested",
+    "minimum",
+    "maximum",
+    "confidence",
+    "prices",
+    "error",
+]
+
+
+def batch_key(name: str, condition: str) -> str:
+    """Chave de deduplicação: produto normalizado como no histórico + estado"""
+    return f"{product_key(name)}|{condition}"
+
+
+def read_items(path) -> Iterator[dict]:
+    """Lê linhas (name, condition[, max_pages]) de CSV ou JSONL, uma a uma"""
+    path = Path(path)
+    with path.open(encoding="utf-8", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+
+        for row in rows:
+            name = (row.get("name") or "").strip()
+            if not name:
+                continue
+            item = {"name": name, "condition": row.get("condition") or "bom"}
+            if row.get("max_pages"):
+                item["max_pages"] = int(row["max_pages"])
+            yield item
+
+
+class BatchCheckpoint:
+    """Ficheiro append-only com as chaves já concluídas"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def load(self) -> Set[str]:
+        if not self.path.exists():
+            return set()
+        with self.path.open(encoding="utf-8") as f:
+            return {line.rstrip("\n") for line in f if line.strip()}
+
+    def __enter__(self):
+        self._file = self.path.open("a", encoding="utf-8")
+        return self
+
+    def __exit__(self, *exc):
+        self._file.close()
+
+    def mark_done(self, key: str):
+        self._file.write(key + "\n")
+        self._file.flush()
+
+
+class ResultWriter:
+    """Escreve registos de recomendação em JSONL ou CSV à medida que chegam"""
+
+    def __init__(self, path, append: bool = False):
+        self.path = Path(path)
+        self.append = append
+        self.format = "csv" if self.path.suffix.lower() == ".csv" else "jsonl"
+
+    def __enter__(self):
+        write_header = not (
+            self.append and self.path.exists() and self.path.stat().st_size
+        )
+        self._file = self.path.open(
+            "a" if self.append else "w", encoding="utf-8", newline=""
+        )
+        if self.format == "csv":
+            self._csv = csv.DictWriter(
+                self._file, fieldnames=RECORD_FIELDS, extrasaction="ignore"
+            )
+            if write_header:
+                self._csv.writeheader()
+        return self
+
+    def __exit__(self, *exc):
+        self._file.close()
+
+    def write(self, record: dict):
+        if self.format == "csv":
+            self._csv.writerow(record)
+        else:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+
+def run_batch(
+    service,
+    input_path,
+    output_path,
+    max_workers: int = 4,
+    checkpoint_path: Optional[str] = None,
+    on_progress: Optional[Callable] = None,
+) -> dict:
+    """Executa um lote completo, retomando a partir do checkpoint se existir
+
+    Só as análises sem erro ficam no checkpoint: ao retomar, os produtos que
+    falharam voltam a ser analisados (e escritos de novo). ``on_progress(item,
+    progress)`` recebe o preço provisório de cada produto após cada página
+    (ver ``AnalysisService.analyze_batch``).
+    """
+    checkpoint = BatchCheckpoint(checkpoint_path or f"{output_path}.checkpoint")
+    done = checkpoint.load()
+
+    stats = {"written": 0, "errors": 0, "skipped": 0}
+    with ResultWriter(output_path, append=bool(done)) as writer, checkpoint:
+        records = service.analyze_batch(
+            _pending_items(read_items(input_path), done, stats),
+            max_workers=max_workers,
+            on_progress=on_progress,
+        )
+        for record in records:
+            key = record.pop("key")
+            writer.write(record)
+
+            stats["written"] += 1
+            if record["error"]:
+                stats["errors"] += 1
+            else:
+                checkpoint.mark_done(key)
+
+    return stats
+
+
+def _pending_items(items: Iterable[dict], done: Set[str], stats: dict):
+    """Itens ainda por analisar; conta em ``stats["skipped"]`` os já concluídos"""
+    for item in items:
+        if batch_key(item["name"], item.get("condition", "bom")) in done:
+            stats["skipped"] += 1
+        else:
+            yield item
@@ -0,0 +1,108 @@
+"""
+Estado de saúde das fontes de dados (cache de disponibilidade + circuit breaker)
+"""
+
+import threading
+import time
+from typing import Dict
+
+from ..sources.base import MarketDataSource
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class SourceHealth:
+    """Estado observado de uma fonte"""
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.checked_at = None
+        self.trial_in_flight = False
+
+
+class HealthMonitor:
+    """Decide se uma fonte deve ser consultada, com base nas pesquisas reais
+
+    O estado de cada fonte é mantido durante ``ttl`` segundos e alimentado
+    pelo resultado das pesquisas; ``is_available()`` só é chamado quando o
+    estado expira. Após ``failure_threshold`` falhas seguidas o circuito abre
+    e a fonte é ignorada durante ``cooldown`` segundos, seguindo-se uma única
+    pesquisa de teste (half-open).
+    """
+
+    def __init__(
+        self, ttl: float = 60, failure_threshold: int = 3, cooldown: float = 30
+    ):
+        self.ttl = ttl
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._sources: Dict[str, SourceHealth] = {}
+
+    def _health(self, name: str) -> SourceHealth:
+        if name not in self._sources:
+            self._sources[name] = SourceHealth()
+        return self._sources[name]
+
+    def allow(self, source: MarketDataSource) -> bool:
+        """Indica se a fonte pode ser consultada agora"""
+        with self._lock:
+            health = self._health(source.name)
+            now = time.monotonic()
+
+            if health.state == OPEN:
+                if now - health.opened_at < self.cooldown:
+                    return False
+                health.state = HALF_OPEN
+                health.trial_in_flight = False
+
+            if health.state == HALF_OPEN:
+                # Apenas uma pesquisa de teste de cada vez
+                if health.trial_in_flight:
+                    return False
+                health.trial_in_flight = True
+                return True
+
+            checked_at = health.checked_at
+            if checked_at is not None and now - checked_at < self.ttl:
+                return True
+
+        # Estado expirado: uma verificação explícita, fora do lock
+        if source.is_available():
+            self.record_success(source.name)
+            return True
+        self.record_failure(source.name)
+        return False
+
+    def record_success(self, name: str):
+        with self._lock:
+            health = self._health(name)
+            health.state = CLOSED
+            health.failures = 0
+            health.trial_in_flight = False
+            health.checked_at = time.monotonic()
+
+    def record_failure(self, name: str):
+        with self._lock:
+            health = self._health(name)
+            now = time.monotonic()
+            health.failures += 1
+            health.checked_at = now
+            health.trial_in_flight = False
+
+            if health.state == HALF_OPEN or health.failures >= self.failure_threshold:
+                health.state = OPEN
+                health.opened_at = now
+
+    def release_trial(self, name: str):
+        """Liberta a pesquisa de teste interrompida, sem sucesso nem falha"""
+        with self._lock:
+            self._health(name).trial_in_flight = False
+
+    def state(self, name: str) -> str:
+        with self._lock:
+            return self._health(name).state
@@ -0,0 +1,148 @@
+"""
+Histórico local de preços observados (SQLite indexado por produto e tempo)
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from ..core.listing import ListingBatch
+from ..sources.relevance import normalize_text
+from ..utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+DAY = 86400
+
+
+def product_key(query: str) -> str:
+    """Chave normalizada do produto: minúsculas, sem acentos nem espaços extra"""
+    return " ".join(normalize_text(query).split())
+
+
+class PriceHistory:
+    """Série temporal das listagens vistas em cada análise
+
+    Cada listagem fica registada uma vez por (produto, fonte, url, preço) e
+    uma alteração de preço gera uma nova observação. Voltar a ver a mesma
+    listagem só atualiza ``ts`` (última vez vista; ``first_seen`` mantém-se),
+    pelo que as listagens da recolha atual nunca contam a dobrar na janela.
+    O índice (produto, ts, preço) cobre as consultas por janela temporal.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS price_history (
+                product_key TEXT NOT NULL,
+                ts REAL NOT NULL,
+                first_seen REAL NOT NULL,
+                price REAL NOT NULL,
+                condition TEXT NOT NULL,
+                title TEXT NOT NULL,
+                source TEXT NOT NULL,
+                url TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_price_history_window "
+            "ON price_history (product_key, ts, price)"
+        )
+        self._conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_price_history_listing "
+            "ON price_history (product_key, source, url, price)"
+        )
+        self._conn.commit()
+
+    def record(
+        self,
+        query: str,
+        source: str,
+        listings: ListingBatch,
+        ts: Optional[float] = None,
+    ) -> int:
+        """Regista as listagens de uma pesquisa; devolve o nº de linhas escritas"""
+        if not len(listings):
+            return 0
+
+        key = product_key(query)
+        ts = time.time() if ts is None else ts
+        rows = [
+            (key, ts, ts, price, condition, normalize_text(title), source, url)
+            for title, price, condition, url in zip(
+                listings.titles, listings.prices, listings.conditions, listings.urls
+            )
+        ]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                """
+                INSERT INTO price_history VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (product_key, source, url, price)
+                DO UPDATE SET ts = max(ts, excluded.ts)
+                """,
+                rows,
+            )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def prices(
+        self, query: str, days: float = 30, until: Optional[float] = None
+    ) -> array:
+        """Preços observados para o produto em ``[until - days, until)``"""
+        until = time.time() if until is None else until
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT price FROM price_history "
+                "WHERE product_key = ? AND ts >= ? AND ts < ?",
+                (product_key(query), until - days * DAY, until),
+            )
+            return array("d", (row[0] for row in rows))
+
+    def observations(
+        self, query: str, days: float = 30, until: Optional[float] = None
+    ) -> List[Tuple[str, str, float]]:
+        """(fonte, url, preço) das observações em ``[until - days, until)``"""
+        until = time.time() if until is None else until
+        with self._lock:
+            return self._conn.execute(
+                "SELECT source, url, price FROM price_history "
+                "WHERE product_key = ? AND ts >= ? AND ts < ?",
+                (product_key(query), until - days * DAY, until),
+            ).fetchall()
+
+    def stats(self) -> dict:
+        """Número de observações e de produtos distintos"""
+        with self._lock:
+            count, products = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT product_key) FROM price_history"
+            ).fetchone()
+        return {"observations": count, "products": products}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_history(config: Optional[Config] = None) -> Optional[PriceHistory]:
+    """Histórico configurado, ou None se desativado/indisponível"""
+    config = config or Config()
+    if not config.history_enabled:
+        return None
+    try:
+        return PriceHistory(config.history_path)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("Histórico de preços indisponível: %s", e)
+        return None
@@ -0,0 +1,153 @@
+"""
+Análises em segundo plano: pool limitado, cancelamento e eventos de progresso
+"""
+
+import itertools
+import logging
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from ..utils.cancellation import Cancelled, CancellationToken
+from .analysis import AnalysisProgress, AnalysisService
+
+logger = logging.getLogger(__name__)
+
+# Estados de um Job
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED = frozenset({DONE, FAILED, CANCELLED})
+
+
+@dataclass
+class JobEvent:
+    """Evento publicado no canal do JobManager
+
+    ``kind`` é "started", "progress" (``data``: AnalysisProgress), "done"
+    (``data``: resultado da análise), "error" (``data``: mensagem) ou
+    "cancelled"; cada job termina com exatamente um dos três últimos.
+    """
+
+    job_id: int
+    kind: str
+    data: Any = None
+
+
+class Job:
+    """Análise submetida ao JobManager"""
+
+    def __init__(
+        self, job_id: int, name: str, condition: str, max_pages: Optional[int]
+    ):
+        self.id = job_id
+        self.name = name
+        self.condition = condition
+        self.max_pages = max_pages
+        self.token = CancellationToken()
+        self.state = QUEUED
+        self.future: Optional[Future] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.state in FINISHED
+
+    def __repr__(self) -> str:
+        return f"Job({self.id}, {self.name!r}, {self.state})"
+
+
+class JobManager:
+    """Executa análises num pool de ``max_workers`` threads
+
+    Cada job tem um CancellationToken passado ao ``analyze_product`` e daí às
+    fontes (páginas em fila deixam de ser pedidas, esperas de rate limit e
+    backoff são interrompidas). O progresso e o resultado chegam como
+    JobEvent à fila ``events``, que o consumidor (p. ex. a GUI, com
+    ``root.after``) esvazia na sua própria thread.
+    """
+
+    def __init__(self, service: AnalysisService, max_workers: Optional[int] = None):
+        self.service = service
+        self.events: "queue.SimpleQueue[JobEvent]" = queue.SimpleQueue()
+        self._executor = ThreadPoolExecutor(
+            max_workers or service.config.job_workers, thread_name_prefix="job"
+        )
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._jobs: Dict[int, Job] = {}
+
+    def submit(
+        self, name: str, condition: str = "bom", max_pages: Optional[int] = None
+    ) -> Job:
+        """Agenda uma análise; devolve o Job (eventos com ``job.id``)"""
+        job = Job(next(self._ids), name, condition, max_pages)
+        with self._lock:
+            self._jobs[job.id] = job
+            job.future = self._executor.submit(self._run, job)
+        return job
+
+    def cancel(self, job: Job):
+        """Pede o cancelamento; um job ainda em fila termina logo"""
+        job.token.cancel()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, CANCELLED, "cancelled")
+
+    def cancel_all(self):
+        for job in self.active():
+            self.cancel(job)
+
+    def active(self) -> List[Job]:
+        """Jobs em fila ou em execução"""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def shutdown(self, wait: bool = True):
+        """Cancela todos os jobs e termina o pool"""
+        self.cancel_all()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job: Job):
+        if job.token.cancelled:
+            self._finish(job, CANCELLED, "cancelled")
+            return
+
+        job.state = RUNNING
+        self._emit(job, "started")
+        try:
+            result = self.service.analyze_product(
+                job.name,
+                job.condition,
+                max_pages=job.max_pages,
+                on_progress=lambda progress: self._progress(job, progress),
+                cancel=job.token,
+            )
+        except Cancelled:
+            self._finish(job, CANCELLED, "cancelled")
+        except Exception as e:
+            logger.exception("Erro na análise de '%s'", job.name)
+            self._finish(job, FAILED, "error", str(e))
+        else:
+            if job.token.cancelled:
+                # Terminou antes de notar o cancelamento: resultado descartado
+                self._finish(job, CANCELLED, "cancelled")
+            else:
+                self._finish(job, DONE, "done", result)
+
+    def _progress(self, job: Job, progress: AnalysisProgress):
+        if not job.token.cancelled:
+            self._emit(job, "progress", progress)
+
+    def _finish(self, job: Job, state: str, kind: str, data: Any = None):
+        with self._lock:
+            if self._jobs.pop(job.id, None) is None:
+                return  # já terminado (cancelado enquanto em fila)
+        job.state = state
+        self._emit(job, kind, data)
+
+    def _emit(self, job: Job, kind: str, data: Any = None):
+        self.events.put(JobEvent(job.id, kind, data))
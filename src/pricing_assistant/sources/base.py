@@ -2,16 +2,63 @@
 Interface base para fontes de dados
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Awaitable, TypeVar
+
+from ..core.listing import Listing, ListingBatch
+
+T = TypeVar("T")
+
+# Filtros de execução (callback por página, token de cancelamento): não mudam
+# o resultado da pesquisa e ficam fora das chaves de cache e de single-flight
+RUNTIME_FILTERS = frozenset({"on_page", "cancel"})
+
+
+class SourceError(Exception):
+    """Falha ao obter dados de uma fonte (rede, bloqueio, resposta inválida)"""
+
+
+def run_sync(awaitable: Awaitable[T]) -> T:
+    """Executa uma corrotina a partir de código síncrono
+
+    Dentro de um event loop já ativo (p. ex. chamado por uma callback
+    assíncrona) corre num loop próprio noutra thread em vez de falhar.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(awaitable)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, awaitable).result()
 
 
 class MarketDataSource(ABC):
-    """Fonte de dados abstrata"""
+    """Fonte de dados abstrata
+
+    As fontes síncronas implementam ``search()``; ``asearch()`` e
+    ``aiter_listings()`` funcionam nelas através de uma thread do executor.
+    Fontes nativamente assíncronas devem herdar de ``AsyncMarketDataSource``.
+    """
 
     @abstractmethod
-    def search(self, query: str, **filters) -> List[dict]:
-        pass
+    def search(self, query: str, **filters) -> ListingBatch:
+        """Listagens encontradas (fontes antigas podem devolver dicionários)"""
+
+    async def asearch(self, query: str, **filters) -> ListingBatch:
+        """Versão assíncrona de search() (por omissão, search() numa thread)"""
+        listings = await asyncio.to_thread(self.search, query, **filters)
+        return ListingBatch.coerce(listings)
+
+    async def aiter_listings(self, query: str, **filters) -> AsyncIterator[Listing]:
+        """Listagens à medida que ficam disponíveis (por omissão, de asearch())"""
+        for listing in await self.asearch(query, **filters):
+            yield listing
+
+    def use_parse_pool(self, pool) -> None:
+        """Pool de processos para o parsing (ignorado por fontes sem HTML)"""
 
     @abstractmethod
     def is_available(self) -> bool:
@@ -21,3 +68,14 @@ class MarketDataSource(ABC):
     @abstractmethod
     def name(self) -> str:
         pass
+
+
+class AsyncMarketDataSource(MarketDataSource):
+    """Fonte implementada com ``asearch()``; ``search()`` síncrono é derivado"""
+
+    @abstractmethod
+    async def asearch(self, query: str, **filters) -> ListingBatch:
+        pass
+
+    def search(self, query: str, **filters) -> ListingBatch:
+        return run_sync(self.asearch(query, **filters))
@@ -0,0 +1,202 @@
+"""
+Cache persistente de resultados de pesquisa (SQLite com TTL e eviction LRU)
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from ..core.listing import ListingBatch
+from ..utils.config import Config
+from ..utils.metrics import metrics
+from .base import RUNTIME_FILTERS, MarketDataSource
+
+logger = logging.getLogger(__name__)
+
+
+class SearchCache:
+    """Cache em disco de listagens, partilhável entre fontes"""
+
+    def __init__(self, path, ttl: float = 1800, max_entries: int = 500):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS search_cache (
+                key TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_search_cache_accessed "
+            "ON search_cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(source_name: str, query: str, filters: dict) -> str:
+        """Chave estável: fonte + query normalizada + filtros ordenados"""
+        normalized_query = " ".join(query.lower().split())
+        return json.dumps(
+            [source_name, normalized_query, filters], sort_keys=True, default=str
+        )
+
+    def get(self, key: str) -> Optional[ListingBatch]:
+        """Devolve as listagens em cache ou None se ausentes/expiradas"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, created_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self._conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE search_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        data = json.loads(row[0])
+        # Entradas antigas guardam uma lista de dicionários, as novas colunas
+        if isinstance(data, dict):
+            return ListingBatch.from_columns(data)
+        return ListingBatch.coerce(data)
+
+    def set(self, key: str, listings: ListingBatch):
+        """Guarda listagens e remove as entradas menos usadas acima do limite"""
+        now = time.time()
+        payload = json.dumps(listings.to_columns(), ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+            self._conn.execute(
+                """
+                DELETE FROM search_cache WHERE key IN (
+                    SELECT key FROM search_cache
+                    ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def clear(self):
+        """Remove todas as entradas"""
+        with self._lock:
+            self._conn.execute("DELETE FROM search_cache")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """Contadores de hits/misses e tamanho atual"""
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": size,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedSource(MarketDataSource):
+    """Envolve qualquer fonte de dados com a cache de pesquisas"""
+
+    def __init__(self, source: MarketDataSource, cache: SearchCache):
+        self.source = source
+        self.cache = cache
+
+    def search(self, query: str, **filters) -> ListingBatch:
+        key, listings = self._lookup(query, filters)
+        if listings is not None:
+            return listings
+        return self._store(key, self.source.search(query, **filters))
+
+    async def asearch(self, query: str, **filters) -> ListingBatch:
+        # SQLite e JSON bloqueiam: fora do event loop
+        key, listings = await asyncio.to_thread(self._lookup, query, filters)
+        if listings is not None:
+            return listings
+        listings = await self.source.asearch(query, **filters)
+        return await asyncio.to_thread(self._store, key, listings)
+
+    def _lookup(self, query: str, filters: dict):
+        """Chave da pesquisa e listagens em cache (None se ausentes)"""
+        key_filters = {
+            name: value
+            for name, value in filters.items()
+            if name not in RUNTIME_FILTERS
+        }
+        key = self.cache.make_key(self.source.name, query, key_filters)
+
+        listings = self.cache.get(key)
+        if listings is None:
+            metrics.incr("cache_misses")
+            return key, None
+
+        metrics.incr("cache_hits")
+        logger.info("%s: %d produtos da cache", self.name, len(listings))
+        on_page = filters.get("on_page")
+        if on_page is not None:
+            on_page(list(listings))
+        return key, listings
+
+    def _store(self, key: str, listings) -> ListingBatch:
+        listings = ListingBatch.coerce(listings)
+        # Resultados vazios podem ser falhas de rede: não ficam em cache
+        if listings:
+            self.cache.set(key, listings)
+        return listings
+
+    def use_parse_pool(self, pool) -> None:
+        self.source.use_parse_pool(pool)
+
+    def is_available(self) -> bool:
+        return self.source.is_available()
+
+    @property
+    def name(self) -> str:
+        return self.source.name
+
+
+def with_cache(
+    sources: List[MarketDataSource], config: Optional[Config] = None
+) -> List[MarketDataSource]:
+    """Aplica a cache configurada a uma lista de fontes"""
+    config = config or Config()
+    if not config.cache_enabled:
+        return sources
+
+    cache = SearchCache(
+        config.cache_path, ttl=config.cache_ttl, max_entries=config.cache_max_entries
+    )
+    return [CachedSource(source, cache) for source in sources]
@@ -0,0 +1,271 @@
+"""
+Transporte HTTP das fontes: pool de ligações, GETs condicionais e retries
+"""
+
+import importlib
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..utils.cancellation import CancellationToken, sleep
+from ..utils.config import Config
+from ..utils.metrics import metrics
+from ..utils.rate_limit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Respostas transitórias que justificam nova tentativa
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def accept_encoding() -> str:
+    """Codificações aceites: "br" só se o urllib3 a souber descodificar"""
+    for module in ("brotli", "brotlicffi"):
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            continue
+        return "gzip, deflate, br"
+    return "gzip, deflate"
+
+
+class ValidatorCache:
+    """ETag/Last-Modified e corpo da última resposta por URL
+
+    LRU limitado em entradas e em bytes: os corpos ficam guardados como
+    bytes (não como texto descodificado, que ocupa até 4x mais) e uma
+    resposta maior do que ``max_bytes`` não é guardada.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Dict[str, str], bytes, str]]" = (
+            OrderedDict()
+        )
+
+    def headers(self, url: str) -> Dict[str, str]:
+        """Cabeçalhos condicionais (If-None-Match/If-Modified-Since) para o URL"""
+        with self._lock:
+            entry = self._entries.get(url)
+        return dict(entry[0]) if entry else {}
+
+    def body(self, url: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            self._entries.move_to_end(url)
+        _, content, encoding = entry
+        return str(content, encoding, errors="replace")
+
+    def store(self, url: str, response: requests.Response):
+        validators = {}
+        if response.headers.get("ETag"):
+            validators["If-None-Match"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = response.headers["Last-Modified"]
+        if not validators or self.max_entries <= 0:
+            return
+
+        content = response.content
+        encoding = response.encoding or response.apparent_encoding or "utf-8"
+        with self._lock:
+            self._discard(url)
+            if len(content) > self.max_bytes:
+                return
+            self._entries[url] = (validators, content, encoding)
+            self.size += len(content)
+            while self._entries and (
+                len(self._entries) > self.max_entries or self.size > self.max_bytes
+            ):
+                self._discard(next(iter(self._entries)))
+
+    def _discard(self, url: str):
+        entry = self._entries.pop(url, None)
+        if entry is not None:
+            self.size -= len(entry[1])
+
+
+class HttpTransport:
+    """Sessão partilhada com retries (backoff exponencial com jitter)
+
+    Respostas 429/5xx e falhas de ligação são repetidas até ``max_retries``
+    vezes, respeitando ``Retry-After`` quando o servidor o indica. Páginas já
+    vistas são pedidas com GET condicional e um 304 reutiliza o corpo guardado.
+    Com ``rate_limiter`` cada tentativa espera por um token do host e cada
+    resposta (estado e latência) alimenta o ajuste adaptativo da taxa.
+    """
+
+    def __init__(
+        self,
+        config: Optional[Config] = None,
+        max_retries: Optional[int] = None,
+        headers: Optional[Dict[str, str]] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        config = config or Config()
+        self.rate_limiter = rate_limiter
+        self.max_retries = (
+            config.get_vinted_config()["max_retries"]
+            if max_retries is None
+            else max_retries
+        )
+        self.backoff_base = config.http_backoff_base
+        self.backoff_max = config.http_backoff_max
+        self.validators = ValidatorCache(
+            config.http_validator_cache_entries, config.http_validator_cache_bytes
+        )
+
+        self.session = requests.Session()
+        # Ligações keep-alive reutilizadas pelas threads que pedem páginas
+        adapter = HTTPAdapter(
+            pool_connections=config.http_pool_connections,
+            pool_maxsize=config.http_pool_size,
+            max_retries=0,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(headers or {})
+        self.session.headers["Accept-Encoding"] = accept_encoding()
+
+    def get_text(
+        self,
+        url: str,
+        timeout: float = 15,
+        reserved: bool = False,
+        cancel: Optional[CancellationToken] = None,
+    ) -> str:
+        """GET com retries e validadores; devolve o corpo descodificado
+
+        ``reserved`` indica que o chamador já obteve o token da primeira
+        tentativa (p. ex. com ``await rate_limiter.acquire(host)``). Com
+        ``cancel`` as esperas (rate limit e backoff) são interrompidas e
+        lançam Cancelled; um pedido já enviado termina normalmente.
+        """
+        host = urlparse(url).netloc
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            self._wait_turn(host, cancel, reserved=reserved and not attempt)
+            try:
+                response = self._request(url, timeout)
+                if response.status_code == 304:
+                    body = self.validators.body(url)
+                    if body is not None:
+                        metrics.incr("http_not_modified")
+                        return body
+                    # Corpo já fora da cache: repetir sem validadores (novo token)
+                    self._wait_turn(host, cancel)
+                    response = self._request(url, timeout, conditional=False)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if last_attempt:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning("%s: %s (nova tentativa em %.1fs)", url, e, delay)
+            else:
+                if last_attempt or response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    body = response.text
+                    self.validators.store(url, response)
+                    return body
+
+                delay = self._retry_after(response)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                logger.warning(
+                    "%s: HTTP %d (nova tentativa em %.1fs)",
+                    url,
+                    response.status_code,
+                    delay,
+                )
+
+            metrics.incr("http_retries")
+            sleep(delay, cancel)
+
+    def head(self, url: str, timeout: float = 5) -> requests.Response:
+        return self.session.head(url, timeout=timeout)
+
+    def close(self):
+        self.session.close()
+
+    def _wait_turn(
+        self, host: str, cancel: Optional[CancellationToken], reserved: bool = False
+    ):
+        """Espera pelo token do host (se ainda não reservado) antes de um pedido"""
+        if self.rate_limiter is not None and not reserved:
+            self.rate_limiter.wait(host, cancel)
+        if cancel is not None:
+            cancel.raise_if_cancelled()
+
+    def _request(
+        self, url: str, timeout: float, conditional: bool = True
+    ) -> requests.Response:
+        """Um pedido, com contagem de bytes (na rede e descodificados) e duração"""
+        headers = self.validators.headers(url) if conditional else None
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, headers=headers, timeout=timeout)
+            content = response.content
+        except (requests.ConnectionError, requests.Timeout):
+            self._feedback(url, None, time.perf_counter() - start)
+            raise
+        elapsed = time.perf_counter() - start
+        metrics.observe("http_request", elapsed)
+        self._feedback(url, response, elapsed)
+
+        metrics.incr("http_requests")
+        metrics.incr("http_bytes_decoded", len(content))
+        try:
+            metrics.incr("http_bytes_received", response.raw.tell())
+        except (AttributeError, OSError):
+            metrics.incr("http_bytes_received", len(content))
+        return response
+
+    def _feedback(
+        self, url: str, response: Optional[requests.Response], elapsed: float
+    ):
+        """Estado e latência da resposta para o rate limiter adaptativo"""
+        if self.rate_limiter is None:
+            return
+        host = urlparse(url).netloc
+        if response is None:
+            self.rate_limiter.feedback(host, None, elapsed)
+            return
+        retry_after = (
+            self._retry_after(response)
+            if response.status_code in RETRY_STATUSES
+            else None
+        )
+        self.rate_limiter.feedback(host, response.status_code, elapsed, retry_after)
+
+    def _backoff(self, attempt: int) -> float:
+        """Espera exponencial com "full jitter": uniforme em [0, base * 2^n]"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    def _retry_after(self, response: requests.Response) -> Optional[float]:
+        """Segundos pedidos pelo servidor em Retry-After (número ou data HTTP)"""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                return None
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=timezone.utc)
+            seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+        return min(self.backoff_max, max(0.0, seconds))
@@ -0,0 +1,101 @@
+"""
+Parsing de páginas num pool de processos (todos os núcleos, sem o GIL)
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from operator import attrgetter
+from typing import Callable, Iterable, List, Optional, Sequence
+
+from ..core.listing import FIELDS, Listing
+from ..utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+_record = attrgetter(*FIELDS)
+
+
+def to_records(listings: Iterable[Listing]) -> List[tuple]:
+    """Listagens como tuplos (campos de Listing por ordem), baratos de serializar"""
+    return [_record(listing) for listing in listings]
+
+
+def from_records(records: Sequence[tuple]) -> List[Listing]:
+    return [Listing(*record) for record in records]
+
+
+def _warm_up():
+    """Importa os módulos de parsing no worker antes da primeira página"""
+    from . import vinted
+
+    vinted.BeautifulSoup("<p></p>", vinted.DEFAULT_HTML_PARSER)
+
+
+class ParsePool:
+    """Processos dedicados ao parsing de HTML das fontes
+
+    As páginas seguem como texto e voltam como tuplos compactos
+    (``to_records``), nunca como árvores do BeautifulSoup. ``start()`` arranca
+    os processos de antemão (pool quente); ``close()`` termina-os e é chamado
+    pelo ``AnalysisService`` que criou o pool.
+    """
+
+    def __init__(self, processes: Optional[int] = None):
+        self.processes = processes or os.cpu_count() or 1
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._closed = False
+
+    def start(self) -> ProcessPoolExecutor:
+        """Cria os processos e carrega neles os parsers, sem esperar"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("pool de parsing já fechado")
+            if self._executor is not None:
+                return self._executor
+            # Sem fork: o processo principal tem threads (fontes, GUI, logging)
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context(
+                "forkserver" if "forkserver" in methods else "spawn"
+            )
+            self._executor = ProcessPoolExecutor(self.processes, mp_context=context)
+            for _ in range(self.processes):
+                self._executor.submit(_warm_up)
+            logger.info("Pool de parsing: %d processos", self.processes)
+            return self._executor
+
+    def submit(self, func: Callable[..., List[tuple]], *args) -> Future:
+        """Executa ``func(*args)`` num worker; o Future devolve listagens"""
+        executor = self.start()
+        result: Future = Future()
+
+        def convert(done: Future):
+            try:
+                result.set_result(from_records(done.result()))
+            except BaseException as e:
+                result.set_exception(e)
+
+        executor.submit(func, *args).add_done_callback(convert)
+        return result
+
+    def parse(self, func: Callable[..., List[tuple]], *args) -> List[Listing]:
+        """Versão bloqueante de ``submit``"""
+        return self.submit(func, *args).result()
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._closed = True
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def open_parse_pool(config: Config) -> Optional[ParsePool]:
+    """Pool configurado em ``Config.parse_processes`` (None se desativado)"""
+    processes = config.parse_processes
+    if not processes:
+        return None
+    return ParsePool(processes if processes > 0 else None)
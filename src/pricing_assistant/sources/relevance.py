@@ -0,0 +1,99 @@
+"""
+Relevância de títulos face à query (compilada uma vez por pesquisa)
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+# Traduções e variantes multilingues das palavras da query
+TRANSLATIONS: Dict[str, List[str]] = {
+    "teclado": ["keyboard", "clavier", "tastiera", "tastatur", "klavye"],
+    "apex": ["apex"],  # Mantém igual
+    "pro": ["pro", "professional"],
+    "v3": ["v3", "version3", "3"],
+}
+
+# Aceitar produtos com pelo menos 25% de match para produtos específicos
+MIN_MATCH_RATIO = 0.25
+
+
+def normalize_text(text: str) -> str:
+    """Minúsculas e sem acentos ("Camisóla" -> "camisola")"""
+    text = text.lower()
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+class CompiledQuery:
+    """Query normalizada com um único regex sobre palavras e traduções
+
+    ``match(title)`` percorre o título uma vez e devolve a decisão de
+    relevância (palavras ou traduções encontradas) e o score (apenas as
+    palavras originais), tal como faziam ``_is_relevant_product`` e
+    ``_calculate_relevance`` em separado.
+    """
+
+    def __init__(self, query: str, translations: Dict[str, List[str]] = TRANSLATIONS):
+        self.query = query
+        self.words = normalize_text(query).split()
+
+        # alternativa -> [(índice da palavra na query, é a palavra original?)]
+        targets: Dict[str, List[Tuple[int, bool]]] = {}
+        for index, word in enumerate(self.words):
+            targets.setdefault(word, []).append((index, True))
+            for translation in translations.get(word, []):
+                translation = normalize_text(translation)
+                if translation != word:
+                    targets.setdefault(translation, []).append((index, False))
+
+        # Numa posição o regex escolhe a alternativa mais longa; as que são seus
+        # prefixos também ocorrem ali, por isso cada alternativa herda-as.
+        # Cada alternativa guarda as máscaras (palavras cobertas, originais).
+        self._masks: Dict[str, Tuple[int, int]] = {}
+        for alternative in targets:
+            matched = exact = 0
+            for prefix, hits in targets.items():
+                if alternative.startswith(prefix):
+                    for index, original in hits:
+                        matched |= 1 << index
+                        if original:
+                            exact |= 1 << index
+            self._masks[alternative] = (matched, exact)
+
+        alternatives = sorted(targets, key=len, reverse=True)
+        self._pattern = (
+            re.compile("(?=(" + "|".join(map(re.escape, alternatives)) + "))")
+            if alternatives
+            else None
+        )
+        self._all = (1 << len(self.words)) - 1
+
+    def match(self, title: str) -> Tuple[bool, float]:
+        """Devolve (é relevante, score 0-1) numa única passagem pelo título"""
+        if not title or self._pattern is None:
+            return False, 0.0
+
+        matched = exact = 0
+        masks = self._masks
+        for found in self._pattern.finditer(normalize_text(title)):
+            word_mask, exact_mask = masks[found.group(1)]
+            matched |= word_mask
+            exact |= exact_mask
+            if exact == self._all:
+                break
+
+        total = len(self.words)
+        return (
+            matched.bit_count() / total >= MIN_MATCH_RATIO,
+            exact.bit_count() / total,
+        )
+
+
+@lru_cache(maxsize=256)
+def compile_query(query: str) -> CompiledQuery:
+    """CompiledQuery partilhada (imutável) para a mesma query"""
+    return CompiledQuery(query)
@@ -3,164 +3,693 @@ Fonte de dados Vinted - Versão Melhorada com Filtros
 """
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+import asyncio
+import heapq
+import json
+import logging
 import re
-from typing import List
-from .base import MarketDataSource
+from functools import lru_cache
+from itertools import chain, islice
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    BrokenExecutor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from urllib.parse import urlparse
+from .base import MarketDataSource, SourceError
+from .http import HttpTransport
+from .parse_pool import ParsePool, to_records
+from ..core.listing import Listing, ListingBatch
+from .relevance import compile_query
+from ..utils.cancellation import Cancelled, CancellationToken
+from ..utils.config import Config
+from ..utils.metrics import metrics
+from ..utils.rate_limit import shared_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lxml  # noqa: F401
+
+    DEFAULT_HTML_PARSER = "lxml"
+except ImportError:
+    DEFAULT_HTML_PARSER = "html.parser"
+
+# Padrões pré-compilados usados no parsing de cada card
+_CARD_CLASS = re.compile("item|card|product|feed-grid")
+_TITLE_CLASS = re.compile("title|name|description")
+_PRICE_CLASS = re.compile("price|amount|value")
+_PRICE_PATTERNS = [
+    re.compile(r"€\s*(\d+[.,]\d{2})"),
+    re.compile(r"(\d+[.,]\d{2})\s*€"),
+    re.compile(r"price:\s*€?\s*(\d+[.,]\d{2})", re.IGNORECASE),
+]
+_JSON_SCRIPT = re.compile(
+    r"<script\b[^>]*\btype=[\"']application/json[\"'][^>]*>", re.IGNORECASE
+)
+_JSON_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"\s*")
+_HEADINGS = ("h3", "h4", "h5")
+_TEXT_TYPES = (NavigableString, CData)
+
+
+def _looks_like_item(node: dict) -> bool:
+    """Um item do catálogo tem pelo menos título, preço e id/url"""
+    return (
+        isinstance(node.get("title"), str)
+        and "price" in node
+        and ("id" in node or "url" in node)
+    )
+
+
+def _relevance_key(listing: Listing) -> float:
+    """Chave de ordenação das listagens (score de relevância)"""
+    return listing.relevance_score
+
+
+class _TopK:
+    """Seleção em streaming das K listagens mais relevantes, página a página
+
+    O resultado é igual ao de ordenar tudo por relevância (ordenação estável)
+    e cortar em K, mas só ficam em memória as K atuais e a página nova.
+    """
+
+    __slots__ = ("k", "seen", "relevant", "_top")
+
+    def __init__(self, k: int):
+        self.k = k
+        self.seen = 0
+        self.relevant = 0
+        self._top: List[Listing] = []
+
+    def extend(self, listings: List[Listing]):
+        self.seen += len(listings)
+        with metrics.timer("relevance_filter"):
+            # Aceitar relevância baixa; os mais relevantes ficam no topo
+            relevant = [item for item in listings if item.relevance_score >= 0.2]
+            if relevant:
+                self.relevant += len(relevant)
+                # nlargest é estável: em empates ficam as listagens vistas primeiro
+                self._top = heapq.nlargest(
+                    self.k, chain(self._top, relevant), key=_relevance_key
+                )
+
+    def result(self) -> List[Listing]:
+        return self._top
+
+
+class _CardScan:
+    """Elementos e texto de um card, recolhidos numa única passagem"""
+
+    __slots__ = (
+        "headings",
+        "title_testid",
+        "title_class",
+        "price_testid",
+        "price_class",
+        "price_span",
+        "link",
+        "text",
+        "stripped_text",
+    )
+
+    def __init__(self):
+        self.headings = {}
+        self.title_testid = None
+        self.title_class = None
+        self.price_testid = None
+        self.price_class = None
+        self.price_span = None
+        self.link = None
+        self.text = ""
+        self.stripped_text = ""
+
+
+@lru_cache(maxsize=None)
+def _worker_parser(base_url: str, html_parser: str) -> "VintedSource":
+    """Instância só para parsing nos processos do ParsePool (sem sessão HTTP)"""
+    parser = VintedSource.__new__(VintedSource)
+    parser.base_url = base_url
+    parser.html_parser = html_parser
+    parser.parse_pool = None
+    return parser
+
+
+def _parse_records(
+    html: str, query: str, base_url: str, html_parser: str
+) -> List[tuple]:
+    """Parsing de uma página num worker do ParsePool (listagens como tuplos)"""
+    return to_records(_worker_parser(base_url, html_parser)._parse_html(html, query))
 
 
 class VintedSource(MarketDataSource):
     """Implementação melhorada para Vinted com filtros precisos"""
 
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
+    def __init__(self, config: Optional[Config] = None):
+        self.config = config or Config()
+        vinted_config = self.config.get_vinted_config()
+
+        self.base_url = vinted_config["base_url"]
+        self.max_pages = self.config.max_pages
+        self.max_workers = self.config.max_concurrent_requests
+        self.html_parser = self.config.html_parser or DEFAULT_HTML_PARSER
+        self.top_k = self.config.top_k
+        # Pool de processos de parsing, atribuído pelo AnalysisService
+        self.parse_pool: Optional[ParsePool] = None
+        # Rate limit partilhado com as outras fontes e workers do processo
+        self.rate_limiter = shared_rate_limiter(self.config)
+        self.rate_limiter.set_budget(
+            urlparse(self.base_url).netloc,
+            1 / vinted_config.get("delay_between_requests", self.config.scraping_delay),
+        )
+
+        # Pool keep-alive, retries com backoff e GETs condicionais
+        self.http = HttpTransport(
+            self.config,
+            max_retries=vinted_config["max_retries"],
+            rate_limiter=self.rate_limiter,
+            headers={
                 "User-Agent": "Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:109.0) Gecko/20100101 Firefox/118.0",
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
                 "Accept-Language": "pt-PT,pt;q=0.8,en;q=0.5,en-US;q=0.3",
-                "Accept-Encoding": "gzip, deflate, br",
-            }
+            },
         )
+        self.session = self.http.session
+
+    def use_parse_pool(self, pool: Optional[ParsePool]) -> None:
+        self.parse_pool = pool
 
-    def search(self, query: str, **filters) -> List[dict]:
+    def search(self, query: str, **filters) -> ListingBatch:
         """Procura produtos na Vinted com filtros precisos"""
         try:
-            print(f"   🌐 A pesquisar na Vinted: '{query}'")
-            url = f"https://www.vinted.pt/catalog?search_text={query.replace(' ', '+')}"
-
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
+            max_pages, on_page, cancel = self._search_options(query, filters)
+
+            # Pipeline fetch → parse → filtro → top-K: cada página é processada
+            # assim que chega e só as K melhores listagens ficam em memória
+            selector = _TopK(self.top_k)
+            for page_listings in self._iter_pages(query, max_pages, cancel):
+                self._select(selector, page_listings, on_page)
+            return self._search_result(selector)
+
+        except requests.RequestException as e:
+            # Falhas de rede propagam-se para alimentar o estado de saúde da fonte
+            logger.error("Erro no Vinted: %s", e)
+            raise SourceError(str(e)) from e
+        except Cancelled:
+            # Pedido do chamador, não uma falha da fonte
+            logger.info("Vinted: pesquisa '%s' cancelada", query)
+            raise
+        except Exception:
+            logger.exception("Erro inesperado no Vinted")
+            return ListingBatch()
 
-            listings = self._parse_html(response.text, query)
-            filtered_listings = self._filter_relevant(listings, query)
+    async def asearch(self, query: str, **filters) -> ListingBatch:
+        """Versão assíncrona de search(): páginas pedidas no event loop"""
+        try:
+            selector = _TopK(self.top_k)
+            on_page = filters.get("on_page")
+            async for page_listings in self._aiter_pages(query, filters):
+                self._select(selector, page_listings, on_page)
+            return self._search_result(selector)
+
+        except requests.RequestException as e:
+            logger.error("Erro no Vinted: %s", e)
+            raise SourceError(str(e)) from e
+        except Cancelled:
+            logger.info("Vinted: pesquisa '%s' cancelada", query)
+            raise
+        except Exception:
+            logger.exception("Erro inesperado no Vinted")
+            return ListingBatch()
+
+    async def aiter_listings(self, query: str, **filters) -> AsyncIterator[Listing]:
+        """Listagens de cada página assim que é descarregada e processada"""
+        async for page_listings in self._aiter_pages(query, filters):
+            for listing in page_listings:
+                yield listing
+
+    async def _aiter_pages(
+        self, query: str, filters: dict
+    ) -> AsyncIterator[List[Listing]]:
+        """Páginas processadas pela ordem de chegada
+
+        Os pedidos HTTP e o parsing correm no executor do loop, no máximo
+        ``max_concurrent_requests`` páginas de cada vez: a página seguinte só
+        é pedida quando uma termina, pelo que a memória não cresce com o
+        número de páginas. As esperas do rate limit são ``asyncio.sleep`` e
+        não ocupam threads.
+        """
+        max_pages, _, cancel = self._search_options(query, filters)
+
+        async def fetch(page: int) -> List[Listing]:
+            url = self._catalog_url(query, page)
+            self._check_cancelled(cancel)
+            await self.rate_limiter.acquire(urlparse(url).netloc)
+            try:
+                html = await asyncio.to_thread(self._download, url, True, cancel)
+            except requests.RequestException as e:
+                logger.warning("Vinted: falha na página %d: %s", page, e)
+                raise
+            self._check_cancelled(cancel)
+            return await asyncio.to_thread(self._parse_page, html, query)
+
+        pages = iter(range(1, max_pages + 1))
+        window = min(self.max_workers, max_pages)
+        tasks = {asyncio.ensure_future(fetch(page)) for page in islice(pages, window)}
+        failures = 0
+        try:
+            while tasks:
+                done, tasks = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    page = next(pages, None)
+                    if page is not None:
+                        tasks.add(asyncio.ensure_future(fetch(page)))
+                    try:
+                        page_listings = task.result()
+                    except requests.RequestException:
+                        failures += 1
+                        if failures == max_pages:
+                            raise
+                        continue
+
+                    yield page_listings
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _search_options(self, query: str, filters: dict):
+        """Número de páginas, callback por página e token de cancelamento"""
+        max_pages = max(1, int(filters.get("max_pages") or self.max_pages))
+        logger.info("A pesquisar na Vinted: '%s' (%d página(s))", query, max_pages)
+        # Chamado após cada página com a seleção atual (a do resultado final)
+        return max_pages, filters.get("on_page"), filters.get("cancel")
+
+    @staticmethod
+    def _select(
+        selector: _TopK,
+        page_listings: List[Listing],
+        on_page: Optional[Callable[[List[Listing]], None]],
+    ):
+        """Junta uma página à seleção top-K e publica a seleção atualizada"""
+        selector.extend(page_listings)
+        if on_page is not None:
+            on_page(selector.result())
+
+    @staticmethod
+    def _check_cancelled(cancel: Optional[CancellationToken]):
+        if cancel is not None:
+            cancel.raise_if_cancelled()
+
+    def _search_result(self, selector: _TopK) -> ListingBatch:
+        """Lote final de uma pesquisa, com métricas e debug dos melhores"""
+        top = selector.result()
+        metrics.incr("listings_seen", selector.seen)
+        metrics.incr("listings_kept", len(top))
 
-            print(
-                f"   ✅ Vinted: {len(filtered_listings)} produtos relevantes de {len(listings)} totais"
+        # Mostrar debug dos produtos encontrados
+        if top and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Produtos filtrados: %d (de %d)", selector.relevant, selector.seen
             )
-            return filtered_listings
+            for i, item in enumerate(top[:3]):  # Mostrar top 3
+                logger.debug(
+                    "%d. '%s...' - €%.2f", i + 1, item.title[:50], item.price
+                )
 
-        except Exception as e:
-            print(f"   ❌ Erro no Vinted: {e}")
-            return []
+        logger.info(
+            "Vinted: %d produtos relevantes de %d totais", len(top), selector.seen
+        )
+        return ListingBatch.from_listings(top)
+
+    def _iter_pages(
+        self,
+        query: str,
+        max_pages: int,
+        cancel: Optional[CancellationToken] = None,
+    ) -> Iterator[List[Listing]]:
+        """Listagens de cada página, pela ordem de chegada
+
+        Com pool de parsing cada página é processada (noutro processo) pela
+        thread que a descarregou, em paralelo com as outras páginas.
+        """
+        parallel = self.parse_pool is not None
+        pages = self._fetch_pages(query, max_pages, parse=parallel, cancel=cancel)
+        for page, content in pages:
+            self._check_cancelled(cancel)
+            yield content if parallel else self._parse_page(content, query)
+
+    def _parse_page(self, html: str, query: str) -> List[Listing]:
+        """Listagens de uma página descarregada (medido como etapa "parse")"""
+        with metrics.timer("parse"):
+            pool = self.parse_pool
+            if pool is not None:
+                try:
+                    return pool.parse(
+                        _parse_records, html, query, self.base_url, self.html_parser
+                    )
+                except (BrokenExecutor, RuntimeError) as e:
+                    # Worker terminado ou pool já fechado: parsing local
+                    logger.warning("Pool de parsing indisponível: %s", e)
+            return self._parse_html(html, query)
+
+    def _catalog_url(self, query: str, page: int) -> str:
+        """URL do catálogo para uma página da pesquisa"""
+        url = f"{self.base_url}/catalog?search_text={query.replace(' ', '+')}"
+        return url if page <= 1 else f"{url}&page={page}"
+
+    def _fetch_page(
+        self, query: str, page: int, cancel: Optional[CancellationToken] = None
+    ) -> str:
+        """Descarrega uma página do catálogo respeitando o rate limit do host"""
+        self._check_cancelled(cancel)
+        return self._download(self._catalog_url(query, page), cancel=cancel)
+
+    def _fetch_parsed_page(
+        self, query: str, page: int, cancel: Optional[CancellationToken] = None
+    ) -> List[Listing]:
+        html = self._fetch_page(query, page, cancel)
+        self._check_cancelled(cancel)
+        return self._parse_page(html, query)
+
+    def _download(
+        self,
+        url: str,
+        reserved: bool = False,
+        cancel: Optional[CancellationToken] = None,
+    ) -> str:
+        """GET de uma página (``reserved``: o primeiro token já foi obtido)"""
+        with metrics.timer("fetch"):
+            html = self.http.get_text(
+                url, timeout=15, reserved=reserved, cancel=cancel
+            )
 
-    def _parse_html(self, html: str, original_query: str) -> List[dict]:
+        metrics.incr("pages_fetched")
+        return html
+
+    def _fetch_pages(
+        self,
+        query: str,
+        max_pages: int,
+        parse: bool = False,
+        cancel: Optional[CancellationToken] = None,
+    ) -> Iterator[Tuple[int, Union[str, List[Listing]]]]:
+        """Descarrega páginas em paralelo e devolve-as pela ordem de chegada
+
+        Com ``parse`` devolve as listagens de cada página em vez do HTML.
+        Há no máximo ``max_concurrent_requests`` páginas em curso: a seguinte
+        só é submetida quando uma termina e cada resultado é largado depois de
+        entregue, pelo que a memória não cresce com o número de páginas.
+        Cancelado o token, as páginas ainda por pedir já não são pedidas.
+        """
+        fetch = self._fetch_parsed_page if parse else self._fetch_page
+        if max_pages <= 1:
+            yield 1, fetch(query, 1, cancel)
+            return
+
+        workers = min(self.max_workers, max_pages)
+        pages = iter(range(1, max_pages + 1))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="vinted-fetch"
+        ) as executor:
+            futures: Dict[Future, int] = {
+                executor.submit(fetch, query, page, cancel): page
+                for page in islice(pages, workers)
+            }
+            failures = 0
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page = futures.pop(future)
+                    next_page = next(pages, None)
+                    if next_page is not None:
+                        submitted = executor.submit(fetch, query, next_page, cancel)
+                        futures[submitted] = next_page
+                    try:
+                        content = future.result()
+                    except Cancelled:
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        raise
+                    except requests.RequestException as e:
+                        failures += 1
+                        logger.warning("Vinted: falha na página %d: %s", page, e)
+                        if failures == max_pages:
+                            raise
+                        continue
+                    yield page, content
+
+    def _make_soup(self, html: str) -> BeautifulSoup:
+        """Cria a árvore HTML com o backend de parsing configurado"""
+        return BeautifulSoup(html, self.html_parser)
+
+    def _parse_html(self, html: str, original_query: str) -> List[Listing]:
         """Parse melhorado do HTML da Vinted"""
-        soup = BeautifulSoup(html, "html.parser")
+        # Caminho principal: dados estruturados embebidos na página
+        listings = self._parse_json(html, original_query)
+        if listings is not None:
+            return listings
+
+        # Fallback: heurísticas sobre o DOM
+        return self._parse_dom(html, original_query)
+
+    def _parse_dom(self, html: str, original_query: str) -> List[Listing]:
+        """Extrai as listagens dos cards do DOM (uma passagem por card)"""
+        soup = self._make_soup(html)
         listings = []
 
         # Procurar elementos de produtos - selectors mais abrangentes
-        product_cards = soup.find_all(
-            ["div", "article"],
-            class_=lambda x: x
-            and any(
-                cls in str(x)
-                for cls in ["item", "card", "product", "new-item", "feed-grid"]
-            ),
-        )
+        product_cards = soup.find_all(["div", "article"], class_=_CARD_CLASS)
 
-        print(f"   🔍 Encontrados {len(product_cards)} elementos de produto")
+        logger.debug("Encontrados %d elementos de produto", len(product_cards))
 
         for card in product_cards:
             listing = self._extract_product_info(card, original_query)
-            if listing and listing.get("price", 0) > 1:  # Preços mínimos realistas
+            if listing and listing.price > 1:  # Preços mínimos realistas
                 listings.append(listing)
 
         return listings
 
-    def _extract_product_info(self, card, original_query: str) -> dict:
+    def _parse_json(self, html: str, original_query: str) -> Optional[List[Listing]]:
+        """Extrai listagens do JSON de estado da página (None se não existir)"""
+        items = list(self._iter_json_items(html))
+        if not items:
+            return None
+
+        logger.debug("Encontrados %d produtos no JSON da página", len(items))
+
+        listings = []
+        for item in items:
+            listing = self._listing_from_json(item, original_query)
+            if listing:
+                listings.append(listing)
+        return listings
+
+    def _iter_json_items(self, html: str) -> Iterator[dict]:
+        """Descodifica os scripts JSON diretamente do HTML e devolve os itens"""
+        seen_ids = set()
+
+        for match in _JSON_SCRIPT.finditer(html):
+            start = _WHITESPACE.match(html, match.end()).end()
+            try:
+                # raw_decode lê a partir do offset, sem copiar o conteúdo do script
+                data, _ = _JSON_DECODER.raw_decode(html, start)
+            except ValueError:
+                continue
+
+            stack = [data]
+            while stack:
+                node = stack.pop()
+                if isinstance(node, dict):
+                    if _looks_like_item(node):
+                        item_id = node.get("id")
+                        if item_id is None or item_id not in seen_ids:
+                            seen_ids.add(item_id)
+                            yield node
+                        continue
+                    stack.extend(node.values())
+                elif isinstance(node, list):
+                    stack.extend(reversed(node))
+
+    def _listing_from_json(self, item: dict, original_query: str) -> Optional[Listing]:
+        """Converte um item do JSON da Vinted no formato de listagem"""
+        title = item["title"].strip()
+        if len(title) < 3:
+            return None
+
+        price = self._json_price(item["price"])
+        if price <= 1:
+            return None
+
+        relevant, score = self._match_relevance(title, original_query)
+        if not relevant:
+            return None
+
+        url = item.get("url") or item.get("path") or "/"
+        if url.startswith("/"):
+            url = self.base_url + url
+
+        status = item.get("status")
+        return Listing(
+            title=title[:100],
+            price=price,
+            condition=self._condition_from_text(
+                status if isinstance(status, str) else title
+            ),
+            url=url,
+            relevance_score=score,
+        )
+
+    def _json_price(self, value) -> float:
+        """Lê o preço de um item JSON (número, texto ou {"amount": ...})"""
+        if isinstance(value, dict):
+            value = value.get("amount")
+        if isinstance(value, bool) or value is None:
+            return 0.0
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return self._clean_price(str(value))
+
+    def _extract_product_info(self, card, original_query: str) -> Optional[Listing]:
         """Extrai informação de produto com validação"""
         try:
+            # Uma única passagem pela subárvore do card
+            scan = self._scan_card(card)
+
             # Extrair título completo
-            title = self._extract_title(card)
+            title = self._extract_title(scan)
             if not title or len(title) < 3:
                 return None
 
             # Extrair preço
-            price = self._extract_price(card)
+            price = self._extract_price(scan)
             if price <= 1:  # Filtrar preços irrealistas
                 return None
 
-            # Validar relevância do produto
-            if not self._is_relevant_product(title, original_query):
+            # Validar relevância do produto (decisão e score numa só passagem)
+            relevant, score = self._match_relevance(title, original_query)
+            if not relevant:
                 return None
 
-            return {
-                "title": title[:100],
-                "price": price,
-                "condition": self._extract_condition(card, title),
-                "location": self._extract_location(card),
-                "url": self._extract_url(card),
-                "posted_date": "Recentemente",
-                "relevance_score": self._calculate_relevance(title, original_query),
-            }
+            return Listing(
+                title=title[:100],
+                price=price,
+                condition=self._extract_condition(scan, title),
+                location=self._extract_location(scan),
+                url=self._extract_url(scan),
+                relevance_score=score,
+            )
 
         except (Exception, AttributeError):
             return None
 
-    def _extract_title(self, card) -> str:
+    def _scan_card(self, card) -> "_CardScan":
+        """Percorre o card uma vez, recolhendo os candidatos a cada campo"""
+        scan = _CardScan()
+        text_parts = []
+        stripped_parts = []
+
+        for node in card.descendants:
+            node_type = type(node)
+
+            if node_type in _TEXT_TYPES:
+                text_parts.append(node)
+                stripped = node.strip()
+                if stripped:
+                    stripped_parts.append(stripped)
+                continue
+
+            if node_type is not Tag:
+                continue
+
+            name = node.name
+            attrs = node.attrs
+
+            if name in _HEADINGS and name not in scan.headings:
+                scan.headings[name] = node
+            if name == "a" and scan.link is None and "href" in attrs:
+                scan.link = node
+
+            testid = attrs.get("data-testid")
+            if testid:
+                testid = str(testid)
+                if scan.title_testid is None and "title" in testid:
+                    scan.title_testid = node
+                if scan.price_testid is None and "price" in testid:
+                    scan.price_testid = node
+
+            classes = attrs.get("class")
+            if classes:
+                class_text = " ".join(classes) if isinstance(classes, list) else classes
+                if scan.title_class is None and _TITLE_CLASS.search(class_text):
+                    scan.title_class = node
+                if scan.price_class is None and _PRICE_CLASS.search(class_text):
+                    scan.price_class = node
+                if scan.price_span is None and name == "span" and "€" in class_text:
+                    scan.price_span = node
+
+        scan.text = "".join(text_parts)
+        scan.stripped_text = "".join(stripped_parts)
+        return scan
+
+    def _extract_title(self, scan: "_CardScan") -> str:
         """Extrai título de múltiplas formas"""
-        # Tentar vários selectors
+        # Tentar vários selectors, por ordem de preferência
         selectors = [
-            card.find("h3"),
-            card.find("h4"),
-            card.find("h5"),
-            card.find(attrs={"data-testid": lambda x: x and "title" in str(x)}),
-            card.find(
-                attrs={
-                    "class": lambda x: x
-                    and any(cls in str(x) for cls in ["title", "name", "description"])
-                }
-            ),
+            scan.headings.get("h3"),
+            scan.headings.get("h4"),
+            scan.headings.get("h5"),
+            scan.title_testid,
+            scan.title_class,
         ]
 
         for selector in selectors:
-            if selector:
+            if selector is not None:
                 text = selector.get_text(strip=True)
                 if text and len(text) > 2:
                     return text
 
         # Fallback: extrair texto de todo o card e pegar a primeira linha
-        card_text = card.get_text(strip=True)
+        card_text = scan.stripped_text
         if card_text:
             lines = [line.strip() for line in card_text.split("\n") if line.strip()]
             return lines[0] if lines else "Produto sem nome"
 
         return "Produto sem nome"
 
-    def _extract_price(self, card) -> float:
+    def _extract_price(self, scan: "_CardScan") -> float:
         """Extrai preço de múltiplas formas"""
         # Procurar elementos de preço
-        price_selectors = [
-            card.find(attrs={"data-testid": lambda x: x and "price" in str(x)}),
-            card.find(
-                attrs={
-                    "class": lambda x: x
-                    and any(cls in str(x) for cls in ["price", "amount", "value"])
-                }
-            ),
-            card.find("span", class_=lambda x: x and "€" in str(x)),
-        ]
+        price_selectors = [scan.price_testid, scan.price_class, scan.price_span]
 
         for selector in price_selectors:
-            if selector:
+            if selector is not None:
                 price_text = selector.get_text(strip=True)
                 price = self._clean_price(price_text)
                 if price > 0:
                     return price
 
         # Procurar padrão de preço no texto completo
-        card_text = card.get_text()
-        price_patterns = [
-            r"€\s*(\d+[.,]\d{2})",
-            r"(\d+[.,]\d{2})\s*€",
-            r"price:\s*€?\s*(\d+[.,]\d{2})",
-        ]
-
-        for pattern in price_patterns:
-            matches = re.findall(pattern, card_text, re.IGNORECASE)
-            if matches:
-                price = self._clean_price(matches[0])
+        for pattern in _PRICE_PATTERNS:
+            match = pattern.search(scan.text)
+            if match:
+                price = self._clean_price(match.group(1))
                 if price > 0:
                     return price
 
@@ -185,64 +714,30 @@ class VintedSource(MarketDataSource):
         except (ValueError, AttributeError):
             return 0.0
 
-    def _is_relevant_product(self, title: str, query: str) -> bool:
-        """Verifica relevância - Versão Multilingue"""
-        if not title or not query:
-            return False
+    def _match_relevance(self, title: str, query: str) -> Tuple[bool, float]:
+        """Relevância e score do título com a query compilada (cache por query)"""
+        relevant, score = compile_query(query).match(title)
 
-        title_lower = title.lower()
-        query_lower = query.lower()
-        query_words = query_lower.split()
-
-        # Traduções e variantes multilingues
-        translations = {
-            "teclado": ["keyboard", "clavier", "tastiera", "tastatur", "klavye"],
-            "apex": ["apex"],  # Mantém igual
-            "pro": ["pro", "professional"],
-            "v3": ["v3", "version3", "3"],
-        }
-
-        # Contar palavras matching considerando traduções
-        matching_words = 0
-        for query_word in query_words:
-            # Verificar palavra original
-            if query_word in title_lower:
-                matching_words += 1
-            else:
-                # Verificar traduções
-                for translation in translations.get(query_word, []):
-                    if translation in title_lower:
-                        matching_words += 1
-                        break
-
-        # Para produtos específicos como "teclado apex pro v3", aceitar menos matches
-        relevance_ratio = matching_words / len(query_words) if query_words else 0
-
-        # DEBUG: Mostrar apenas quando há algum match
-        if matching_words > 0:
-            print(f"      🔍 RELEVÂNCIA: '{title[:40]}...'")
-            print(
-                f"      🔍 Matching: {matching_words}/{len(query_words)} (ratio: {relevance_ratio:.2f})"
+        if logger.isEnabledFor(logging.DEBUG) and relevant:
+            logger.debug(
+                "Relevância: '%s...' relevante (score: %.2f)", title[:40], score
             )
+        return relevant, score
 
-        # Aceitar produtos com pelo menos 25% de match para produtos específicos
-        return relevance_ratio >= 0.25
+    def _is_relevant_product(self, title: str, query: str) -> bool:
+        """Verifica relevância - Versão Multilingue"""
+        return self._match_relevance(title, query)[0]
 
     def _calculate_relevance(self, title: str, query: str) -> float:
         """Calcula score de relevância (0-1)"""
-        title_lower = title.lower()
-        query_lower = query.lower()
-        query_words = query_lower.split()
+        return compile_query(query).match(title)[1]
 
-        if not query_words:
-            return 0.0
-
-        matching_words = sum(1 for word in query_words if word in title_lower)
-        return matching_words / len(query_words)
-
-    def _extract_condition(self, card, title: str) -> str:
+    def _extract_condition(self, scan: "_CardScan", title: str) -> str:
         """Extrai estado do produto"""
-        text = title + " " + card.get_text()
+        return self._condition_from_text(title + " " + scan.text)
+
+    def _condition_from_text(self, text: str) -> str:
+        """Classifica o estado a partir de palavras-chave no texto"""
         text_lower = text.lower()
 
         if any(
@@ -263,44 +758,44 @@ class VintedSource(MarketDataSource):
         else:
             return "razoável"
 
-    def _extract_location(self, card) -> str:
+    def _extract_location(self, scan: "_CardScan") -> str:
         """Extrai localização"""
         # Simplificado por agora
         return "Portugal"
 
-    def _extract_url(self, card) -> str:
+    def _extract_url(self, scan: "_CardScan") -> str:
         """Extrai URL do produto"""
-        link = card.find("a", href=True)
-        if link and link["href"]:
+        link = scan.link
+        if link is not None and link["href"]:
             return (
-                "https://www.vinted.pt" + link["href"]
+                self.base_url + link["href"]
                 if link["href"].startswith("/")
                 else link["href"]
             )
-        return "https://www.vinted.pt/"
+        return self.base_url + "/"
 
-    def _filter_relevant(self, listings: List[dict], query: str) -> List[dict]:
+    def _filter_relevant(
+        self, listings: Iterable[Listing], query: str
+    ) -> List[Listing]:
         """Filtra produtos relevantes - critério mais flexível"""
-        # Aceitar produtos com relevância baixa mas ordenar pelos mais relevantes
-        relevant = [item for item in listings if item.get("relevance_score", 0) >= 0.2]
-
-        # Ordenar por relevância (mais relevante primeiro)
-        relevant.sort(key=lambda x: x.get("relevance_score", 0), reverse=True)
-
-        # Mostrar debug dos produtos encontrados
-        if relevant:
-            print(f"      📊 Produtos filtrados: {len(relevant)} (de {len(listings)})")
-            for i, item in enumerate(relevant[:3]):  # Mostrar top 3
-                print(
-                    f"      {i + 1}. '{item['title'][:50]}...' - €{item['price']:.2f}"
-                )
-
-        return relevant[:10]  # Limitar a 10 produtos
+        return self._select_top(listings)[0]
+
+    def _select_top(
+        self, listings: Iterable[Listing], top_k: Optional[int] = None
+    ) -> Tuple[List[Listing], int]:
+        """Mantém as K listagens mais relevantes; devolve-as e o total visto"""
+        selector = _TopK(self.top_k if top_k is None else top_k)
+        listings = iter(listings)
+        while True:
+            chunk = list(islice(listings, 1024))
+            if not chunk:
+                return selector.result(), selector.seen
+            selector.extend(chunk)
 
     def is_available(self) -> bool:
         """Verifica se a Vinted está acessível"""
         try:
-            response = self.session.head("https://www.vinted.pt", timeout=5)
+            response = self.http.head(self.base_url, timeout=5)
             return response.status_code == 200
         except Exception:
             return False
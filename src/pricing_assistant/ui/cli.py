@@ -2,6 +2,7 @@
 Interface de Linha de Comando - Versão Corrigida
 """
 
+import argparse
 import sys
 import os
 
@@ -13,18 +14,98 @@ sys.path.insert(0, project_root)
 from pricing_assistant.services.analysis import AnalysisService
 from pricing_assistant.utils.config import Config
 from pricing_assistant.sources.vinted import VintedSource
+from pricing_assistant.sources.cache import with_cache
+from pricing_assistant.utils.metrics import configure_metrics
+from pricing_assistant.utils.log import configure_logging
+from pricing_assistant.services.batch import run_batch
+
+
+def batch_main(argv):
+    """Subcomando batch: precifica um inventário inteiro a partir de CSV/JSONL"""
+    parser = argparse.ArgumentParser(
+        prog="pricing-assistant batch",
+        description="Análise em lote de produtos (colunas: name, condition)",
+    )
+    parser.add_argument("input", help="ficheiro CSV ou JSONL de entrada")
+    parser.add_argument("-o", "--output", required=True, help="saída .jsonl ou .csv")
+    parser.add_argument("-w", "--workers", type=int, default=4)
+    parser.add_argument(
+        "--checkpoint", help="ficheiro de checkpoint (por omissão: <output>.checkpoint)"
+    )
+    parser.add_argument(
+        "--parse-processes",
+        type=int,
+        default=0,
+        help="processos para o parsing de HTML (-1 = um por núcleo; 0 = desligado)",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="não consultar as fontes, usar apenas o histórico local de preços",
+    )
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="mostrar o preço provisório de cada produto após cada página",
+    )
+    args = parser.parse_args(argv)
+
+    config = Config()
+    config.offline = args.offline
+    config.parse_processes = args.parse_processes
+    configure_logging(config)
+    registry = configure_metrics(config)
+    data_sources = with_cache([VintedSource(config)], config)
+
+    print(f"📦 Lote: {args.input} → {args.output} ({args.workers} workers)")
+    with AnalysisService(data_sources=data_sources, config=config) as service:
+        stats = run_batch(
+            service,
+            args.input,
+            args.output,
+            max_workers=args.workers,
+            checkpoint_path=args.checkpoint,
+            on_progress=print_batch_progress if args.progress else None,
+        )
+    registry.flush()
+    print(
+        f"✅ Lote concluído: {stats['written']} escritos, "
+        f"{stats['errors']} com erro, {stats['skipped']} retomados do checkpoint"
+    )
+
+
+def print_batch_progress(item, progress):
+    """Linha de progresso de um produto do lote (chamada das threads das fontes)"""
+    print(
+        f"   ⏳ {item['name']}: {progress.recommendation.suggested:.2f}€ provisório "
+        f"({progress.pages}/{progress.expected_pages} páginas, "
+        f"{progress.listings} listagens)",
+        file=sys.stderr,
+    )
 
 
-def main():
+def main(argv=None):
     """Função principal da CLI"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "batch":
+        batch_main(argv[1:])
+        return
+    if argv and argv[0] == "serve":
+        from pricing_assistant.ui.server import main as serve_main
+
+        serve_main(argv[1:])
+        return
+
     print("🎯 Pricing Assistant - CLI Mode")
     print("=" * 40)
 
     try:
         # Criar data sources
-        data_sources = [VintedSource()]
-        service = AnalysisService(data_sources=data_sources)
         config = Config()
+        configure_logging(config)
+        configure_metrics(config)
+        data_sources = with_cache([VintedSource(config)], config)
+        service = AnalysisService(data_sources=data_sources, config=config)
 
         # Obter input do usuário
         search_query = input("🔍 Produto para pesquisar: ").strip()
@@ -2,7 +2,29 @@
 Componentes da Interface Gráfica
 """
 
-from .product_form import ProductForm
-from .results_display import ResultsDisplay
-from .loading_overlay import LoadingOverlay
-from .history_panel import HistoryPanel
+__all__ = [
+    "ProductForm",
+    "ResultsDisplay",
+    "LoadingOverlay",
+    "HistoryPanel",
+    "VirtualTable",
+]
+
+# Cada componente é importado no primeiro acesso
+_COMPONENTS = {
+    "ProductForm": ".product_form",
+    "ResultsDisplay": ".results_display",
+    "LoadingOverlay": ".loading_overlay",
+    "HistoryPanel": ".history_panel",
+    "VirtualTable": ".virtual_table",
+}
+
+
+def __getattr__(name):
+    module_name = _COMPONENTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+
+    return getattr(importlib.import_module(module_name, __name__), name)
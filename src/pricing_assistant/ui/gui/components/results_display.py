@@ -1,11 +1,23 @@
 import tkinter as tk
 from tkinter import ttk
 from typing import Optional
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib
 
-matplotlib.use("TkAgg")
+from .virtual_table import VirtualTable
+
+
+def _short_title(title: str) -> str:
+    return title[:80] + "..." if len(title) > 80 else title
+
+
+def _load_matplotlib():
+    """pyplot e o canvas Tk, importados só ao desenhar o primeiro gráfico"""
+    import matplotlib
+
+    matplotlib.use("TkAgg")
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+    return plt, FigureCanvasTkAgg
 
 
 class ResultsDisplay(ttk.Frame):
@@ -31,9 +43,23 @@ class ResultsDisplay(ttk.Frame):
         self.recommendations_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.recommendations_frame, text="💡 Recomendações")
 
-        # Aba de Detalhes
+        # Aba de Detalhes (tabela criada uma vez e reutilizada)
         self.details_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.details_frame, text="📊 Detalhes")
+        self.details_frame.columnconfigure(0, weight=1)
+        self.details_frame.rowconfigure(0, weight=1)
+
+        self.details_table = VirtualTable(
+            self.details_frame,
+            columns=[
+                ("price", "Preço (€)", 80),
+                ("condition", "Condição", 100),
+                ("title", "Título", 300),
+                ("date", "Data", 100),
+            ],
+            formatters={"price": "{:.2f}".format, "title": _short_title},
+        )
+        self.details_table.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
         # Aba de Gráficos
         self.charts_frame = ttk.Frame(self.notebook)
@@ -137,54 +163,19 @@ class ResultsDisplay(ttk.Frame):
 
     def _show_details(self):
         """Mostra detalhes dos itens encontrados"""
-        for widget in self.details_frame.winfo_children():
-            widget.destroy()
-
         if not self.current_result:
+            self.details_table.clear()
             return
 
-        # Treeview para mostrar itens
-        columns = ("price", "condition", "title", "date")
-        tree = ttk.Treeview(
-            self.details_frame, columns=columns, show="headings", height=15
-        )
-
-        # Definir cabeçalhos
-        tree.heading("price", text="Preço (€)")
-        tree.heading("condition", text="Condição")
-        tree.heading("title", text="Título")
-        tree.heading("date", text="Data")
-
-        # Configurar colunas
-        tree.column("price", width=80)
-        tree.column("condition", width=100)
-        tree.column("title", width=300)
-        tree.column("date", width=100)
-
-        # Adicionar dados
-        for item in self.current_result.comparable_items:
-            tree.insert(
-                "",
-                tk.END,
-                values=(
-                    f"{item.price:.2f}",
-                    item.condition,
-                    item.title[:80] + "..." if len(item.title) > 80 else item.title,
-                    item.date,
-                ),
-            )
-
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(
-            self.details_frame, orient=tk.VERTICAL, command=tree.yview
+        items = self.current_result.comparable_items
+        self.details_table.set_columns(
+            {
+                "price": [item.price for item in items],
+                "condition": [item.condition for item in items],
+                "title": [item.title for item in items],
+                "date": [item.date for item in items],
+            }
         )
-        tree.configure(yscrollcommand=scrollbar.set)
-
-        tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-
-        self.details_frame.columnconfigure(0, weight=1)
-        self.details_frame.rowconfigure(0, weight=1)
 
     def _show_charts(self):
         """Mostra gráficos de distribuição de preços"""
@@ -195,6 +186,8 @@ class ResultsDisplay(ttk.Frame):
             return
 
         try:
+            plt, FigureCanvasTkAgg = _load_matplotlib()
+
             # Criar figura matplotlib
             fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
             fig.patch.set_facecolor("#f0f0f0")
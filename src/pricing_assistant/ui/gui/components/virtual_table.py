@@ -0,0 +1,397 @@
+import time
+import tkinter as tk
+from tkinter import ttk
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+# Trabalho máximo por frame ao aplicar dados novos (o resto fica para o seguinte)
+FRAME_BUDGET = 0.008
+# Linhas aplicadas ao modelo de cada vez
+CHUNK_ROWS = 2000
+# Espera após a última tecla antes de filtrar (ms)
+FILTER_DELAY = 150
+# Medidas por omissão até a Treeview ter a primeira linha desenhada (pixels)
+ROW_HEIGHT = 20
+HEADING_HEIGHT = 24
+
+
+class TableModel:
+    """Colunas paralelas e a vista (índices filtrados e ordenados) sobre elas
+
+    Ordenar e filtrar só reorganiza listas de índices: ``order`` tem todas as
+    linhas pela ordem atual e ``view`` as que passam o filtro, pela mesma
+    ordem. Os dados nunca são copiados linha a linha.
+    """
+
+    def __init__(self, names: Sequence[str]):
+        self.names = tuple(names)
+        self.columns: Dict[str, list] = {name: [] for name in self.names}
+        self.order: List[int] = []
+        self.view: List[int] = []
+        self.sort_column: Optional[str] = None
+        self.sort_reverse = False
+        self.filter_text = ""
+        # Texto pesquisável de cada linha (colunas de texto, já em minúsculas)
+        self._search: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.view)
+
+    @property
+    def total(self) -> int:
+        return len(self._search)
+
+    def clear(self):
+        self.columns = {name: [] for name in self.names}
+        self.order = []
+        self.view = []
+        self._search = []
+
+    def extend(self, columns: Dict[str, Sequence]) -> int:
+        """Acrescenta linhas (colunas em falta ficam vazias); devolve as visíveis"""
+        start = self.total
+        count = max(len(values) for values in columns.values())
+        texts = []
+        for name in self.names:
+            values = columns.get(name)
+            if values is None:
+                self.columns[name].extend([""] * count)
+                continue
+            self.columns[name].extend(values)
+            if count and isinstance(values[0], str):
+                texts.append(values)
+
+        if texts:
+            self._search.extend("\0".join(row).casefold() for row in zip(*texts))
+        else:
+            self._search.extend([""] * count)
+
+        new = list(range(start, start + count))
+        if self.sort_column is None:
+            added = self._filtered(new)
+            self.order.extend(new)
+            self.view.extend(added)
+            return len(added)
+
+        # Ordena só as linhas novas e intercala-as nas listas já ordenadas
+        key = self._sort_key()
+        new.sort(key=key, reverse=self.sort_reverse)
+        added = self._filtered(new)
+        self.order = _merge_sorted(self.order, new, key, self.sort_reverse)
+        self.view = _merge_sorted(self.view, added, key, self.sort_reverse)
+        return len(added)
+
+    def sort(self, column: str, reverse: Optional[bool] = None):
+        """Ordena a vista por ``column`` (sem ``reverse``, alterna o sentido)"""
+        if reverse is None:
+            reverse = column == self.sort_column and not self.sort_reverse
+        self.sort_column = column
+        self.sort_reverse = reverse
+        self._sort()
+
+    def set_filter(self, text: str):
+        """Mantém as linhas em que alguma coluna de texto contém ``text``"""
+        for _ in self.filter_steps(text):
+            pass
+
+    def filter_steps(self, text: str, rows: int = CHUNK_ROWS) -> Iterator[None]:
+        """``set_filter`` em passos de ``rows`` linhas (um por ``next``)
+
+        A vista só é substituída no fim; até lá não se deve chamar ``extend``
+        nem ``sort``.
+        """
+        text = text.strip().casefold()
+        # Filtro mais restrito que o anterior: basta percorrer a vista atual
+        narrowing = self.filter_text and text.startswith(self.filter_text)
+        source = self.view if narrowing else self.order
+
+        view: List[int] = []
+        for start in range(0, len(source), rows):
+            view.extend(self._filtered(source[start : start + rows], text))
+            yield
+        self.filter_text = text
+        self.view = view
+
+    def row(self, position: int) -> tuple:
+        """Valores da linha na posição ``position`` da vista"""
+        index = self.view[position]
+        return tuple(self.columns[name][index] for name in self.names)
+
+    def _filtered(
+        self, indexes: Iterable[int], text: Optional[str] = None
+    ) -> List[int]:
+        if text is None:
+            text = self.filter_text
+        if not text:
+            return list(indexes)
+        search = self._search
+        return [index for index in indexes if text in search[index]]
+
+    def _sort_key(self) -> Callable[[int], object]:
+        values = self.columns[self.sort_column]
+        if values and isinstance(values[0], str):
+            return lambda index: values[index].casefold()
+        return values.__getitem__
+
+    def _sort(self):
+        key = self._sort_key()
+        self.order.sort(key=key, reverse=self.sort_reverse)
+        self.view.sort(key=key, reverse=self.sort_reverse)
+
+
+def _merge_sorted(
+    view: List[int], added: List[int], key: Callable[[int], object], reverse: bool
+) -> List[int]:
+    """Intercala ``added`` em ``view`` (ambas ordenadas por ``key``)
+
+    Cada linha nova custa uma pesquisa binária; o resto da vista é copiado
+    por fatias, sem voltar a calcular chaves nem reordenar.
+    """
+    if not added:
+        return view
+    merged: List[int] = []
+    start = 0
+    for index in added:
+        value = key(index)
+        # bisect_right nos dois sentidos: as novas ficam depois das iguais
+        low, high = start, len(view)
+        while low < high:
+            middle = (low + high) // 2
+            current = key(view[middle])
+            if (current < value) if reverse else (value < current):
+                high = middle
+            else:
+                low = middle + 1
+        merged.extend(view[start:low])
+        merged.append(index)
+        start = low
+    merged.extend(view[start:])
+    return merged
+
+
+class VirtualTable(ttk.Frame):
+    """Treeview virtualizada para milhares de linhas
+
+    Só existem itens na Treeview para as linhas visíveis, reutilizados ao
+    fazer scroll; a barra de scroll, a ordenação (clique no cabeçalho) e o
+    filtro trabalham sobre o ``TableModel``. ``append()`` acumula dados que
+    são aplicados, tal como o filtro, em fatias de no máximo ``FRAME_BUDGET``
+    por frame.
+    """
+
+    def __init__(
+        self,
+        parent,
+        columns: Sequence[Tuple[str, str, int]],
+        formatters: Optional[Dict[str, Callable]] = None,
+        filterable: bool = True,
+        **kwargs,
+    ):
+        super().__init__(parent, **kwargs)
+        names = [name for name, _, _ in columns]
+        self.model = TableModel(names)
+        self.formatters = formatters or {}
+        self.headings = {name: heading for name, heading, _ in columns}
+        self.offset = 0
+        self._items: List[str] = []
+        self._pending: List[Dict[str, Sequence]] = []
+        self._flush_id = None
+        self._render_id = None
+        self._filter_id = None
+        self._filtering: Optional[Iterator[None]] = None
+        self._filter_step_id = None
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+
+        self.filter_var = tk.StringVar()
+        if filterable:
+            filter_frame = ttk.Frame(self)
+            filter_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E))
+            ttk.Label(filter_frame, text="🔎 Filtrar:").pack(
+                side=tk.LEFT, padx=(0, 5)
+            )
+            ttk.Entry(filter_frame, textvariable=self.filter_var).pack(
+                side=tk.LEFT, fill=tk.X, expand=True
+            )
+            self.filter_var.trace_add("write", self._on_filter_change)
+
+        self.tree = ttk.Treeview(self, columns=names, show="headings", height=15)
+        for name, heading, width in columns:
+            self.tree.heading(
+                name, text=heading, command=lambda n=name: self.sort_by(n)
+            )
+            self.tree.column(name, width=width)
+        self.tree.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        self.scrollbar = ttk.Scrollbar(
+            self, orient=tk.VERTICAL, command=self._on_scroll
+        )
+        self.scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
+
+        self.count_var = tk.StringVar(value="0 linhas")
+        ttk.Label(self, textvariable=self.count_var).grid(
+            row=2, column=0, columnspan=2, sticky=tk.W
+        )
+
+        self.tree.bind("<Configure>", lambda event: self._schedule_render())
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", self._on_wheel)
+        self.tree.bind("<Button-5>", self._on_wheel)
+
+    def set_columns(self, columns: Dict[str, Sequence]):
+        """Substitui todos os dados (aplicados progressivamente)"""
+        self.clear()
+        self.append(columns)
+
+    def append(self, columns: Dict[str, Sequence]):
+        """Acrescenta linhas; podem vir de qualquer thread via ``after``"""
+        count = max((len(values) for values in columns.values()), default=0)
+        for start in range(0, count, CHUNK_ROWS):
+            self._pending.append(
+                {
+                    name: values[start : start + CHUNK_ROWS]
+                    for name, values in columns.items()
+                }
+            )
+        if self._pending and self._flush_id is None:
+            self._flush_id = self.after_idle(self._flush)
+
+    def clear(self):
+        self._pending.clear()
+        self.model.clear()
+        self.offset = 0
+        self._schedule_render()
+        if self._filtering is not None:
+            self._apply_filter()  # sem linhas, termina de imediato
+
+    def sort_by(self, column: str):
+        self.model.sort(column)
+        arrow = " ▼" if self.model.sort_reverse else " ▲"
+        for name, heading in self.headings.items():
+            self.tree.heading(name, text=heading + (arrow if name == column else ""))
+        self.offset = 0
+        self._schedule_render()
+        if self._filtering is not None:
+            self._apply_filter()  # o filtro em curso percorria a ordem antiga
+
+    def _flush(self):
+        """Aplica dados pendentes até esgotar o orçamento do frame"""
+        self._flush_id = None
+        if self._filtering is not None:
+            return  # retomado quando o filtro terminar
+        deadline = time.perf_counter() + FRAME_BUDGET
+        while self._pending and time.perf_counter() < deadline:
+            self.model.extend(self._pending.pop(0))
+
+        self._schedule_render()
+        if self._pending:
+            self._flush_id = self.after(1, self._flush)
+
+    def _schedule_render(self):
+        if self._render_id is None:
+            self._render_id = self.after_idle(self._render)
+
+    def _visible_rows(self) -> int:
+        row_height, heading_height = ROW_HEIGHT, HEADING_HEIGHT
+        if self._items:
+            bbox = self.tree.bbox(self._items[0])
+            if bbox:
+                heading_height, row_height = bbox[1], bbox[3]
+        return max(1, (self.tree.winfo_height() - heading_height) // row_height)
+
+    def _render(self):
+        """Mostra as linhas a partir de ``offset`` nos itens existentes"""
+        self._render_id = None
+        total = len(self.model)
+        visible = self._visible_rows()
+        self.offset = max(0, min(self.offset, total - visible))
+        needed = min(visible, total - self.offset)
+
+        while len(self._items) < needed:
+            self._items.append(self.tree.insert("", tk.END))
+        while len(self._items) > needed:
+            self.tree.delete(self._items.pop())
+
+        formatters = [self.formatters.get(name) for name in self.model.names]
+        for position, item in enumerate(self._items, self.offset):
+            values = self.model.row(position)
+            self.tree.item(
+                item,
+                values=[
+                    value if formatter is None else formatter(value)
+                    for value, formatter in zip(values, formatters)
+                ],
+            )
+
+        if total > visible:
+            self.scrollbar.set(self.offset / total, (self.offset + visible) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+        shown = f"{total} linhas"
+        if total != self.model.total:
+            shown += f" (de {self.model.total})"
+        self.count_var.set(shown)
+
+    def _scroll_to(self, offset: int):
+        self.offset = offset
+        self._schedule_render()
+
+    def _on_scroll(self, action: str, amount: str, unit: Optional[str] = None):
+        if action == "moveto":
+            self._scroll_to(int(float(amount) * len(self.model)))
+        elif unit == "pages":
+            self._scroll_to(self.offset + int(amount) * self._visible_rows())
+        else:
+            self._scroll_to(self.offset + int(amount))
+
+    def _on_wheel(self, event):
+        if event.num == 4:
+            step = -3
+        elif event.num == 5:
+            step = 3
+        else:
+            step = -3 if event.delta > 0 else 3
+        self._scroll_to(self.offset + step)
+        return "break"
+
+    def _on_filter_change(self, *args):
+        if self._filter_id is not None:
+            self.after_cancel(self._filter_id)
+        self._filter_id = self.after(FILTER_DELAY, self._apply_filter)
+
+    def _apply_filter(self):
+        self._filter_id = None
+        self._stop_filter()
+        self._filtering = self.model.filter_steps(self.filter_var.get())
+        self._filter_step()
+
+    def _filter_step(self):
+        """Avança o filtro até esgotar o orçamento do frame"""
+        self._filter_step_id = None
+        deadline = time.perf_counter() + FRAME_BUDGET
+        for _ in self._filtering:
+            if time.perf_counter() >= deadline:
+                self._filter_step_id = self.after(1, self._filter_step)
+                return
+
+        self._filtering = None
+        self.offset = 0
+        self._schedule_render()
+        if self._pending and self._flush_id is None:
+            self._flush_id = self.after_idle(self._flush)
+
+    def _stop_filter(self):
+        if self._filter_step_id is not None:
+            self.after_cancel(self._filter_step_id)
+            self._filter_step_id = None
+        self._filtering = None
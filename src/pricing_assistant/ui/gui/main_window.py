@@ -1,8 +1,14 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import threading
 import logging
-from typing import Dict, Any
+import queue
+from typing import Dict, Any, Optional
+
+from ...services.jobs import JobManager, Job
+from .components.virtual_table import VirtualTable
+
+# Intervalo entre atualizações da UI com o progresso da análise (ms)
+POLL_INTERVAL = 100
 
 
 class PricingAssistantGUI:
@@ -12,6 +18,12 @@ class PricingAssistantGUI:
         self.root = root
         self.analysis_service = analysis_service
 
+        # Análises em segundo plano (canceláveis, com progresso)
+        self.jobs = JobManager(analysis_service)
+        self.current_job: Optional[Job] = None
+        self.current_data: Dict[str, Any] = {}
+        self._poll_id = None
+
         # Setup da janela
         self._setup_window()
 
@@ -86,11 +98,25 @@ class PricingAssistantGUI:
         )
         pages_spin.pack(side=tk.LEFT)
 
-        # Botão analisar
+        # Botões analisar / cancelar
+        buttons_frame = ttk.Frame(self.main_frame)
+        buttons_frame.pack(pady=(20, 5))
+
         self.analyze_btn = ttk.Button(
-            self.main_frame, text="🎯 Analisar Preços", command=self._start_analysis
+            buttons_frame, text="🎯 Analisar Preços", command=self._start_analysis
         )
-        self.analyze_btn.pack(pady=20)
+        self.analyze_btn.pack(side=tk.LEFT, padx=(0, 10))
+        self.cancel_btn = ttk.Button(
+            buttons_frame,
+            text="⏹ Cancelar",
+            command=self._cancel_analysis,
+            state="disabled",
+        )
+        self.cancel_btn.pack(side=tk.LEFT)
+
+        # Progresso (páginas recebidas / páginas pedidas)
+        self.progress = ttk.Progressbar(self.main_frame, mode="determinate")
+        self.progress.pack(fill=tk.X, pady=(0, 15))
 
         # Área de resultados
         results_frame = ttk.LabelFrame(self.main_frame, text="📊 Resultados")
@@ -114,23 +140,17 @@ class PricingAssistantGUI:
         )
         self.results_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
-        # Treeview para detalhes
-        columns = ("price", "condition", "title")
-        self.tree = ttk.Treeview(
-            self.details_frame, columns=columns, show="headings", height=15
+        # Tabela virtualizada para os detalhes (milhares de listagens)
+        self.table = VirtualTable(
+            self.details_frame,
+            columns=[
+                ("price", "Preço (€)", 80),
+                ("condition", "Condição", 100),
+                ("title", "Título", 400),
+            ],
+            formatters={"price": "{:.2f}".format},
         )
-
-        # Definir cabeçalhos
-        self.tree.heading("price", text="Preço (€)")
-        self.tree.heading("condition", text="Condição")
-        self.tree.heading("title", text="Título")
-
-        # Configurar colunas
-        self.tree.column("price", width=80)
-        self.tree.column("condition", width=100)
-        self.tree.column("title", width=400)
-
-        self.tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.table.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
         # Status bar
         self.status_var = tk.StringVar(value="Pronto para analisar")
@@ -159,8 +179,13 @@ class PricingAssistantGUI:
             "max_pages": self.pages_var.get(),
         }
 
+        # Uma nova pesquisa substitui a que estiver em curso
+        if self.current_job is not None:
+            self.jobs.cancel(self.current_job)
+
         self.status_var.set("Analisando produto...")
-        self.analyze_btn.config(state="disabled")
+        self.cancel_btn.config(state="normal")
+        self.progress.config(value=0, maximum=1)
 
         # Limpar resultados anteriores
         self.results_text.config(state=tk.NORMAL)
@@ -168,40 +193,109 @@ class PricingAssistantGUI:
         self.results_text.insert(tk.END, "⏳ Analisando preços...\n")
         self.results_text.config(state=tk.DISABLED)
 
-        # Limpar treeview
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        # Limpar tabela
+        self.table.clear()
 
-        # Thread para não bloquear a UI
-        thread = threading.Thread(
-            target=self._perform_analysis, args=(product_data,), daemon=True
+        # Análise no pool do JobManager para não bloquear a UI
+        self.current_data = product_data
+        self.current_job = self.jobs.submit(
+            product_data["search_query"],
+            product_data["condition"],
+            max_pages=product_data["max_pages"],
         )
-        thread.start()
-
-    def _perform_analysis(self, product_data: Dict[str, Any]):
-        """Executa análise em background"""
-        try:
-            # Usar o serviço existente
-            analysis_result = self.analysis_service.analyze_product(
-                product_data["search_query"], product_data["condition"]
-            )
+        if self._poll_id is None:
+            self._poll_id = self.root.after(POLL_INTERVAL, self._poll_events)
 
-            # Atualizar UI na thread principal
-            self.root.after(0, self._on_analysis_success, analysis_result, product_data)
+    def _cancel_analysis(self):
+        """Cancela a análise em curso (as fontes param no próximo passo)"""
+        if self.current_job is None:
+            return
+        self.jobs.cancel(self.current_job)
+        self._end_job()
+        self.status_var.set("Análise cancelada")
 
-        except Exception as e:
-            error_msg = f"Erro na análise: {str(e)}"
-            logging.error(error_msg)
-            self.root.after(0, self._on_analysis_error, error_msg)
+        self.results_text.config(state=tk.NORMAL)
+        self.results_text.delete(1.0, tk.END)
+        self.results_text.insert(tk.END, "⏹ Análise cancelada")
+        self.results_text.config(state=tk.DISABLED)
 
-        except Exception as e:
-            error_msg = f"Erro na análise: {str(e)}"
-            logging.error(error_msg)
-            self.root.after(0, self._on_analysis_error, error_msg)
+    def _end_job(self):
+        self.current_job = None
+        self.cancel_btn.config(state="disabled")
+        self.progress.config(value=0)
+
+    def _poll_events(self):
+        """Aplica os eventos dos jobs, no máximo uma vez por POLL_INTERVAL
+
+        Vários eventos de progresso acumulados resultam numa só atualização
+        (a do mais recente); eventos de jobs substituídos são ignorados.
+        """
+        self._poll_id = None
+        progress = None
+        while True:
+            try:
+                event = self.jobs.events.get_nowait()
+            except queue.Empty:
+                break
+            job = self.current_job
+            if job is None or event.job_id != job.id:
+                continue
+
+            if event.kind == "progress":
+                progress = event.data
+            elif event.kind == "done":
+                self._end_job()
+                self._on_analysis_success(event.data, self.current_data)
+                return
+            elif event.kind == "error":
+                self._end_job()
+                self._on_analysis_error(f"Erro na análise: {event.data}")
+                return
+            elif event.kind == "cancelled":
+                self._end_job()
+                self.status_var.set("Análise cancelada")
+                return
+
+        if progress is not None:
+            self._show_progress(progress)
+        if self.current_job is not None:
+            self._poll_id = self.root.after(POLL_INTERVAL, self._poll_events)
+
+    def _show_progress(self, progress):
+        """Páginas, listagens e preço provisório de uma análise em curso"""
+        self.progress.config(value=progress.pages, maximum=progress.expected_pages)
+        self.status_var.set(
+            f"Analisando... {progress.pages}/{progress.expected_pages} páginas, "
+            f"{progress.listings} listagens"
+        )
+
+        recommendation = progress.recommendation
+        text = f"⏳ ANÁLISE EM CURSO: {self.current_data.get('search_query', '')}\n"
+        text += "=" * 50 + "\n\n"
+        text += f"📄 PÁGINAS: {progress.pages}/{progress.expected_pages}\n"
+        text += f"💰 LISTAGENS SELECIONADAS: {progress.listings}\n\n"
+        if progress.listings:
+            text += "🎯 ESTIMATIVA PROVISÓRIA:\n"
+            text += f"   💰 Preço sugerido: €{recommendation.suggested:.2f}\n"
+            text += (
+                f"   📉 Faixa: €{recommendation.minimum:.2f}"
+                f" - €{recommendation.maximum:.2f}\n"
+            )
+
+        self.results_text.config(state=tk.NORMAL)
+        self.results_text.delete(1.0, tk.END)
+        self.results_text.insert(tk.END, text)
+        self.results_text.config(state=tk.DISABLED)
+
+    def close(self):
+        """Cancela as análises em curso e termina o pool de jobs"""
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self.jobs.shutdown()
 
     def _on_analysis_success(self, result, product_data):
         """Callback para análise bem-sucedida - VERSÃO CORRIGIDA"""
-        self.analyze_btn.config(state="normal")
         self.status_var.set("Análise concluída com sucesso")
 
         # Acessar dados da estrutura REAL
@@ -231,7 +325,6 @@ class PricingAssistantGUI:
 
     def _on_analysis_error(self, error_msg: str):
         """Callback para erro na análise"""
-        self.analyze_btn.config(state="normal")
         self.status_var.set("Erro na análise")
 
         self.results_text.config(state=tk.NORMAL)
@@ -298,14 +391,24 @@ class PricingAssistantGUI:
         self.results_text.insert(tk.END, text)
         self.results_text.config(state=tk.DISABLED)
 
-        # Limpar treeview anterior
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        # Atualizar treeview com preços reais
-        for i, price in enumerate(prices, 1):
-            self.tree.insert(
-                "",
-                tk.END,
-                values=(f"{price:.2f}", condition, f"{product_name} - Preço {i}"),
+        # Atualizar tabela com as listagens (colunas do lote, sem linha a linha)
+        listings = market_data.get("listings")
+        if listings:
+            self.table.set_columns(
+                {
+                    "price": listings.prices,
+                    "condition": listings.conditions,
+                    "title": listings.titles,
+                }
+            )
+        else:
+            self.table.set_columns(
+                {
+                    "price": prices,
+                    "condition": [condition] * len(prices),
+                    "title": [
+                        f"{product_name} - Preço {i}"
+                        for i in range(1, len(prices) + 1)
+                    ],
+                }
             )
@@ -18,6 +18,9 @@ try:
     from pricing_assistant.services.analysis import AnalysisService
     from pricing_assistant.utils.config import Config
     from pricing_assistant.sources.vinted import VintedSource
+    from pricing_assistant.sources.cache import with_cache
+    from pricing_assistant.utils.metrics import configure_metrics
+    from pricing_assistant.utils.log import configure_logging
 except ImportError as e:
     print(f"Erro ao importar componentes GUI: {e}")
     print("Falling back para CLI...")
@@ -34,21 +37,26 @@ except ImportError as e:
 def main():
     """Inicia a aplicação GUI"""
     try:
-        # Configurar logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        )
+        config = Config()
+
+        # Configurar logging (GUI na raiz, pacote via fila não bloqueante)
+        logging.basicConfig(level=logging.INFO, format=config.log_format)
+        configure_logging(config)
+        configure_metrics(config)
 
         # Criar e iniciar aplicação
         root = tk.Tk()
 
         # Criar data sources
-        data_sources = [VintedSource()]
-        analysis_service = AnalysisService(data_sources=data_sources)
+        data_sources = with_cache([VintedSource(config)], config)
+        analysis_service = AnalysisService(data_sources=data_sources, config=config)
 
-        PricingAssistantGUI(root, analysis_service)
-        root.mainloop()
+        app = PricingAssistantGUI(root, analysis_service)
+        try:
+            root.mainloop()
+        finally:
+            app.close()
+            analysis_service.close()
 
     except Exception as e:
         print(f"Erro fatal na GUI: {e}")
@@ -0,0 +1,357 @@
+"""
+Modo servidor: API HTTP/JSON local com fontes, pools e caches sempre quentes
+
+Endpoints:
+    POST /analyze   {"name": ..., "condition": "bom", "max_pages": 2}
+    GET  /analyze?name=...&condition=...
+    POST /batch     {"items": [{"name": ..., "condition": ...}, ...]}
+                    (um registo por item, pela ordem do pedido)
+    GET  /health    estado das fontes e pedidos em curso
+    GET  /metrics   snapshot das métricas do processo
+
+Uso:
+    python src/pricing_assistant/ui/cli.py serve [--host H] [--port P]
+    python -m pricing_assistant.ui.server [--host H] [--port P]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import signal
+import time
+from dataclasses import asdict
+from http import HTTPStatus
+from typing import Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from ..services.analysis import AnalysisService
+from ..services.batch import batch_key
+from ..sources.cache import with_cache
+from ..sources.vinted import VintedSource
+from ..utils.config import Config
+from ..utils.log import configure_logging
+from ..utils.metrics import configure_metrics, metrics
+
+logger = logging.getLogger(__name__)
+
+IDLE_TIMEOUT = 30  # segundos à espera do próximo pedido numa ligação keep-alive
+
+
+class HttpError(Exception):
+    """Erro devolvido ao cliente como resposta JSON com o estado indicado"""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def analysis_json(result: dict) -> dict:
+    """Resultado de uma análise em tipos JSON (arrays de preços em listas)"""
+    market_data = result["market_data"]
+    return {
+        "product": result["product"],
+        "condition": result["condition"],
+        "recommendation": asdict(result["recommendation"]),
+        "market_data": {
+            "prices": list(market_data["prices"]),
+            "sources": market_data["sources"],
+            "collected_at": market_data["collected_at"],
+        },
+    }
+
+
+class PricingServer:
+    """Servidor asyncio sobre um AnalysisService partilhado entre pedidos
+
+    No máximo ``server_max_concurrent`` pedidos são analisados ao mesmo
+    tempo (os restantes esperam) e cada um tem ``server_request_timeout``
+    segundos, espera incluída; pedidos idênticos em simultâneo partilham a
+    mesma recolha (single-flight do serviço).
+    """
+
+    def __init__(self, service: AnalysisService, config: Optional[Config] = None):
+        self.service = service
+        self.config = config or service.config
+        self.in_flight = 0
+        self._slots = asyncio.Semaphore(self.config.server_max_concurrent)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._routes = {
+            ("GET", "/health"): self._health,
+            ("GET", "/metrics"): self._metrics,
+            ("GET", "/analyze"): self._analyze,
+            ("POST", "/analyze"): self._analyze,
+            ("POST", "/batch"): self._batch,
+        }
+
+    async def start(
+        self, host: Optional[str] = None, port: Optional[int] = None
+    ) -> asyncio.AbstractServer:
+        self._server = await asyncio.start_server(
+            self._handle_connection,
+            host or self.config.server_host,
+            self.config.server_port if port is None else port,
+            limit=self.config.server_max_line,
+        )
+        for sock in self._server.sockets:
+            logger.info("Servidor à escuta em %s", sock.getsockname())
+        return self._server
+
+    async def serve_forever(self, host: Optional[str] = None, port=None):
+        """Serve até SIGINT/SIGTERM"""
+        server = await self.start(host, port)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):  # Windows
+                pass
+
+        async with server:
+            await stop.wait()
+        logger.info("Servidor terminado")
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        """Pedidos de uma ligação (HTTP/1.1 keep-alive), um de cada vez"""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(
+                        self._read_request(reader), IDLE_TIMEOUT
+                    )
+                except HttpError as e:
+                    await self._respond(writer, e.status, {"error": str(e)}, False)
+                    break
+                if request is None:
+                    break
+
+                method, target, headers, body = request
+                status, payload = await self._dispatch(method, target, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        """(método, alvo, cabeçalhos, corpo) ou None se o cliente fechou"""
+        line = await self._readline(
+            reader, HTTPStatus.BAD_REQUEST, "linha de pedido demasiado longa"
+        )
+        if not line.strip():
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "linha de pedido inválida")
+
+        headers = {}
+        while True:
+            line = await self._readline(
+                reader,
+                HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                "cabeçalho demasiado longo",
+            )
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Content-Length inválido")
+        if length > self.config.server_max_body:
+            raise HttpError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "pedido demasiado grande"
+            )
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, headers, body
+
+    async def _readline(
+        self, reader: asyncio.StreamReader, status: HTTPStatus, message: str
+    ) -> bytes:
+        """Uma linha do pedido; acima de ``server_max_line`` bytes é um HttpError"""
+        try:
+            return await reader.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            raise HttpError(status, message)
+
+    async def _dispatch(
+        self, method: str, target: str, body: bytes
+    ) -> Tuple[int, dict]:
+        url = urlsplit(target)
+        handler = self._routes.get((method, url.path))
+        if handler is None:
+            if any(path == url.path for _, path in self._routes):
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "método inválido"}
+            return HTTPStatus.NOT_FOUND, {"error": "endpoint desconhecido"}
+
+        metrics.incr("server_requests")
+        start = time.perf_counter()
+        try:
+            params = dict(parse_qsl(url.query))
+            if body:
+                try:
+                    params.update(json.loads(body))
+                except (ValueError, TypeError):
+                    raise HttpError(HTTPStatus.BAD_REQUEST, "corpo JSON inválido")
+            return HTTPStatus.OK, await handler(params)
+        except HttpError as e:
+            return e.status, {"error": str(e)}
+        except Exception:
+            logger.exception("Erro ao processar %s %s", method, url.path)
+            metrics.incr("server_errors")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "erro interno"}
+        finally:
+            metrics.observe("server_request", time.perf_counter() - start)
+
+    async def _respond(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: dict,
+        keep_alive: bool,
+    ):
+        status = HTTPStatus(status)
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def _limited(self, func, *args, **kwargs):
+        """Executa ``func`` (corrotina) no limite de concorrência e no prazo"""
+
+        async def run():
+            async with self._slots:
+                self.in_flight += 1
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    self.in_flight -= 1
+
+        try:
+            return await asyncio.wait_for(run(), self.config.server_request_timeout)
+        except asyncio.TimeoutError:
+            metrics.incr("server_timeouts")
+            raise HttpError(HTTPStatus.GATEWAY_TIMEOUT, "prazo do pedido excedido")
+
+    async def _analyze(self, params: dict) -> dict:
+        name, condition, max_pages = self._item(params)
+        result = await self._limited(
+            self.service.aanalyze_product, name, condition, max_pages=max_pages
+        )
+        return analysis_json(result)
+
+    async def _batch(self, params: dict) -> dict:
+        items = params.get("items")
+        if not isinstance(items, list) or not items:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "'items' deve ser uma lista")
+        if len(items) > self.config.server_batch_max_items:
+            raise HttpError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f"máximo de {self.config.server_batch_max_items} itens por lote",
+            )
+
+        batch = []
+        for item in items:
+            name, condition, max_pages = self._item(item)
+            batch.append(
+                {"name": name, "condition": condition, "max_pages": max_pages}
+            )
+
+        async def collect():
+            records = self.service.aanalyze_batch(
+                batch, max_concurrent=self.config.server_batch_concurrency
+            )
+            return [record async for record in records]
+
+        # Itens repetidos são analisados uma vez, mas cada um tem o seu registo
+        by_key = {record.pop("key"): record for record in await self._limited(collect)}
+        return {
+            "records": [
+                dict(
+                    by_key[batch_key(item["name"], item["condition"])],
+                    product=item["name"],
+                )
+                for item in batch
+            ]
+        }
+
+    def _item(self, params) -> Tuple[str, str, Optional[int]]:
+        """Nome, estado e páginas de um pedido de análise (validados)"""
+        if not isinstance(params, dict):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "item deve ser um objeto JSON")
+        name = str(params.get("name") or "").strip()
+        if not name:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "'name' é obrigatório")
+        try:
+            max_pages = int(params["max_pages"]) if params.get("max_pages") else None
+        except (TypeError, ValueError):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "'max_pages' deve ser inteiro")
+        return name, str(params.get("condition") or "bom"), max_pages
+
+    async def _health(self, params: dict) -> dict:
+        health = self.service.health
+        return {
+            "status": "ok",
+            "in_flight": self.in_flight,
+            "sources": {
+                source.name: health.state(source.name)
+                for source in self.service.data_sources
+            },
+        }
+
+    async def _metrics(self, params: dict) -> dict:
+        return metrics.snapshot()
+
+
+def main(argv=None):
+    """Subcomando serve: arranca o servidor e serve até ser interrompido"""
+    parser = argparse.ArgumentParser(
+        prog="pricing-assistant serve",
+        description="API HTTP/JSON local do Pricing Assistant",
+    )
+    parser.add_argument("--host")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--max-concurrent", type=int)
+    parser.add_argument("--timeout", type=float, help="prazo por pedido (segundos)")
+    parser.add_argument(
+        "--parse-processes",
+        type=int,
+        default=0,
+        help="processos para o parsing de HTML (-1 = um por núcleo; 0 = desligado)",
+    )
+    args = parser.parse_args(argv)
+
+    config = Config()
+    if args.max_concurrent:
+        config.server_max_concurrent = args.max_concurrent
+    if args.timeout:
+        config.server_request_timeout = args.timeout
+    config.parse_processes = args.parse_processes
+    configure_logging(config)
+    configure_metrics(config)
+
+    data_sources = with_cache([VintedSource(config)], config)
+    with AnalysisService(data_sources=data_sources, config=config) as service:
+        server = PricingServer(service, config)
+        try:
+            asyncio.run(server.serve_forever(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Cancelamento cooperativo de operações longas (análises, pesquisas, pedidos)
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class Cancelled(Exception):
+    """Operação interrompida através de um CancellationToken"""
+
+
+class CancellationToken:
+    """Pedido de cancelamento partilhado entre threads
+
+    Quem executa verifica o token entre passos (``raise_if_cancelled``) e
+    usa ``sleep`` nas esperas, que acordam assim que o token é cancelado.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise Cancelled("operação cancelada")
+
+    def sleep(self, seconds: float):
+        """Espera ``seconds``; lança Cancelled se o token for cancelado antes"""
+        if self._event.wait(seconds):
+            raise Cancelled("operação cancelada")
+
+
+def sleep(seconds: float, cancel: Optional[CancellationToken] = None):
+    """``time.sleep`` interrompível por um token opcional"""
+    if cancel is None:
+        time.sleep(seconds)
+    else:
+        cancel.sleep(seconds)
@@ -2,12 +2,88 @@
 Configuration module for Pricing Assistant
 """
 
+from pathlib import Path
+
 
 class Config:
     def __init__(self):
         self.scraping_delay = 2
         self.max_pages = 2
-        self.timeout = 30
+        self.timeout = 30  # prazo global de uma análise (segundos)
+        self.source_timeout = 20  # prazo de cada fonte de dados
+        self.source_timeouts = {}  # prazos por fonte, ex.: {"Vinted": 15}
+
+        # Saúde das fontes: validade do estado e circuit breaker
+        self.health_ttl = 60
+        self.circuit_failure_threshold = 3
+        self.circuit_cooldown = 30
+
+        # Pedidos simultâneos por fonte (páginas do catálogo em paralelo)
+        self.max_concurrent_requests = 4
+        # Backend do BeautifulSoup (None = lxml se instalado, senão html.parser)
+        self.html_parser = None
+        # Processos para parsing de HTML (0 = na thread do pedido, -1 = um por núcleo)
+        self.parse_processes = 0
+        # Listagens mais relevantes mantidas por pesquisa (seleção em heap)
+        self.top_k = 10
+
+        # Rate limit global por host (token bucket adaptativo, todas as fontes)
+        self.rate_limit_burst = 2  # pedidos seguidos permitidos sem espera
+        self.rate_limit_hosts = {}  # ex.: {"www.vinted.pt": 0.5} pedidos/s
+        self.rate_limit_min_rate = 0.05  # limite inferior ao abrandar
+        # Ficheiro de estado para partilhar o limite entre processos (None = não)
+        self.rate_limit_state_path = None
+
+        # Transporte HTTP: pool keep-alive, retries e validadores ETag/Last-Modified
+        self.http_pool_connections = 4  # hosts com pool próprio
+        self.http_pool_size = 8  # ligações por host
+        self.http_backoff_base = 0.5  # segundos (duplica a cada tentativa)
+        self.http_backoff_max = 30
+        self.http_validator_cache_entries = 256
+        self.http_validator_cache_bytes = 8 * 1024 * 1024  # corpos guardados
+
+        # Cache de pesquisas em disco
+        self.cache_enabled = True
+        self.cache_path = (
+            Path.home() / ".cache" / "pricing_assistant" / "search_cache.db"
+        )
+        self.cache_ttl = 1800  # segundos
+        self.cache_max_entries = 500
+
+        # Histórico local de preços observados (tendência e modo offline)
+        self.history_enabled = True
+        self.history_path = (
+            Path.home() / ".cache" / "pricing_assistant" / "price_history.db"
+        )
+        self.history_window_days = 30
+        # Offline: não consulta as fontes, responde apenas com o histórico
+        self.offline = False
+
+        # Análises em segundo plano da GUI (services/jobs.py)
+        self.job_workers = 2  # análises em simultâneo (as restantes ficam em fila)
+
+        # Modo servidor (API HTTP/JSON local, ui/server.py)
+        self.server_host = "127.0.0.1"
+        self.server_port = 8377
+        self.server_max_concurrent = 8  # pedidos em análise ao mesmo tempo
+        self.server_request_timeout = 60  # segundos por pedido (lotes incluídos)
+        self.server_batch_max_items = 100
+        self.server_batch_concurrency = 4  # análises em paralelo por lote
+        self.server_max_body = 1 << 20  # bytes
+        self.server_max_line = 8192  # bytes por linha (pedido ou cabeçalho)
+
+        # Métricas por etapa (fetch, parse, filtro, outliers, preço)
+        self.metrics_enabled = False
+        self.metrics_sink = "memory"  # memory | prometheus | json
+        self.metrics_path = (
+            Path.home() / ".cache" / "pricing_assistant" / "metrics.prom"
+        )
+        self.metrics_flush_interval = 60  # segundos
+
+        # Logging (níveis por módulo, ex.: {"pricing_assistant.sources": "DEBUG"})
+        self.log_level = "INFO"
+        self.log_module_levels = {}
+        self.log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
     def get_vinted_config(self):
         return {
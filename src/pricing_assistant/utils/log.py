@@ -0,0 +1,85 @@
+"""
+Configuração de logging do Pricing Assistant (handler não bloqueante por fila)
+
+Os módulos usam ``logging.getLogger(__name__)`` com formatação preguiçosa
+(``logger.debug("... %s", valor)``); a formatação e a escrita efetiva são
+feitas por uma thread do ``QueueListener``, fora dos loops de parsing e das
+threads de pesquisa. Com DEBUG desligado as mensagens nem chegam à fila.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+from typing import Dict, Optional
+
+PACKAGE_LOGGER = "pricing_assistant"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que não formata nem copia o registo na thread de origem
+
+    O ``prepare`` original chama ``format()`` e copia o registo antes de o
+    pôr na fila; aqui o registo segue tal como está e a mensagem só é
+    formatada pelo handler do listener. Os argumentos das mensagens do pacote
+    são valores imutáveis (números, strings), pelo que formatar mais tarde
+    dá o mesmo texto.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging(
+    level="INFO",
+    module_levels: Optional[Dict[str, str]] = None,
+    fmt: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    stream=None,
+) -> logging.handlers.QueueListener:
+    """Liga o logger do pacote a um handler por fila (idempotente)
+
+    ``module_levels`` permite níveis por módulo, por exemplo
+    ``{"pricing_assistant.sources.vinted": "DEBUG"}``.
+    """
+    global _listener
+
+    stop_logging()
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(logging.Formatter(fmt))
+
+    log_queue = queue.SimpleQueue()
+    package_logger = logging.getLogger(PACKAGE_LOGGER)
+    package_logger.handlers = [LazyQueueHandler(log_queue)]
+    package_logger.setLevel(level)
+    package_logger.propagate = False
+
+    for module, module_level in (module_levels or {}).items():
+        logging.getLogger(module).setLevel(module_level)
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, handler, respect_handler_level=True
+    )
+    _listener.start()
+    return _listener
+
+
+def configure_logging(config) -> logging.handlers.QueueListener:
+    """Aplica os níveis e o formato definidos na configuração"""
+    return setup_logging(
+        level=config.log_level,
+        module_levels=config.log_module_levels,
+        fmt=config.log_format,
+    )
+
+
+@atexit.register
+def stop_logging():
+    """Para o listener, escrevendo antes as mensagens ainda em fila"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,184 @@
+"""
+Instrumentação leve do pipeline de análise (timers, contadores e sinks)
+
+Quando desativado, ``metrics.timer()`` devolve sempre o mesmo contexto vazio
+e ``metrics.incr()`` retorna de imediato, pelo que o custo é desprezável.
+"""
+
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class _NullTimer:
+    """Contexto que não mede nada (métricas desativadas)"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    """Mede a duração de um bloco e regista-a no registry"""
+
+    __slots__ = ("registry", "name", "start")
+
+    def __init__(self, registry: "MetricsRegistry", name: str):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class InMemorySink:
+    """Guarda o último snapshot exportado (útil para testes e para a GUI)"""
+
+    def __init__(self):
+        self.last_snapshot: Optional[dict] = None
+
+    def export(self, snapshot: dict):
+        self.last_snapshot = snapshot
+
+
+class PrometheusFileSink:
+    """Escreve as métricas no formato de texto do Prometheus (node exporter)"""
+
+    def __init__(self, path, prefix: str = "pricing_assistant"):
+        self.path = Path(path)
+        self.prefix = prefix
+
+    def export(self, snapshot: dict):
+        lines = []
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = f"{self.prefix}_{name}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+
+        for name, timer in sorted(snapshot["timers"].items()):
+            metric = f"{self.prefix}_{name}_seconds"
+            lines += [
+                f"# TYPE {metric} summary",
+                f"{metric}_count {timer['count']}",
+                f"{metric}_sum {timer['total']:.6f}",
+            ]
+
+        # Escrita atómica para o coletor nunca ler um ficheiro a meio
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        tmp_path.replace(self.path)
+
+
+class JsonLogSink:
+    """Emite cada snapshot como uma linha JSON num logger"""
+
+    def __init__(self, logger_name: str = "pricing_assistant.metrics"):
+        self.logger = logging.getLogger(logger_name)
+
+    def export(self, snapshot: dict):
+        self.logger.info(json.dumps(snapshot, sort_keys=True))
+
+
+class MetricsRegistry:
+    """Registry em processo de contadores e timers"""
+
+    def __init__(self, enabled: bool = False, flush_interval: float = 60):
+        self.enabled = enabled
+        self.flush_interval = flush_interval
+        self.sinks: List = []
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._timers: Dict[str, dict] = {}
+        self._last_flush = time.monotonic()
+
+    def timer(self, name: str):
+        """Contexto que mede a duração de uma etapa"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def incr(self, name: str, value: int = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float):
+        if not self.enabled:
+            return
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                self._timers[name] = {
+                    "count": 1,
+                    "total": seconds,
+                    "min": seconds,
+                    "max": seconds,
+                }
+            else:
+                timer["count"] += 1
+                timer["total"] += seconds
+                timer["min"] = min(timer["min"], seconds)
+                timer["max"] = max(timer["max"], seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "timers": {name: dict(timer) for name, timer in self._timers.items()},
+            }
+
+    def flush(self):
+        """Exporta o estado atual para todos os sinks"""
+        self._last_flush = time.monotonic()
+        if not self.sinks:
+            return
+        snapshot = self.snapshot()
+        for sink in self.sinks:
+            sink.export(snapshot)
+
+    def maybe_flush(self):
+        """Exporta apenas se já passou ``flush_interval`` desde o último envio"""
+        if self.enabled and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._timers.clear()
+
+
+# Registry partilhado por todo o pacote
+metrics = MetricsRegistry()
+
+
+def configure_metrics(config) -> MetricsRegistry:
+    """Ativa as métricas e o sink definidos na configuração"""
+    metrics.enabled = config.metrics_enabled
+    metrics.flush_interval = config.metrics_flush_interval
+    metrics.sinks = []
+
+    if config.metrics_enabled:
+        if config.metrics_sink == "prometheus":
+            metrics.sinks.append(PrometheusFileSink(config.metrics_path))
+        elif config.metrics_sink == "json":
+            metrics.sinks.append(JsonLogSink())
+        else:
+            metrics.sinks.append(InMemorySink())
+
+    return metrics
@@ -0,0 +1,219 @@
+"""
+Rate limiting global por host: token bucket adaptativo (AIMD)
+
+Um único ``RateLimiter`` por processo é partilhado por todas as fontes,
+threads e tarefas asyncio (``shared_rate_limiter``). Com
+``Config.rate_limit_state_path`` o estado dos buckets fica num ficheiro com
+lock exclusivo, partilhado também entre processos (p. ex. vários lotes).
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem partilha entre processos
+    fcntl = None
+
+from .cancellation import CancellationToken, sleep
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Respostas que indicam que o servidor nos está a travar
+THROTTLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# AIMD: redução multiplicativa ao travar, recuperação aditiva em cada resposta OK
+DECREASE_ON_ERROR = 0.5
+DECREASE_ON_LATENCY = 0.8
+INCREASE_STEP = 0.05  # fração do orçamento do host recuperada por resposta
+DECREASE_INTERVAL = 2.0  # segundos mínimos entre reduções
+LATENCY_FACTOR = 2.0  # latência recente acima de N x a latência de base
+
+
+class _MemoryState:
+    """Estado dos hosts em memória (threads e tarefas do processo)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, dict] = {}
+
+    def update(self, host: str, func: Callable[[dict], Any]) -> Any:
+        with self._lock:
+            return func(self._hosts.setdefault(host, {}))
+
+
+class _FileState:
+    """Estado dos hosts num ficheiro JSON partilhado (flock exclusivo)"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def update(self, host: str, func: Callable[[dict], Any]) -> Any:
+        with self._lock, open(self.path, "a+", encoding="utf-8") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                handle.seek(0)
+                try:
+                    hosts = json.loads(handle.read() or "{}")
+                except ValueError:
+                    hosts = {}
+
+                result = func(hosts.setdefault(host, {}))
+
+                handle.seek(0)
+                handle.truncate()
+                json.dump(hosts, handle)
+                handle.flush()
+                return result
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+class RateLimiter:
+    """Token bucket por host com taxa adaptativa
+
+    ``reserve()`` retira um token e devolve a espera até ele existir (os
+    pedidos ficam em fila por ordem de reserva); ``wait()`` e ``acquire()``
+    são as versões bloqueante e assíncrona. ``feedback()`` reduz a taxa para
+    metade com 429/5xx ou falhas de ligação, e para 80% quando a latência
+    sobe; cada resposta normal recupera um pouco até ao orçamento do host.
+    """
+
+    def __init__(
+        self,
+        default_rate: float = 1.0,
+        burst: float = 1.0,
+        host_rates: Optional[Dict[str, float]] = None,
+        min_rate: float = 0.05,
+        state_path=None,
+    ):
+        self.default_rate = default_rate
+        self.burst = burst
+        self.host_rates = dict(host_rates or {})
+        self.min_rate = min_rate
+
+        if state_path and fcntl is None:
+            logger.warning("Rate limit entre processos indisponível neste sistema")
+            state_path = None
+        self._state = _FileState(state_path) if state_path else _MemoryState()
+
+    def set_budget(self, host: str, rate: float):
+        """Orçamento (pedidos/s) de um host, se não estiver já configurado"""
+        self.host_rates.setdefault(host, rate)
+
+    def budget(self, host: str) -> float:
+        return self.host_rates.get(host, self.default_rate)
+
+    def rate(self, host: str) -> float:
+        """Taxa atual do host (pedidos/s), já com as reduções do AIMD"""
+        budget = self.budget(host)
+        return self._state.update(host, lambda state: state.get("rate", budget))
+
+    def reserve(self, host: str) -> float:
+        """Reserva o próximo token do host; devolve os segundos até poder pedir"""
+        budget = self.budget(host)
+
+        def take(state: dict) -> float:
+            rate = self._refill(state, budget)
+            state["tokens"] -= 1
+            return max(0.0, -state["tokens"] / rate)
+
+        delay = self._state.update(host, take)
+        if delay > 0:
+            metrics.incr("rate_limit_waits")
+            metrics.observe("rate_limit_wait", delay)
+        return delay
+
+    def wait(self, host: str, cancel: Optional[CancellationToken] = None):
+        """Bloqueia a thread até ao próximo token do host (ou ao cancelamento)"""
+        delay = self.reserve(host)
+        if delay > 0:
+            sleep(delay, cancel)
+
+    async def acquire(self, host: str):
+        """Espera pelo próximo token do host sem bloquear o event loop"""
+        delay = self.reserve(host)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def feedback(
+        self,
+        host: str,
+        status: Optional[int],
+        latency: Optional[float] = None,
+        retry_after: Optional[float] = None,
+    ):
+        """Ajusta a taxa do host após uma resposta (``status=None``: falha de rede)"""
+        budget = self.budget(host)
+
+        def adjust(state: dict) -> bool:
+            rate = self._refill(state, budget)
+            now = state["stamp"]
+
+            slow = False
+            if latency is not None:
+                recent = state.get("latency", latency)
+                baseline = state.get("latency_base", latency)
+                state["latency"] = recent = recent + 0.3 * (latency - recent)
+                state["latency_base"] = baseline + 0.05 * (latency - baseline)
+                slow = recent > LATENCY_FACTOR * baseline
+
+            throttled = status is None or status in THROTTLE_STATUSES
+            slowed_down = False
+            if throttled or slow:
+                if now - state.get("decreased", 0.0) >= DECREASE_INTERVAL:
+                    factor = DECREASE_ON_ERROR if throttled else DECREASE_ON_LATENCY
+                    rate = max(self.min_rate, rate * factor)
+                    state["decreased"] = now
+                    slowed_down = True
+            else:
+                rate = min(budget, rate + budget * INCREASE_STEP)
+            state["rate"] = rate
+
+            if retry_after:
+                # Nenhum pedido a este host antes do prazo pedido pelo servidor
+                state["tokens"] = min(state["tokens"], -retry_after * rate)
+            return slowed_down
+
+        if self._state.update(host, adjust):
+            metrics.incr("rate_limit_slowdowns")
+            logger.info("%s: a abrandar para %.2f pedidos/s", host, self.rate(host))
+
+    def _refill(self, state: dict, budget: float) -> float:
+        """Acrescenta os tokens ganhos desde a última atualização; devolve a taxa"""
+        now = time.time()
+        rate = min(state.get("rate", budget), budget)
+        tokens = state.get("tokens", self.burst)
+        elapsed = max(0.0, now - state.get("stamp", now))
+        state.update(
+            tokens=min(self.burst, tokens + elapsed * rate), stamp=now, rate=rate
+        )
+        return rate
+
+
+_shared: Dict[Optional[str], RateLimiter] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_rate_limiter(config) -> RateLimiter:
+    """RateLimiter do processo (um por ficheiro de estado), comum a todas as fontes"""
+    key = str(config.rate_limit_state_path) if config.rate_limit_state_path else None
+    with _shared_lock:
+        limiter = _shared.get(key)
+        if limiter is None:
+            limiter = _shared[key] = RateLimiter(
+                default_rate=1 / config.scraping_delay,
+                burst=config.rate_limit_burst,
+                host_rates=config.rate_limit_hosts,
+                min_rate=config.rate_limit_min_rate,
+                state_path=config.rate_limit_state_path,
+            )
+        return limiter
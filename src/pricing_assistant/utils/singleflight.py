@@ -0,0 +1,86 @@
+"""
+Single-flight: chamadas idênticas em simultâneo partilham uma só execução
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from .metrics import metrics
+
+
+class SingleFlight:
+    """Agrupa chamadas concorrentes com a mesma chave
+
+    A primeira chamada (líder) executa a função; as que chegam enquanto está
+    em curso esperam e recebem o mesmo resultado (ou a mesma exceção). Threads
+    (``do``) e tarefas asyncio (``ado``) podem partilhar a mesma execução.
+    Terminada a execução a chave é libertada: não há cache de resultados.
+    """
+
+    def __init__(self, name: str = "singleflight"):
+        self.name = name
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Executa ``func`` ou espera pela execução já em curso para ``key``"""
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            self._finish(key, future, exception=e)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    async def ado(
+        self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs
+    ) -> Any:
+        """Versão asyncio de ``do`` (``func`` devolve uma corrotina)"""
+        future, leader = self._join(key)
+        if leader:
+            # Tarefa própria: cancelar o líder não cancela quem está à espera
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            task.add_done_callback(lambda done: self._finish_task(key, future, done))
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        """Future da execução em curso para ``key`` e se somos o líder"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is None:
+                future = self._calls[key] = Future()
+                return future, True
+            self.coalesced += 1
+
+        metrics.incr(f"{self.name}_coalesced")
+        return future, False
+
+    def _finish(self, key: Hashable, future: Future, result=None, exception=None):
+        # Libertar a chave antes de acordar quem espera: chamadas novas repetem
+        with self._lock:
+            self._calls.pop(key, None)
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+
+    def _finish_task(self, key: Hashable, future: Future, task: asyncio.Future):
+        if task.cancelled():
+            with self._lock:
+                self._calls.pop(key, None)
+            future.cancel()
+        elif task.exception() is not None:
+            self._finish(key, future, exception=task.exception())
+        else:
+            self._finish(key, future, result=task.result())
@@ -0,0 +1,94 @@
+import json
+
+from pricing_assistant.core.listing import Listing, ListingBatch
+from pricing_assistant.services.analysis import AnalysisService
+from pricing_assistant.services.batch import batch_key, read_items, run_batch
+from pricing_assistant.sources.base import MarketDataSource
+from pricing_assistant.utils.config import Config
+
+
+class FlakySource(MarketDataSource):
+    """Preços fixos; falha nas queries em ``failing``"""
+
+    name = "flaky"
+
+    def __init__(self):
+        self.failing = set()
+        self.queries = []
+
+    def search(self, query, **filters):
+        self.queries.append(query)
+        if query in self.failing:
+            raise ConnectionError("fonte em baixo")
+        return ListingBatch.from_listings(
+            [Listing(f"{query} {i}", 10.0 + i, url=f"/{i}") for i in range(5)]
+        )
+
+    def is_available(self):
+        return True
+
+
+def make_service(source):
+    config = Config()
+    config.history_enabled = False
+    config.circuit_failure_threshold = 100
+    return AnalysisService([source], config)
+
+
+def test_read_items_csv_and_jsonl(tmp_path):
+    csv_path = tmp_path / "items.csv"
+    csv_path.write_text(
+        "name,condition,max_pages\nRato,novo,2\n,bom,\nTeclado,,\n", encoding="utf-8"
+    )
+    jsonl_path = tmp_path / "items.jsonl"
+    jsonl_path.write_text('{"name": "Rato"}\n\n{"name": " "}\n', encoding="utf-8")
+
+    assert list(read_items(csv_path)) == [
+        {"name": "Rato", "condition": "novo", "max_pages": 2},
+        {"name": "Teclado", "condition": "bom"},
+    ]
+    assert list(read_items(jsonl_path)) == [{"name": "Rato", "condition": "bom"}]
+
+
+def test_batch_key_matches_history_normalisation():
+    assert batch_key("  Café  Expresso ", "bom") == batch_key("cafe expresso", "bom")
+    assert batch_key("cafe", "bom") != batch_key("cafe", "novo")
+
+
+def test_resume_retries_failed_rows(tmp_path):
+    input_path = tmp_path / "items.jsonl"
+    input_path.write_text(
+        "\n".join(
+            json.dumps({"name": name})
+            for name in ["rato", "teclado", "Rato ", "monitor"]
+        ),
+        encoding="utf-8",
+    )
+    output_path = tmp_path / "out.jsonl"
+
+    source = FlakySource()
+    source.failing = {"teclado"}
+    with make_service(source) as service:
+        stats = run_batch(service, input_path, output_path, max_workers=2)
+
+    # "Rato " repete "rato": analisado uma só vez
+    assert stats == {"written": 3, "errors": 1, "skipped": 0}
+    assert sorted(source.queries) == ["monitor", "rato", "teclado"]
+    records = [json.loads(line) for line in output_path.read_text().splitlines()]
+    failed = [r for r in records if r["error"]]
+    assert [r["product"] for r in failed] == ["teclado"]
+    assert "todas as fontes falharam" in failed[0]["error"]
+    assert failed[0]["suggested"] is None
+
+    # Retomar: só o produto que falhou volta a ser analisado
+    source.failing = set()
+    source.queries = []
+    with make_service(source) as service:
+        stats = run_batch(service, input_path, output_path, max_workers=2)
+
+    assert stats == {"written": 1, "errors": 0, "skipped": 3}
+    assert source.queries == ["teclado"]
+    records = [json.loads(line) for line in output_path.read_text().splitlines()]
+    assert len(records) == 4
+    assert records[-1]["product"] == "teclado" and records[-1]["error"] is None
+    assert records[-1]["prices"] == 5
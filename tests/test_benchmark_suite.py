@@ -0,0 +1,53 @@
+import suite
+
+
+def result(stage, case, seconds):
+    return {"stage": stage, "case": case, "seconds": seconds}
+
+
+def test_compare_counts_regressions_above_threshold(capsys):
+    baseline = {
+        "results": [
+            result("parse", "a.html", 0.010),
+            result("parse", "b.html", 0.010),
+            result("filter_relevant", "n=10", 0.010),
+        ]
+    }
+    current = {
+        "results": [
+            result("parse", "a.html", 0.0119),  # dentro do limite
+            result("parse", "b.html", 0.0130),  # regressão
+            result("filter_relevant", "n=10", 0.005),  # mais rápido
+            result("streaming", "n=10", 1.0),  # sem baseline: ignorado
+        ]
+    }
+
+    assert suite.compare(current, baseline, threshold=1.2) == 1
+    output = capsys.readouterr().out
+    assert "b.html" in output and "regressão" in output
+    assert "streaming" not in output
+
+
+def test_synthetic_data_is_deterministic():
+    prices = suite.synthetic_prices(100)
+    assert prices == suite.synthetic_prices(100)
+    assert prices != suite.synthetic_prices(100, seed=1)
+    # Um outlier a cada 20 preços
+    assert all(prices[i] in (1.5, 2.0, 900.0, 2500.0) for i in range(0, 100, 20))
+
+    listings = suite.synthetic_listings(50)
+    assert [item.price for item in listings] == [
+        item.price for item in suite.synthetic_listings(50)
+    ]
+
+
+def test_record_reports_throughput_and_memory(capsys):
+    results = []
+    suite.record(results, "stage", "case", 1000, "itens", lambda: list(range(1000)))
+
+    (entry,) = results
+    assert entry["stage"] == "stage" and entry["n"] == 1000
+    assert 1 <= entry["runs"] <= 50
+    assert entry["throughput"] == 1000 / entry["seconds"]
+    assert entry["peak_kib"] > 0
+    assert "stage" in capsys.readouterr().out
@@ -0,0 +1,172 @@
+import asyncio
+
+import pytest
+
+from pricing_assistant.core.listing import Listing, ListingBatch
+from pricing_assistant.sources import cache as cache_module
+from pricing_assistant.sources.base import (
+    AsyncMarketDataSource,
+    MarketDataSource,
+    SourceError,
+)
+from pricing_assistant.sources.cache import CachedSource, SearchCache
+
+
+class CountingSource(MarketDataSource):
+    """Devolve ``results`` por ordem (exceções são lançadas) e conta as pesquisas"""
+
+    name = "counting"
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def search(self, query, **filters):
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def is_available(self):
+        return True
+
+
+class AsyncCountingSource(AsyncMarketDataSource):
+    name = "counting"
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    async def asearch(self, query, **filters):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return self.results.pop(0)
+
+    def is_available(self):
+        return True
+
+
+def listings(*prices):
+    return ListingBatch.from_listings(
+        [Listing(f"item {price}", price, url=f"/{price}") for price in prices]
+    )
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def search_cache(tmp_path):
+    cache = SearchCache(tmp_path / "cache.db", ttl=60, max_entries=2)
+    yield cache
+    cache.close()
+
+
+def test_miss_then_hit(search_cache):
+    source = CountingSource(listings(10.0, 12.0))
+    cached = CachedSource(source, search_cache)
+    pages = []
+
+    first = cached.search("Teclado  Apex", condition="bom")
+    # Query normalizada; o callback de página não entra na chave
+    second = cached.search("teclado apex", condition="bom", on_page=pages.append)
+
+    assert source.calls == 1
+    assert list(second.prices) == list(first.prices) == [10.0, 12.0]
+    assert [item.url for item in second] == ["/10.0", "/12.0"]
+    assert [len(page) for page in pages] == [2]
+    assert search_cache.stats()["hits"] == search_cache.stats()["misses"] == 1
+
+
+def test_other_filters_miss(search_cache):
+    source = CountingSource(listings(10.0), listings(20.0))
+    cached = CachedSource(source, search_cache)
+
+    cached.search("teclado", condition="bom")
+    assert list(cached.search("teclado", condition="novo").prices) == [20.0]
+    assert source.calls == 2
+
+
+def test_entries_expire_after_ttl(search_cache, clock):
+    source = CountingSource(listings(10.0), listings(11.0))
+    cached = CachedSource(source, search_cache)
+
+    cached.search("teclado")
+    clock.now += 59
+    assert list(cached.search("teclado").prices) == [10.0]
+    clock.now += 2
+    assert list(cached.search("teclado").prices) == [11.0]
+    assert source.calls == 2
+
+
+def test_failures_and_empty_results_are_not_cached(search_cache):
+    source = CountingSource(
+        SourceError("rede em baixo"), ListingBatch(), listings(10.0)
+    )
+    cached = CachedSource(source, search_cache)
+
+    with pytest.raises(SourceError):
+        cached.search("teclado")
+    assert len(cached.search("teclado")) == 0
+    assert list(cached.search("teclado").prices) == [10.0]
+    assert list(cached.search("teclado").prices) == [10.0]
+    assert source.calls == 3
+
+
+def test_least_recently_used_entry_is_evicted(search_cache, clock):
+    source = CountingSource(listings(1.0), listings(2.0), listings(3.0), listings(4.0))
+    cached = CachedSource(source, search_cache)
+
+    for query in ("a", "b"):
+        clock.now += 1
+        cached.search(query)
+    clock.now += 1
+    cached.search("a")  # "b" passa a ser a menos usada
+    clock.now += 1
+    cached.search("c")
+
+    assert list(cached.search("a").prices) == [1.0]
+    assert list(cached.search("b").prices) == [4.0]
+    assert source.calls == 4
+
+
+def test_async_search_shares_the_cache(search_cache):
+    source = AsyncCountingSource(listings(10.0, 12.0))
+    cached = CachedSource(source, search_cache)
+
+    async def run():
+        first = await cached.asearch("teclado")
+        second = await cached.asearch("teclado")
+        return first, second
+
+    first, second = asyncio.run(run())
+    # A versão síncrona lê a mesma entrada
+    third = cached.search("teclado")
+
+    assert source.calls == 1
+    assert list(first.prices) == list(second.prices) == list(third.prices)
+
+
+def test_async_search_of_sync_source(search_cache):
+    source = CountingSource(SourceError("rede em baixo"), listings(10.0))
+    cached = CachedSource(source, search_cache)
+
+    with pytest.raises(SourceError):
+        asyncio.run(cached.asearch("teclado"))
+    assert list(asyncio.run(cached.asearch("teclado")).prices) == [10.0]
+    assert list(asyncio.run(cached.asearch("teclado")).prices) == [10.0]
+    assert source.calls == 2
@@ -0,0 +1,160 @@
+import threading
+import time
+
+import pytest
+
+from pricing_assistant.core.listing import Listing, ListingBatch
+from pricing_assistant.services import health as health_module
+from pricing_assistant.services.analysis import AnalysisService
+from pricing_assistant.services.health import HealthMonitor
+from pricing_assistant.sources.base import MarketDataSource
+from pricing_assistant.utils.cancellation import Cancelled, CancellationToken
+from pricing_assistant.utils.config import Config
+
+
+class FlakySource(MarketDataSource):
+    name = "flaky"
+
+    def __init__(self):
+        self.mode = "fail"
+
+    def search(self, query, **filters):
+        if self.mode == "fail":
+            raise RuntimeError("indisponível")
+        if self.mode == "hang":
+            filters["cancel"].sleep(5)
+        return ListingBatch.from_listings([Listing("item", 10.0)])
+
+    def is_available(self):
+        return True
+
+
+class ProbedSource(MarketDataSource):
+    """Conta as verificações explícitas de disponibilidade"""
+
+    name = "probed"
+
+    def __init__(self, available=True):
+        self.available = available
+        self.probes = 0
+
+    def search(self, query, **filters):
+        return ListingBatch()
+
+    def is_available(self):
+        self.probes += 1
+        return self.available
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(health_module.time, "monotonic", clock)
+    return clock
+
+
+def test_availability_is_probed_only_when_state_expires(clock):
+    health = HealthMonitor(ttl=60)
+    source = ProbedSource()
+
+    assert health.allow(source)
+    clock.now += 30
+    assert health.allow(source)
+    assert source.probes == 1
+
+    # Pesquisas reais renovam o estado sem nova verificação
+    health.record_success("probed")
+    clock.now += 59
+    assert health.allow(source)
+    assert source.probes == 1
+
+    clock.now += 2
+    source.available = False
+    assert not health.allow(source)
+    assert source.probes == 2
+
+
+def test_circuit_opens_and_recovers_through_a_single_trial(clock):
+    health = HealthMonitor(ttl=60, failure_threshold=3, cooldown=30)
+    source = ProbedSource()
+
+    health.record_failure("probed")
+    health.record_success("probed")  # sucesso repõe a contagem
+    for _ in range(2):
+        health.record_failure("probed")
+    assert health.state("probed") == "closed"
+    health.record_failure("probed")
+    assert health.state("probed") == "open"
+
+    clock.now += 29
+    assert not health.allow(source)
+
+    clock.now += 2
+    assert health.allow(source)
+    assert health.state("probed") == "half_open"
+    assert not health.allow(source)  # só uma pesquisa de teste de cada vez
+
+    # Teste falhado: novo período de espera
+    health.record_failure("probed")
+    assert health.state("probed") == "open"
+    assert not health.allow(source)
+
+    clock.now += 31
+    assert health.allow(source)
+    health.record_success("probed")
+    assert health.state("probed") == "closed"
+    assert health.allow(source)
+    assert source.probes == 0
+
+
+def test_open_circuit_skips_the_source():
+    config = Config()
+    config.history_enabled = False
+    source = FlakySource()
+    service = AnalysisService([source], config)
+
+    for _ in range(config.circuit_failure_threshold):
+        result = service.analyze_product("item")
+        assert result["market_data"]["sources"]["flaky"]["status"] == "error"
+
+    source.mode = "ok"
+    result = service.analyze_product("item")
+    info = result["market_data"]["sources"]["flaky"]
+    assert (info["status"], info["circuit"], info["prices"]) == (
+        "unavailable",
+        "open",
+        0,
+    )
+
+
+def test_cancelled_half_open_trial_does_not_block_source():
+    config = Config()
+    config.history_enabled = False
+    config.circuit_cooldown = 0.05
+    source = FlakySource()
+    service = AnalysisService([source], config)
+
+    for _ in range(config.circuit_failure_threshold):
+        service.analyze_product("item")
+    assert service.health.state("flaky") == "open"
+    time.sleep(0.1)
+
+    # Pesquisa de teste (half-open) cancelada a meio
+    source.mode = "hang"
+    token = CancellationToken()
+    threading.Timer(0.1, token.cancel).start()
+    with pytest.raises(Cancelled):
+        service.analyze_product("item", cancel=token)
+
+    source.mode = "ok"
+    result = service.analyze_product("item")
+    assert result["market_data"]["sources"]["flaky"]["status"] == "ok"
+    assert service.health.state("flaky") == "closed"
@@ -0,0 +1,39 @@
+import sqlite3
+
+from pricing_assistant.core.listing import Listing, ListingBatch
+from pricing_assistant.services.analysis import AnalysisService
+from pricing_assistant.sources.base import MarketDataSource
+from pricing_assistant.utils.config import Config
+
+
+class StaticSource(MarketDataSource):
+    name = "static"
+
+    def search(self, query, **filters):
+        return ListingBatch.from_listings([Listing("item", 10.0), Listing("b", 12.0)])
+
+    def is_available(self):
+        return True
+
+
+class LockedHistory:
+    def record(self, *args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    def prices(self, *args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    def close(self):
+        pass
+
+
+def test_history_errors_do_not_fail_the_analysis():
+    config = Config()
+    config.history_enabled = False
+    service = AnalysisService([StaticSource()], config)
+    service.history = service.pricing_engine.history = LockedHistory()
+
+    result = service.analyze_product("item")
+
+    assert result["market_data"]["sources"]["static"]["status"] == "ok"
+    assert list(result["market_data"]["prices"]) == [10.0, 12.0]
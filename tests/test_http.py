@@ -0,0 +1,127 @@
+import sys
+import types
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from pricing_assistant.sources import http
+from pricing_assistant.sources.http import HttpTransport, ValidatorCache
+from pricing_assistant.utils.config import Config
+from pricing_assistant.utils.rate_limit import RateLimiter
+
+URL = "https://example.test/catalog"
+
+
+class FakeAdapter(HTTPAdapter):
+    """Devolve respostas preparadas por ordem e guarda os pedidos enviados"""
+
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        status, headers, body = self.responses.pop(0)
+        response = requests.Response()
+        response.status_code = status
+        response.headers.update(headers)
+        response._content = body.encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+
+class CountingLimiter(RateLimiter):
+    def __init__(self):
+        super().__init__(default_rate=1000.0, burst=1000.0)
+        self.waits = []
+
+    def wait(self, host, cancel=None):
+        self.waits.append(host)
+        super().wait(host, cancel)
+
+
+def make_transport(responses, rate_limiter=None, max_retries=2, config=None):
+    transport = HttpTransport(
+        config or Config(), max_retries=max_retries, rate_limiter=rate_limiter
+    )
+    adapter = FakeAdapter(responses)
+    transport.session.mount("https://", adapter)
+    return transport, adapter
+
+
+def test_304_without_cached_body_waits_for_a_new_token():
+    limiter = CountingLimiter()
+    transport, adapter = make_transport(
+        [(304, {}, ""), (200, {"ETag": '"v2"'}, "fresh")], rate_limiter=limiter
+    )
+
+    assert transport.get_text(URL) == "fresh"
+    assert len(adapter.requests) == 2
+    assert limiter.waits == ["example.test", "example.test"]
+    # A repetição vai sem validadores
+    assert "If-None-Match" not in adapter.requests[1].headers
+
+
+def test_304_is_served_from_cache():
+    transport, adapter = make_transport(
+        [(200, {"ETag": '"v1"'}, "página"), (304, {"ETag": '"v1"'}, "")]
+    )
+
+    assert transport.get_text(URL) == "página"
+    assert transport.get_text(URL) == "página"
+    assert "If-None-Match" not in adapter.requests[0].headers
+    assert adapter.requests[1].headers["If-None-Match"] == '"v1"'
+
+
+@pytest.mark.parametrize("header, expected", [("3", 3.0), ("120", 30.0)])
+def test_retry_after_is_honoured_and_capped(monkeypatch, header, expected):
+    waits = []
+    monkeypatch.setattr(
+        http, "sleep", lambda seconds, cancel=None: waits.append(seconds)
+    )
+    config = Config()
+    config.http_backoff_max = 30
+    transport, adapter = make_transport(
+        [(429, {"Retry-After": header}, ""), (200, {}, "ok")], config=config
+    )
+
+    assert transport.get_text(URL) == "ok"
+    assert waits == [expected]
+    assert len(adapter.requests) == 2
+
+
+def test_accept_encoding_advertises_br_only_with_brotli(monkeypatch):
+    monkeypatch.setitem(sys.modules, "brotli", None)
+    monkeypatch.setitem(sys.modules, "brotlicffi", None)
+    assert HttpTransport(Config()).session.headers["Accept-Encoding"] == (
+        "gzip, deflate"
+    )
+
+    monkeypatch.setitem(sys.modules, "brotlicffi", types.ModuleType("brotlicffi"))
+    assert http.accept_encoding() == "gzip, deflate, br"
+
+
+def test_validator_cache_is_bounded_by_bytes():
+    cache = ValidatorCache(max_entries=10, max_bytes=100)
+    transport, _ = make_transport(
+        [
+            (200, {"ETag": '"a"'}, "a" * 60),
+            (200, {"ETag": '"b"'}, "b" * 30),
+            (200, {"ETag": '"c"'}, "c" * 30),
+            (200, {"ETag": '"d"'}, "d" * 101),
+        ]
+    )
+    for name in "abcd":
+        url = f"{URL}/{name}"
+        cache.store(url, transport.session.get(url))
+
+    # "a" saiu para caber "c"; "d" excede o limite e não é guardado
+    assert cache.body(f"{URL}/a") is None
+    assert cache.body(f"{URL}/b") == "b" * 30
+    assert cache.body(f"{URL}/c") == "c" * 30
+    assert cache.headers(f"{URL}/d") == {}
+    assert cache.size == 60
@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = str(Path(__file__).resolve().parent.parent / "src")
+
+# Só a GUI e o cálculo em lote os devem importar (e sempre sob pedido)
+HEAVY = ("numpy", "matplotlib", "tkinter")
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "pricing_assistant",
+        "pricing_assistant.services.analysis",
+        "pricing_assistant.ui.cli",
+        "pricing_assistant.ui.server",
+    ],
+)
+def test_import_does_not_load_heavy_modules(module):
+    code = f"import sys, {module}; print(' '.join(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env=dict(os.environ, PYTHONPATH=SRC_DIR),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    loaded = set(result.stdout.split())
+    assert not loaded.intersection(HEAVY)
@@ -0,0 +1,57 @@
+import dataclasses
+import json
+import sys
+
+import pytest
+
+from pricing_assistant.core.listing import Listing, ListingBatch
+
+LISTINGS = [
+    Listing("Teclado", 25.0, "novo", url="/1", relevance_score=1.0),
+    Listing("Rato", 9.5, condition="bom", location="Porto", url="/2"),
+    Listing("Cabo", 3.0, posted_date="Ontem", relevance_score=0.25),
+]
+
+
+def test_listing_is_frozen_and_slotted():
+    listing = LISTINGS[0]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        listing.price = 1.0
+    assert not hasattr(listing, "__dict__")
+    # Estados e locais repetidos partilham a mesma string
+    condition = "-novo"[1:]  # string nova, não a constante
+    assert Listing("x", 1.0, condition).condition is sys.intern("novo")
+
+
+def test_batch_round_trips_listings_and_columns():
+    batch = ListingBatch.from_listings(LISTINGS)
+
+    assert len(batch) == 3
+    assert list(batch) == LISTINGS
+    assert batch[1] == LISTINGS[1]
+    assert list(batch.prices) == [25.0, 9.5, 3.0]
+
+    columns = json.loads(json.dumps(batch.to_columns()))
+    assert list(ListingBatch.from_columns(columns)) == LISTINGS
+
+
+def test_coerce_accepts_any_source_result():
+    batch = ListingBatch.from_listings(LISTINGS)
+    assert ListingBatch.coerce(batch) is batch
+    assert len(ListingBatch.coerce(None)) == 0
+
+    # Fontes antigas: dicionários (sem preço são ignorados, chaves extra também)
+    dicts = [listing.to_dict() for listing in LISTINGS]
+    dicts.append({"title": "sem preço"})
+    dicts[0]["extra"] = "ignorado"
+    assert list(ListingBatch.coerce(dicts)) == LISTINGS
+    assert list(ListingBatch.coerce(iter(LISTINGS))) == LISTINGS
+
+
+def test_extend_with_batch_or_listings():
+    batch = ListingBatch.from_listings(LISTINGS[:1])
+    batch.extend(ListingBatch.from_listings(LISTINGS[1:2]))
+    batch.extend(LISTINGS[2:])
+
+    assert list(batch) == LISTINGS
+    assert list(batch.relevance_scores) == [1.0, 0.0, 0.25]
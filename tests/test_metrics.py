@@ -0,0 +1,117 @@
+import json
+import logging
+import threading
+
+import pytest
+
+from pricing_assistant.core.listing import Listing, ListingBatch
+from pricing_assistant.services.analysis import AnalysisService
+from pricing_assistant.sources.base import MarketDataSource
+from pricing_assistant.utils.config import Config
+from pricing_assistant.utils.metrics import (
+    InMemorySink,
+    JsonLogSink,
+    MetricsRegistry,
+    PrometheusFileSink,
+    metrics,
+)
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry(enabled=False)
+    with registry.timer("parse") as first, registry.timer("fetch") as second:
+        registry.incr("pages")
+        registry.observe("fetch", 1.0)
+
+    assert first is second  # contexto vazio partilhado, sem alocações
+    assert registry.snapshot() == {"counters": {}, "timers": {}}
+
+
+def test_counters_and_timers_aggregate():
+    registry = MetricsRegistry(enabled=True)
+    registry.incr("pages")
+    registry.incr("pages", 2)
+    for seconds in (0.5, 0.1, 0.3):
+        registry.observe("fetch", seconds)
+    with registry.timer("parse"):
+        pass
+
+    snapshot = registry.snapshot()
+    assert snapshot["counters"] == {"pages": 3}
+    assert snapshot["timers"]["fetch"] == pytest.approx(
+        {"count": 3, "total": 0.9, "min": 0.1, "max": 0.5}
+    )
+    assert snapshot["timers"]["parse"]["count"] == 1
+
+    # O snapshot é uma cópia
+    snapshot["timers"]["fetch"]["count"] = 0
+    assert registry.snapshot()["timers"]["fetch"]["count"] == 3
+
+
+def test_increments_from_many_threads():
+    registry = MetricsRegistry(enabled=True)
+
+    def work():
+        for _ in range(1000):
+            registry.incr("hits")
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert registry.snapshot()["counters"]["hits"] == 8000
+
+
+def test_sinks_export_snapshot(tmp_path, caplog):
+    registry = MetricsRegistry(enabled=True, flush_interval=3600)
+    memory = InMemorySink()
+    registry.sinks = [
+        memory,
+        PrometheusFileSink(tmp_path / "metrics.prom"),
+        JsonLogSink(),
+    ]
+    registry.incr("pages", 2)
+    registry.observe("fetch", 0.25)
+
+    registry.maybe_flush()  # intervalo ainda não passou
+    assert memory.last_snapshot is None
+
+    with caplog.at_level(logging.INFO, logger="pricing_assistant.metrics"):
+        registry.flush()
+
+    assert memory.last_snapshot == registry.snapshot()
+    assert json.loads(caplog.records[-1].getMessage()) == registry.snapshot()
+    prom = (tmp_path / "metrics.prom").read_text(encoding="utf-8").splitlines()
+    assert "pricing_assistant_pages_total 2" in prom
+    assert "pricing_assistant_fetch_seconds_count 1" in prom
+    assert "pricing_assistant_fetch_seconds_sum 0.250000" in prom
+
+
+class StaticSource(MarketDataSource):
+    name = "static"
+
+    def search(self, query, **filters):
+        return ListingBatch.from_listings([Listing("a", 10.0), Listing("b", 12.0)])
+
+    def is_available(self):
+        return True
+
+
+def test_analysis_is_instrumented(monkeypatch):
+    monkeypatch.setattr(metrics, "enabled", True)
+    metrics.reset()
+    config = Config()
+    config.history_enabled = False
+    try:
+        AnalysisService([StaticSource()], config).analyze_product("item")
+        snapshot = metrics.snapshot()
+    finally:
+        metrics.reset()
+
+    assert snapshot["counters"]["analyses"] == 1
+    for stage in ("analysis", "pricing", "outlier_removal"):
+        assert snapshot["timers"][stage]["count"] == 1
+    # As etapas estão contidas na análise
+    timers = snapshot["timers"]
+    assert timers["pricing"]["total"] <= timers["analysis"]["total"]
@@ -0,0 +1,71 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from pricing_assistant.core.listing import Listing
+from pricing_assistant.sources.parse_pool import (
+    ParsePool,
+    from_records,
+    open_parse_pool,
+    to_records,
+)
+from pricing_assistant.sources.vinted import VintedSource, _parse_records
+from pricing_assistant.utils.config import Config
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "benchmarks" / "fixtures"
+FIXTURES = {
+    "vinted_catalog_teclado.html": "teclado apex pro",
+    "vinted_catalog_tshirt_store.html": "t-shirt nike",
+}
+
+
+def test_records_round_trip():
+    listings = [
+        Listing("Teclado", 25.0, "novo", url="/1", relevance_score=1.0),
+        Listing("Rato", 9.5, location="Porto"),
+    ]
+    records = to_records(listings)
+    assert all(type(record) is tuple for record in records)
+    assert from_records(records) == listings
+
+
+def test_open_parse_pool_from_config():
+    config = Config()
+    config.parse_processes = 0
+    assert open_parse_pool(config) is None
+
+    # -1: um processo por núcleo; os processos só arrancam com start()
+    for processes, expected in [(2, 2), (-1, os.cpu_count() or 1)]:
+        config.parse_processes = processes
+        pool = open_parse_pool(config)
+        assert pool.processes == expected
+        pool.close()
+
+
+def test_pool_parsing_matches_local_parsing():
+    source = VintedSource()
+    pool = ParsePool(1)
+    try:
+        for fixture, query in FIXTURES.items():
+            html = (FIXTURES_DIR / fixture).read_text(encoding="utf-8")
+            parsed = pool.parse(
+                _parse_records, html, query, source.base_url, source.html_parser
+            )
+            assert parsed
+            assert parsed == source._parse_html(html, query)
+    finally:
+        pool.close()
+
+
+def test_closed_pool_falls_back_to_local_parsing():
+    source = VintedSource()
+    pool = ParsePool(1)
+    pool.close()
+    with pytest.raises(RuntimeError):
+        pool.start()
+
+    fixture, query = next(iter(FIXTURES.items()))
+    html = (FIXTURES_DIR / fixture).read_text(encoding="utf-8")
+    source.use_parse_pool(pool)
+    assert source._parse_page(html, query) == source._parse_html(html, query)
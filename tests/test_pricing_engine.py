@@ -0,0 +1,110 @@
+import importlib.util
+import random
+import sys
+from array import array
+
+import pytest
+
+from pricing_assistant.core import pricing_engine
+from pricing_assistant.core.pricing_engine import PricingEngine
+
+needs_numpy = pytest.mark.skipif(
+    importlib.util.find_spec("numpy") is None, reason="numpy não instalado"
+)
+
+
+def random_vectors(seed):
+    rng = random.Random(seed)
+    vectors = [[], [12.5], [3.0, 9.0], [5.0, 1.0, 7.5], [8.0] * 4, [20.0] * 9]
+    for _ in range(300):
+        size = rng.choice([0, 1, 2, 3, 4, 5, rng.randint(6, 60)])
+        vector = [round(rng.lognormvariate(3, 0.7), 2) for _ in range(size)]
+        if vector and rng.random() < 0.3:
+            vector.append(rng.choice([0.5, 3000.0]))
+        vectors.append(vector)
+    return vectors
+
+
+def products_for(vectors, seed):
+    rng = random.Random(seed)
+    conditions = ["novo", "muito bom", "bom", "razoável"]
+    return [{"condition": rng.choice(conditions)} for _ in vectors]
+
+
+def flatten(vectors):
+    flat = array("d")
+    offsets = [0]
+    for vector in vectors:
+        flat.extend(vector)
+        offsets.append(len(flat))
+    return flat, offsets
+
+
+@pytest.fixture
+def numpy_missing(monkeypatch):
+    """Simula um ambiente sem numpy (o import falha)"""
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    monkeypatch.setattr(pricing_engine, "np", None)
+    monkeypatch.setattr(pricing_engine, "_numpy_loaded", False)
+
+
+@needs_numpy
+@pytest.mark.parametrize("seed", [0, 1])
+def test_numpy_stats_match_scalar_reference(seed):
+    engine = PricingEngine()
+    vectors = random_vectors(seed)
+    expected = [engine._price_stats(vector) for vector in vectors]
+
+    assert engine._batch_stats_numpy(vectors, None) == expected
+    flat, offsets = flatten(vectors)
+    assert engine._batch_stats_numpy(flat, offsets) == expected
+
+
+@needs_numpy
+@pytest.mark.parametrize("seed", [0, 1])
+def test_calculate_prices_matches_scalar_for_ragged_and_offsets(seed):
+    engine = PricingEngine()
+    vectors = random_vectors(seed)
+    products = products_for(vectors, seed)
+    expected = [
+        engine._build_recommendation(product, engine._price_stats(vector))
+        for product, vector in zip(products, vectors)
+    ]
+
+    assert engine.calculate_prices(products, vectors) == expected
+    flat, offsets = flatten(vectors)
+    assert engine.calculate_prices(products, flat, offsets) == expected
+
+
+@needs_numpy
+def test_empty_batch_and_empty_vectors():
+    engine = PricingEngine()
+    assert engine.calculate_prices([], []) == []
+    assert engine._batch_stats_numpy([[], []], None) == [None, None]
+    fallback = engine.calculate_prices([{"condition": "novo"}], [[]])[0]
+    assert fallback == engine._get_fallback_price({"condition": "novo"})
+
+
+@needs_numpy
+def test_direct_numpy_call_loads_numpy(monkeypatch):
+    # Chamada direta sem um calculate_prices anterior a carregar o numpy
+    monkeypatch.setattr(pricing_engine, "np", None)
+    monkeypatch.setattr(pricing_engine, "_numpy_loaded", False)
+    assert PricingEngine()._batch_stats_numpy([[4.0, 2.0]], None) == [
+        (2, 3.0, 2.0, 4.0)
+    ]
+
+
+def test_pure_python_fallback_without_numpy(numpy_missing):
+    engine = PricingEngine()
+    vectors = random_vectors(2)
+    products = products_for(vectors, 2)
+    expected = [
+        engine._build_recommendation(product, engine._price_stats(vector))
+        for product, vector in zip(products, vectors)
+    ]
+
+    assert engine.calculate_prices(products, vectors) == expected
+    flat, offsets = flatten(vectors)
+    assert engine.calculate_prices(products, flat, offsets) == expected
+    assert pricing_engine._load_numpy() is None
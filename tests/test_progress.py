@@ -0,0 +1,77 @@
+from pricing_assistant.core.listing import Listing, ListingBatch
+from pricing_assistant.services.analysis import AnalysisService
+from pricing_assistant.sources.base import MarketDataSource
+from pricing_assistant.utils.config import Config
+
+
+class PagedSource(MarketDataSource):
+    """Duas páginas; envia a seleção acumulada após cada uma"""
+
+    name = "paged"
+    pages = (
+        (Listing("a", 10.0, url="/a"), Listing("b", 30.0, url="/b")),
+        (Listing("c", 12.0, url="/c"), Listing("d", 14.0, url="/d")),
+    )
+
+    def search(self, query, **filters):
+        selection = []
+        for page in self.pages:
+            selection = selection + list(page)
+            if filters.get("on_page") is not None:
+                filters["on_page"](selection)
+        return ListingBatch.from_listings(selection)
+
+    def is_available(self):
+        return True
+
+
+def test_last_provisional_price_matches_final(tmp_path):
+    config = Config()
+    config.history_path = tmp_path / "history.db"
+    service = AnalysisService([PagedSource()], config)
+    # Histórico com uma listagem revista (/a) e uma que já não aparece (/old)
+    service.history.record(
+        "item",
+        "paged",
+        ListingBatch.from_listings(
+            [Listing("a", 10.0, url="/a"), Listing("old", 40.0, url="/old")]
+        ),
+        ts=1.0e9,
+    )
+    config.history_window_days = service.pricing_engine.history_days = 1e4
+
+    progress = []
+    result = service.analyze_product("item", on_progress=progress.append)
+    service.close()
+
+    reasoning = " ".join(result["recommendation"].reasoning)
+    assert "Inclui 1 preços históricos" in reasoning
+    assert [p.pages for p in progress] == [1, 2]
+    assert progress[-1].listings == len(result["market_data"]["prices"]) == 4
+    provisional = progress[-1].recommendation
+    final = result["recommendation"]
+    assert (provisional.suggested, provisional.minimum, provisional.maximum) == (
+        final.suggested,
+        final.minimum,
+        final.maximum,
+    )
+
+
+def test_batch_reports_provisional_prices_per_item():
+    config = Config()
+    config.history_enabled = False
+    service = AnalysisService([PagedSource()], config)
+
+    progress = []
+    items = [{"name": "item"}, {"name": "outro", "condition": "novo"}]
+    records = list(
+        service.analyze_batch(
+            items, on_progress=lambda item, p: progress.append((item["name"], p))
+        )
+    )
+
+    assert len(records) == 2
+    for name in ("item", "outro"):
+        pages = [p for item_name, p in progress if item_name == name]
+        assert [p.pages for p in pages] == [1, 2]
+        assert "Estimativa provisória" in pages[0].recommendation.reasoning[0]
@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+
+from pricing_assistant.utils import rate_limit
+from pricing_assistant.utils.rate_limit import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "time", clock)
+    return clock
+
+
+def test_throttle_halves_rate_once_per_interval(clock):
+    limiter = RateLimiter(default_rate=2.0)
+
+    limiter.feedback("host", 429)
+    assert limiter.rate("host") == pytest.approx(1.0)
+
+    # Rajada de 429: só uma redução por intervalo
+    clock.now += rate_limit.DECREASE_INTERVAL / 2
+    limiter.feedback("host", 429)
+    assert limiter.rate("host") == pytest.approx(1.0)
+
+    clock.now += rate_limit.DECREASE_INTERVAL
+    limiter.feedback("host", 503)
+    assert limiter.rate("host") == pytest.approx(0.5)
+
+
+def test_successes_ramp_back_to_budget(clock):
+    limiter = RateLimiter(default_rate=1.0)
+    limiter.feedback("host", 429)
+    assert limiter.rate("host") == pytest.approx(0.5)
+
+    rates = []
+    for _ in range(12):
+        clock.now += 1
+        limiter.feedback("host", 200)
+        rates.append(limiter.rate("host"))
+
+    steps = [b - a for a, b in zip([0.5] + rates, rates[:10])]
+    assert steps == pytest.approx([rate_limit.INCREASE_STEP] * 10)
+    assert rates[-1] == pytest.approx(1.0)
+    assert max(rates) <= 1.0
+
+
+def test_state_is_shared_across_threads(clock):
+    limiter = RateLimiter(default_rate=2.0, burst=1.0)
+    delays = []
+    lock = threading.Lock()
+
+    def worker():
+        delay = limiter.reserve("host")
+        with lock:
+            delays.append(delay)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Relógio parado: cada reserva fica meio segundo atrás da anterior
+    assert sorted(delays) == pytest.approx([i * 0.5 for i in range(8)])
+
+    # Uma redução vista numa thread aplica-se às reservas das outras
+    thread = threading.Thread(target=limiter.feedback, args=("host", 429))
+    thread.start()
+    thread.join()
+    assert limiter.rate("host") == pytest.approx(1.0)
+    assert limiter.reserve("host") == pytest.approx(8.0)
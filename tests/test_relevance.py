@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from pricing_assistant.sources.relevance import (
+    TRANSLATIONS,
+    CompiledQuery,
+    compile_query,
+    normalize_text,
+)
+
+QUERIES = ["teclado apex pro v3", "t-shirt nike", "nike", "pro pro", "v3 3", ""]
+WORDS = [
+    "teclado", "keyboard", "clavier", "apex", "apexpro", "pro", "professional",
+    "prof", "v3", "version3", "3", "t-shirt", "shirt", "nike", "nikes", "rato",
+    "Tastatur", "TECLADO", "-", "x",
+]  # fmt: skip
+
+
+def reference_match(title, query):
+    """Cálculo original (uma pesquisa de substring por palavra e tradução)"""
+    title = normalize_text(title)
+    words = normalize_text(query).split()
+    if not title or not words:
+        return False, 0.0
+
+    matching = exact = 0
+    for word in words:
+        if word in title:
+            matching += 1
+            exact += 1
+        elif any(t in title for t in TRANSLATIONS.get(word, [])):
+            matching += 1
+    return matching / len(words) >= 0.25, exact / len(words)
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_compiled_match_equals_reference(query):
+    rng = random.Random(query)
+    compiled = CompiledQuery(query)
+    for _ in range(2000):
+        title = " ".join(rng.choices(WORDS, k=rng.randint(0, 6)))
+        if rng.random() < 0.3:
+            title = title.replace(" ", "")
+        assert compiled.match(title) == pytest.approx(reference_match(title, query))
+
+
+def test_accents_and_case_are_ignored():
+    relevant, score = CompiledQuery("camisola ténis").match("CAMISÓLA Tenis Nike")
+    assert relevant and score == 1.0
+
+
+def test_translations_count_for_relevance_but_not_score():
+    relevant, score = CompiledQuery("teclado apex pro v3").match("Clavier gaming")
+    assert relevant and score == 0.0
+
+
+def test_compiled_queries_are_shared():
+    assert compile_query("nike air") is compile_query("nike air")
@@ -0,0 +1,109 @@
+import asyncio
+import json
+
+import pytest
+
+from pricing_assistant.core.listing import Listing, ListingBatch
+from pricing_assistant.services.analysis import AnalysisService
+from pricing_assistant.sources.base import MarketDataSource
+from pricing_assistant.ui.server import PricingServer
+from pricing_assistant.utils.config import Config
+
+
+class StaticSource(MarketDataSource):
+    name = "static"
+
+    def __init__(self):
+        self.queries = []
+
+    def search(self, query, **filters):
+        self.queries.append(query)
+        return ListingBatch.from_listings(
+            [Listing("a", 10.0), Listing("b", 12.0), Listing("c", 14.0)]
+        )
+
+    def is_available(self):
+        return True
+
+
+@pytest.fixture
+def server():
+    config = Config()
+    config.history_enabled = False
+    config.server_max_line = 1024
+    source = StaticSource()
+    service = AnalysisService([source], config)
+    yield PricingServer(service, config), source
+    service.close()
+
+
+async def exchange(server, raw: bytes):
+    """Envia ``raw`` numa ligação nova; devolve (estado, corpo JSON)"""
+    listener = await server.start("127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw)
+        await writer.drain()
+        head = await reader.readuntil(b"\r\n\r\n")
+        status = int(head.split(b" ", 2)[1])
+        length = int(head.lower().split(b"content-length:")[1].split(b"\r\n")[0])
+        body = json.loads(await reader.readexactly(length))
+        writer.close()
+        return status, body
+    finally:
+        listener.close()
+        await listener.wait_closed()
+
+
+def post(path: str, payload) -> bytes:
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+    return (
+        f"POST {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n"
+    ).encode() + body
+
+
+def test_analyze(server):
+    server, _ = server
+    status, body = asyncio.run(exchange(server, post("/analyze", {"name": "item"})))
+
+    assert status == 200
+    assert body["product"] == "item"
+    assert body["market_data"]["prices"] == [10.0, 12.0, 14.0]
+    assert body["market_data"]["sources"]["static"]["status"] == "ok"
+
+
+def test_batch_returns_one_record_per_item(server):
+    server, source = server
+    items = [{"name": "teclado"}, {"name": "rato"}, {"name": "Teclado "}]
+    status, body = asyncio.run(exchange(server, post("/batch", {"items": items})))
+
+    assert status == 200
+    assert [r["product"] for r in body["records"]] == ["teclado", "rato", "Teclado"]
+    assert body["records"][0]["suggested"] == body["records"][2]["suggested"]
+    # Os repetidos partilham a mesma análise
+    assert sorted(source.queries) == ["rato", "teclado"]
+
+
+def test_malformed_body(server):
+    server, _ = server
+    status, body = asyncio.run(exchange(server, post("/analyze", b"{name:")))
+
+    assert status == 400
+    assert body == {"error": "corpo JSON inválido"}
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        (b"GET /analyze?name=" + b"x" * 2000 + b" HTTP/1.1\r\n\r\n", 400),
+        (b"GET /health HTTP/1.1\r\nX-Big: " + b"x" * 2000 + b"\r\n\r\n", 431),
+    ],
+)
+def test_over_long_line_is_rejected(server, raw, expected):
+    server, _ = server
+    status, body = asyncio.run(exchange(server, raw))
+
+    assert status == expected
+    assert "demasiado long" in body["error"]
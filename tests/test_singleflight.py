@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from pricing_assistant.utils.singleflight import SingleFlight
+
+
+def test_ado_failing_leader_releases_key():
+    """Depois de um líder assíncrono falhar, a mesma chave volta a executar"""
+    flight = SingleFlight("test")
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise RuntimeError("database is locked")
+
+    async def ok():
+        return 42
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(flight.ado("key", fail), 1)
+        assert flight.in_flight() == 0
+        assert await asyncio.wait_for(flight.ado("key", ok), 1) == 42
+
+    asyncio.run(main())
+    assert flight.do("key", lambda: 7) == 7
+    assert flight.in_flight() == 0
+
+
+def test_ado_followers_receive_leader_exception():
+    flight = SingleFlight("test")
+
+    async def fail():
+        await asyncio.sleep(0.05)
+        raise ValueError("x")
+
+    async def main():
+        results = await asyncio.gather(
+            flight.ado("key", fail), flight.ado("key", fail), return_exceptions=True
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.coalesced == 1
+
+    asyncio.run(main())
+    assert flight.in_flight() == 0
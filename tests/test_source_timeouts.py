@@ -0,0 +1,107 @@
+import asyncio
+import threading
+
+from pricing_assistant.core.listing import Listing, ListingBatch
+from pricing_assistant.services.analysis import AnalysisService
+from pricing_assistant.sources.base import MarketDataSource
+from pricing_assistant.utils.config import Config
+
+
+class FastSource(MarketDataSource):
+    name = "fast"
+
+    def search(self, query, **filters):
+        return ListingBatch.from_listings([Listing("a", 10.0), Listing("b", 12.0)])
+
+    def is_available(self):
+        return True
+
+
+class SlowSource(MarketDataSource):
+    """Só responde depois de ``release``; envia uma página ao terminar"""
+
+    name = "slow"
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.finished = threading.Event()
+
+    def search(self, query, **filters):
+        self.release.wait(5)
+        listings = [Listing("late", 99.0, url="/late")]
+        if filters.get("on_page") is not None:
+            filters["on_page"](listings)
+        self.finished.set()
+        return ListingBatch.from_listings(listings)
+
+    def is_available(self):
+        return True
+
+
+class RecordingHistory:
+    def __init__(self):
+        self.sources = []
+
+    def record(self, query, source, listings, ts=None):
+        self.sources.append(source)
+
+    def observations(self, *args, **kwargs):
+        return []
+
+    def prices(self, *args, **kwargs):
+        return []
+
+    def close(self):
+        pass
+
+
+def make_service(slow):
+    config = Config()
+    config.history_enabled = False
+    config.timeout = 5
+    config.source_timeout = 5
+    config.source_timeouts = {"slow": 0.2}
+    service = AnalysisService([FastSource(), slow], config)
+    service.history = service.pricing_engine.history = RecordingHistory()
+    return service
+
+
+def test_slow_source_is_cut_off_without_late_side_effects():
+    slow = SlowSource()
+    service = make_service(slow)
+    pages = []
+
+    result = service.analyze_product("item", on_progress=pages.append)
+    sources = result["market_data"]["sources"]
+    assert sources["fast"]["status"] == "ok"
+    assert sources["slow"]["status"] == "timeout"
+    assert sources["slow"]["elapsed"] < 1
+    assert sorted(result["market_data"]["prices"]) == [10.0, 12.0]
+
+    # A resposta tardia não toca na saúde, no histórico nem no progresso
+    slow.release.set()
+    assert slow.finished.wait(5)
+    service.close()
+    assert service.history.sources == ["fast"]
+    assert pages == []
+    # O timeout conta como falha; a resposta tardia não a apaga
+    assert service.health._sources["slow"].failures == 1
+
+
+def test_async_slow_source_is_cut_off():
+    slow = SlowSource()
+    service = make_service(slow)
+
+    async def analyze():
+        try:
+            return await service.aanalyze_product("item")
+        finally:
+            slow.release.set()
+
+    result = asyncio.run(analyze())
+    service.close()
+
+    sources = result["market_data"]["sources"]
+    assert sources["fast"]["status"] == "ok"
+    assert sources["slow"]["status"] == "timeout"
+    assert sorted(result["market_data"]["prices"]) == [10.0, 12.0]
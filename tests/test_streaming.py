@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from pricing_assistant.core.pricing_engine import PricingEngine
+from pricing_assistant.core.streaming import P2Quantile, StreamingPriceEstimator
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_estimator_tracks_exact_stats_on_large_stream(seed):
+    rng = random.Random(seed)
+    # Preços de mercado com alguns outliers (anúncios de lotes e de peças)
+    prices = [rng.gauss(60, 12) for _ in range(20000)]
+    prices += [rng.uniform(300, 900) for _ in range(200)]
+    prices += [rng.uniform(0.5, 2) for _ in range(200)]
+    rng.shuffle(prices)
+
+    estimator = StreamingPriceEstimator()
+    estimator.extend(prices)
+    count, median, minimum, maximum = estimator.stats()
+    exact_count, exact_median, exact_min, exact_max = PricingEngine()._price_stats(
+        prices
+    )
+
+    assert count == len(prices)
+    assert count == pytest.approx(exact_count, rel=0.05)
+    assert median == pytest.approx(exact_median, rel=0.005)
+    assert minimum == pytest.approx(exact_min, rel=0.02)
+    assert maximum == pytest.approx(exact_max, rel=0.02)
+
+
+def test_small_streams_are_exact():
+    quantile = P2Quantile(0.5)
+    for price in [5.0, 1.0, 4.0, 2.0]:
+        quantile.add(price)
+    assert quantile.value == 3.0
+    assert StreamingPriceEstimator().stats() is None
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from pricing_assistant.core.listing import Listing
+from pricing_assistant.sources.vinted import VintedSource, _TopK
+
+SCORES = [0.0, 0.1, 0.2, 0.25, 0.5, 0.75, 1.0]
+
+
+def make_listings(count, seed):
+    rng = random.Random(seed)
+    return [
+        Listing(f"item {i}", float(i), relevance_score=rng.choice(SCORES))
+        for i in range(count)
+    ]
+
+
+def sort_then_slice(listings, k):
+    """Seleção original: filtrar, ordenar tudo (estável) e cortar em K"""
+    relevant = [item for item in listings if item.relevance_score >= 0.2]
+    relevant.sort(key=lambda item: item.relevance_score, reverse=True)
+    return relevant[:k]
+
+
+@pytest.mark.parametrize("k", [1, 10, 50])
+@pytest.mark.parametrize("seed", range(5))
+def test_streamed_selection_matches_sort_then_slice(k, seed):
+    listings = make_listings(500, seed)
+    rng = random.Random(seed)
+    selector = _TopK(k)
+
+    start = 0
+    while start < len(listings):
+        size = rng.randint(0, 60)
+        selector.extend(listings[start : start + size])
+        assert len(selector.result()) <= k
+        start += size
+
+    # Empates resolvidos pela ordem de chegada, como no sort estável
+    assert selector.result() == sort_then_slice(listings, k)
+    assert selector.seen == 500
+    assert selector.relevant == sum(item.relevance_score >= 0.2 for item in listings)
+
+
+def test_select_top_uses_configured_k():
+    source = VintedSource()
+    listings = make_listings(3000, seed=7)
+
+    top, seen = source._select_top(listings)
+    assert seen == 3000
+    assert top == sort_then_slice(listings, source.top_k)
+    assert source._select_top(iter(listings), top_k=3)[0] == sort_then_slice(
+        listings, 3
+    )
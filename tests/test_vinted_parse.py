@@ -0,0 +1,113 @@
+import json
+from pathlib import Path
+
+import pytest
+from legacy_parse import LegacyVintedSource
+
+from pricing_assistant.sources.vinted import DEFAULT_HTML_PARSER, VintedSource
+from pricing_assistant.utils.config import Config
+
+BENCHMARKS = Path(__file__).resolve().parent.parent / "benchmarks"
+FIXTURES = {
+    "vinted_catalog_teclado.html": "teclado apex pro",
+    "vinted_catalog_tshirt.html": "t-shirt nike",
+    "vinted_catalog_tshirt_store.html": "t-shirt nike",
+}
+
+
+QUERY = "teclado apex pro"
+CARD = (
+    '<div class="feed-grid__item"><h3 class="item-title">Teclado Apex Pro TKL</h3>'
+    '<span class="item-price">€ 25,00</span><a href="/items/1-teclado">ver</a></div>'
+)
+
+
+def catalog_page(items, card=CARD):
+    """Página com o estado JSON da loja (``items`` por id) e um card no DOM"""
+    state = {"items": {"catalogItems": {"byId": {str(i["id"]): i for i in items}}}}
+    return (
+        '<html><body><script type="application/json" '
+        f'data-js-react-on-rails-store="MainStore">{json.dumps(state)}</script>'
+        f"{card}</body></html>"
+    )
+
+
+def fields(listings):
+    return [
+        (listing.title, listing.price, listing.url, listing.condition)
+        for listing in listings
+    ]
+
+
+@pytest.mark.parametrize("parser", sorted({"html.parser", DEFAULT_HTML_PARSER}))
+@pytest.mark.parametrize("fixture", sorted(FIXTURES))
+def test_single_pass_extractor_matches_legacy(fixture, parser):
+    html = (BENCHMARKS / "fixtures" / fixture).read_text(encoding="utf-8")
+    query = FIXTURES[fixture]
+    config = Config()
+    config.html_parser = parser
+
+    expected = fields(LegacyVintedSource()._parse_dom(html, query))
+    assert expected
+    assert fields(VintedSource(config)._parse_dom(html, query)) == expected
+
+
+def test_embedded_state_is_preferred_to_the_dom():
+    html = catalog_page(
+        [
+            {
+                "id": 7,
+                "title": "Teclado Apex Pro mini",
+                "price": {"amount": "40.0", "currency_code": "EUR"},
+                "url": "/items/7-apex",
+                "status": "Novo com etiquetas",
+            },
+            {"id": 8, "title": "Rato sem fios", "price": "12.5", "url": "/items/8"},
+        ]
+    )
+    source = VintedSource()
+
+    assert fields(source._parse_html(html, QUERY)) == [
+        ("Teclado Apex Pro mini", 40.0, "https://www.vinted.pt/items/7-apex", "novo")
+    ]
+    # O card do DOM só seria usado sem estado JSON
+    assert fields(source._parse_dom(html, QUERY))[0][:2] == (
+        "Teclado Apex Pro TKL",
+        25.0,
+    )
+
+
+def test_state_without_relevant_items_does_not_fall_back():
+    html = catalog_page(
+        [{"id": 8, "title": "Rato sem fios", "price": 12.5, "url": "/i"}]
+    )
+    assert VintedSource()._parse_html(html, QUERY) == []
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        CARD,
+        '<script type="application/json">{"items": [</script>' + CARD,
+        catalog_page([]),
+    ],
+    ids=["no-state", "broken-json", "no-items"],
+)
+def test_dom_fallback(html):
+    source = VintedSource()
+    assert source._parse_json(html, QUERY) is None
+    assert fields(source._parse_html(html, QUERY)) == fields(
+        source._parse_dom(html, QUERY)
+    )
+    assert len(source._parse_html(html, QUERY)) == 1
+
+
+def test_store_fixture_uses_embedded_state():
+    html = (BENCHMARKS / "fixtures" / "vinted_catalog_tshirt_store.html").read_text(
+        encoding="utf-8"
+    )
+    source = VintedSource()
+    from_json = source._parse_json(html, "t-shirt nike")
+
+    assert from_json
+    assert fields(source._parse_html(html, "t-shirt nike")) == fields(from_json)
@@ -0,0 +1,72 @@
+import asyncio
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+from pricing_assistant.sources.base import SourceError
+from pricing_assistant.sources.vinted import VintedSource
+from pricing_assistant.utils.config import Config
+from pricing_assistant.utils.rate_limit import RateLimiter
+
+FIXTURE = (
+    Path(__file__).resolve().parent.parent
+    / "benchmarks"
+    / "fixtures"
+    / "vinted_catalog_teclado.html"
+)
+QUERY = "teclado apex pro"
+
+
+class CatalogAdapter(HTTPAdapter):
+    """Serve o mesmo catálogo em todas as páginas, exceto as de ``failing``"""
+
+    def __init__(self, failing=()):
+        super().__init__()
+        self.failing = set(failing)
+        self.html = FIXTURE.read_bytes()
+
+    def send(self, request, **kwargs):
+        page = int(parse_qs(urlsplit(request.url).query).get("page", ["1"])[0])
+        if page in self.failing:
+            raise requests.ConnectionError(f"página {page} em baixo")
+        response = requests.Response()
+        response.status_code = 200
+        response._content = self.html
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        return response
+
+
+def make_source(failing=()):
+    source = VintedSource(Config())
+    # Sem esperas: limite próprio e sem novas tentativas
+    source.rate_limiter = source.http.rate_limiter = RateLimiter(1000.0, burst=100)
+    source.http.max_retries = 0
+    source.session.mount("https://", CatalogAdapter(failing))
+    return source
+
+
+def search(source, max_pages, use_async):
+    if use_async:
+        return asyncio.run(source.asearch(QUERY, max_pages=max_pages))
+    return source.search(QUERY, max_pages=max_pages)
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_failed_page_is_skipped(use_async):
+    expected = search(make_source(), 1, use_async)
+    listings = search(make_source(failing={2}), 2, use_async)
+
+    assert len(listings) > 0
+    assert list(listings.prices) == list(expected.prices)
+    assert [item.url for item in listings] == [item.url for item in expected]
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_every_page_failing_raises_source_error(use_async):
+    with pytest.raises(SourceError):
+        search(make_source(failing={1, 2, 3}), 3, use_async)
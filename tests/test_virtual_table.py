@@ -0,0 +1,64 @@
+import random
+
+from pricing_assistant.ui.gui.components.virtual_table import TableModel
+
+
+def make_rows(count, seed):
+    rng = random.Random(seed)
+    words = ["Teclado", "rato", "Apex", "pro", "monitor", "cabo"]
+    return {
+        "title": [
+            f"{rng.choice(words)} {rng.choice(words)} {i}" for i in range(count)
+        ],
+        "price": [float(rng.randint(1, 50)) for _ in range(count)],
+    }
+
+
+def reference_view(rows, text, column, reverse):
+    """Vista calculada do zero: filtrar todas as linhas e ordenar"""
+    indexes = [i for i, title in enumerate(rows["title"]) if text in title.casefold()]
+    values = rows[column]
+    if isinstance(values[0], str):
+        values = [value.casefold() for value in values]
+    return sorted(indexes, key=values.__getitem__, reverse=reverse)
+
+
+def test_sorted_extend_merges_each_chunk():
+    for column, reverse in [("price", False), ("price", True), ("title", True)]:
+        model = TableModel(["title", "price"])
+        model.sort(column, reverse=reverse)
+        model.set_filter("apex")
+        rows = make_rows(1000, seed=1)
+        for start in range(0, 1000, 150):
+            model.extend(
+                {name: values[start : start + 150] for name, values in rows.items()}
+            )
+
+        assert len(model.order) == model.total == 1000
+        assert model.view == reference_view(rows, "apex", column, reverse)
+
+
+def test_filter_steps_match_set_filter():
+    rows = make_rows(5000, seed=2)
+    model = TableModel(["title", "price"])
+    model.extend(rows)
+    model.sort("price")
+
+    steps = model.filter_steps("teclado", rows=500)
+    assert sum(1 for _ in steps) == 10
+    stepped = list(model.view)
+
+    model.set_filter("")
+    model.set_filter("teclado")
+    assert stepped == model.view
+    assert all("teclado" in rows["title"][i].casefold() for i in stepped)
+
+
+def test_abandoned_filter_keeps_previous_view():
+    model = TableModel(["title", "price"])
+    model.extend(make_rows(3000, seed=3))
+    before = list(model.view)
+
+    steps = model.filter_steps("rato", rows=1000)
+    next(steps)
+    assert model.view == before and model.filter_text == ""